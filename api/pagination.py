@@ -0,0 +1,167 @@
+import json
+from base64 import b64decode, b64encode
+from datetime import datetime
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, replace_query_param
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Birden fazla alan üzerinde keyset (seek) sayfalama.
+
+    DRF'nin CursorPagination sınıfı yalnızca ilk sıralama alanını imleçte
+    saklar ve eşitlikleri offset ile çözer. Bu sınıf ise son satırın tüm
+    sıralama anahtarlarını (ör. ``call_date`` ve ``id``) opak imlece yazar ve
+    bir sonraki sayfayı ``WHERE (call_date, id) < (...)`` karşılaştırmasıyla
+    getirir. COUNT(*) veya OFFSET kullanılmadığından 1. sayfa ile 10.000.
+    sayfa aynı maliyettedir.
+    """
+
+    ordering = ("-id",)
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            position, reverse = None, False
+        else:
+            position, reverse = self.cursor
+
+        order = self._reverse_ordering() if reverse else self.ordering
+        queryset = queryset.order_by(*order)
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(position, order))
+
+        # Bir fazla satır çekerek sonraki sayfanın varlığını COUNT(*) olmadan anla
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(self.ordering)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor((self._position(self.page[-1]), False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor((self._position(self.page[0]), True))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            payload = json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))
+            position = payload["p"]
+            reverse = bool(payload.get("r", 0))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return self._typed_position(position), reverse
+
+    def _typed_position(self, position):
+        """
+        İmleçteki değerleri sıralama alanlarının tiplerine çevirir. İmleç
+        istemciden geldiğinden yanlış tipte bir değer seek filtresinde 500
+        yerine geçersiz imleç hatası vermelidir.
+        """
+        values = []
+        for field, value in zip(self.ordering, position):
+            model_field = self.model._meta.get_field(field.lstrip("-"))
+            try:
+                value = model_field.to_python(value)
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+        return values
+
+    def encode_cursor(self, cursor):
+        position, reverse = cursor
+        payload = {"p": position}
+        if reverse:
+            payload["r"] = 1
+        encoded = b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _position(self, instance):
+        values = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip("-"))
+            if isinstance(value, datetime):
+                # Mikrosaniye hassasiyeti korunmalı, aksi halde eşit anahtarlar atlanır
+                value = value.isoformat()
+            values.append(value)
+        return values
+
+    def _reverse_ordering(self):
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        )
+
+    @staticmethod
+    def _seek_filter(position, ordering):
+        """
+        (a, b, c) > (x, y, z) karşılaştırmasını alan yönlerine göre kurar:
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+
+class CallRecordCursorPagination(KeysetCursorPagination):
+    """
+    Çağrı kayıtları için (-call_date, id) sıralı imleç sayfalama.
+    """
+
+    ordering = ("-call_date", "id")
+
+
+class EvaluationCursorPagination(KeysetCursorPagination):
+    """
+    Değerlendirmeler için (-evaluated_at, id) sıralı imleç sayfalama.
+    """
+
+    ordering = ("-evaluated_at", "id")
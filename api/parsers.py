@@ -0,0 +1,33 @@
+import codecs
+import json
+
+from rest_framework.parsers import BaseParser
+
+from django.conf import settings
+
+
+class NDJSONParser(BaseParser):
+    """
+    Satır başına bir JSON nesnesi (NDJSON) içeren gövdeleri ayrıştırır.
+
+    Gövde belleğe alınmaz; satırlar okundukça üretilir. Bozuk bir satır tüm
+    isteği düşürmesin diye ``ValueError`` olarak üretilir ve çağıran taraf
+    onu öğe hatası olarak raporlar.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        return self._lines(codecs.getreader(encoding)(stream))
+
+    def _lines(self, reader):
+        for line in reader:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                yield ValueError(str(exc))
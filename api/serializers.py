@@ -1,11 +1,11 @@
-from decimal import Decimal
-
 from rest_framework import serializers
 
 from django.core.validators import FileExtensionValidator
 
 from accounts.models import CustomUser
-from calls.models import CallRecord, Evaluation, EvaluationForm
+from calls.models import CallRecord, Evaluation, EvaluationForm, EvaluationTask
+from calls.probe import validate_audio_file
+from calls.scoring import get_scorer
 
 
 class UserListSerializer(serializers.ModelSerializer):
@@ -120,7 +120,10 @@ class CallRecordSerializer(serializers.ModelSerializer):
     )
     call_queue_name = serializers.CharField(source="call_queue.name", read_only=True)
     audio_file = serializers.FileField(
-        validators=[FileExtensionValidator(allowed_extensions=["mp3", "wav", "m4a"])]
+        validators=[
+            FileExtensionValidator(allowed_extensions=["mp3", "wav", "m4a"]),
+            validate_audio_file,
+        ]
     )
 
     class Meta:
@@ -144,7 +147,10 @@ class CallRecordSerializer(serializers.ModelSerializer):
 
 class CallRecordUploadSerializer(serializers.ModelSerializer):
     audio_file = serializers.FileField(
-        validators=[FileExtensionValidator(allowed_extensions=["mp3", "wav", "m4a"])]
+        validators=[
+            FileExtensionValidator(allowed_extensions=["mp3", "wav", "m4a"]),
+            validate_audio_file,
+        ]
     )
 
     class Meta:
@@ -159,6 +165,22 @@ class CallRecordUploadSerializer(serializers.ModelSerializer):
         ]
 
 
+class EvaluationTaskSerializer(serializers.ModelSerializer):
+    call = CallRecordSerializer(read_only=True)
+    lease_expires_at = serializers.DateTimeField(source="available_at", read_only=True)
+
+    class Meta:
+        model = EvaluationTask
+        fields = [
+            "id",
+            "call",
+            "call_queue",
+            "status",
+            "claimed_at",
+            "lease_expires_at",
+        ]
+
+
 class EvaluationFormSerializer(serializers.ModelSerializer):
     """
     Değerlendirme formları için serileştirici.
@@ -206,7 +228,8 @@ class EvaluationSerializer(serializers.ModelSerializer):
     evaluator_name = serializers.CharField(
         source="evaluator.get_full_name", read_only=True
     )
-    call_id = serializers.IntegerField(source="call.id", read_only=True)
+    # call.id yerine yabancı anahtar sütunu okunur; çağrı satırı yüklenmez
+    call_id = serializers.IntegerField(read_only=True)
     form_name = serializers.CharField(source="form.name", read_only=True)
     total_score = serializers.FloatField(read_only=True)
 
@@ -242,44 +265,16 @@ class EvaluationCreateSerializer(serializers.ModelSerializer):
         model = Evaluation
         fields = ["call", "form", "scores", "final_note"]
 
-    def validate_scores(self, value):
-        form = self.initial_data.get("form")
-        if not form:
-            return value
-
-        form_instance = EvaluationForm.objects.get(id=form)
-        for key, field in form_instance.fields.items():
-            max_score = field["max_score"]
-            if key in value and value[key]["score"] > max_score:
-                raise serializers.ValidationError(
-                    f"{key} için maksimum puan {max_score} olabilir."
-                )
-        return value
+    def validate(self, attrs):
+        # Doğrulama ve toplam puan, formun derlenmiş puanlayıcısıyla tek geçişte
+        # hesaplanır; form ilişkili alan olarak zaten yüklenmiştir.
+        result = get_scorer(attrs.get("form")).evaluate(attrs.get("scores"))
+        if result.errors:
+            raise serializers.ValidationError({"scores": result.errors})
+        attrs["total_score"] = result.total_score
+        return attrs
 
     def create(self, validated_data):
-        # Toplam puanı hesapla
-        scores = validated_data.get("scores", {})
-        form = validated_data.get("form")
-        total_points = Decimal("0")
-        max_points = Decimal("0")
-
-        if form and hasattr(form, "fields"):
-            for key, field in form.fields.items():
-                max_score = Decimal(str(field.get("max_score", 0)))
-                score_dict = scores.get(key, {})
-                value = Decimal(str(score_dict.get("score", 0)))
-                total_points += value
-                max_points += max_score
-
-        if max_points > 0:
-            total_score = (total_points / max_points) * Decimal("100")
-            total_score = total_score.quantize(
-                Decimal("0.01")
-            )  # İki ondalık basamağa yuvarla
-        else:
-            total_score = Decimal("0")
-
-        evaluation = Evaluation.objects.create(
-            **validated_data, total_score=total_score
-        )
+        evaluation = Evaluation(**validated_data)
+        evaluation.save(scored=True)
         return evaluation
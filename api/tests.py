@@ -1,3 +1,184 @@
-from django.test import TestCase
+import json
+from base64 import b64encode
+from datetime import timedelta
+from io import BytesIO
+from unittest import skipUnless
+from urllib.parse import quote
 
-# Create your tests here.
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import include, path, reverse
+from django.utils import timezone
+
+from calls.models import CallQueue, CallRecord, Evaluation, EvaluationForm
+
+from .pagination import CallRecordCursorPagination
+from .parsers import NDJSONParser
+
+User = get_user_model()
+
+# api henüz projenin URLconf'una bağlı değil; görünümler accounts modelini ister
+urlpatterns = (
+    [path("api/", include("api.urls"))] if apps.is_installed("accounts") else []
+)
+
+
+class KeysetCursorPaginationTest(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="agent", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+        base = timezone.now()
+        # Aynı call_date değerine sahip kayıtlar eşitliklerin id ile çözüldüğünü sınar
+        dates = [base - timedelta(minutes=i // 2) for i in range(7)]
+        self.calls = [
+            CallRecord.objects.create(
+                uploaded_by=self.user,
+                agent=self.user,
+                call_queue=self.queue,
+                phone_number="5550000000",
+                audio_file="call_records/test.wav",
+                call_date=call_date,
+            )
+            for call_date in dates
+        ]
+        self.expected = [
+            c.id
+            for c in sorted(self.calls, key=lambda c: (-c.call_date.timestamp(), c.id))
+        ]
+
+    def _page(self, url):
+        paginator = CallRecordCursorPagination()
+        request = Request(self.factory.get(url))
+        page = paginator.paginate_queryset(CallRecord.objects.all(), request)
+        return paginator, [c.id for c in page]
+
+    def test_walks_all_pages_without_gaps(self):
+        seen = []
+        url = "/api/calls/?page_size=3"
+        while url:
+            paginator, ids = self._page(url)
+            seen.extend(ids)
+            url = paginator.get_next_link()
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_link_returns_same_page(self):
+        paginator, first = self._page("/api/calls/?page_size=3")
+        self.assertIsNone(paginator.get_previous_link())
+        paginator, second = self._page(paginator.get_next_link())
+        paginator, back = self._page(paginator.get_previous_link())
+        self.assertEqual(back, first)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(NotFound):
+            self._page("/api/calls/?cursor=bozuk")
+
+    def test_wrong_type_cursor(self):
+        for position in (["x", "abc"], [None, 1], [{"a": 1}, 1], ["2026-01-01", "1x"]):
+            with self.subTest(position=position):
+                payload = json.dumps({"p": position, "r": 1}).encode()
+                cursor = b64encode(payload).decode()
+                with self.assertRaises(NotFound):
+                    self._page(f"/api/calls/?cursor={quote(cursor)}")
+
+    def test_respects_scoped_queryset(self):
+        other = User.objects.create_user(username="other", password="x")
+        CallRecord.objects.filter(id=self.calls[0].id).update(agent=other)
+        paginator = CallRecordCursorPagination()
+        request = Request(self.factory.get("/api/calls/"))
+        page = paginator.paginate_queryset(
+            CallRecord.objects.filter(agent=self.user), request
+        )
+        self.assertNotIn(self.calls[0].id, [c.id for c in page])
+
+
+class NDJSONParserTest(TestCase):
+    def test_lines_parsed_lazily(self):
+        body = b'{"call": 1}\n\n{bozuk\n{"call": 2}\n'
+        items = NDJSONParser().parse(BytesIO(body))
+        self.assertEqual(next(items), {"call": 1})
+        rest = list(items)
+        self.assertIsInstance(rest[0], ValueError)
+        self.assertEqual(rest[1], {"call": 2})
+
+
+@skipUnless(apps.is_installed("accounts"), "accounts uygulaması kurulu değil")
+@override_settings(ROOT_URLCONF=__name__)
+class EvaluationScoreValidationTest(TestCase):
+    def setUp(self):
+        self.expert = User.objects.create_user(
+            username="expert", password="x", role="expert"
+        )
+        queue = CallQueue.objects.create(name="Genel")
+        self.form = EvaluationForm.objects.create(
+            name="Form",
+            created_by=self.expert,
+            fields={"field_1": {"label": "Empati", "type": "number", "max_score": 10}},
+        )
+        self.calls = [
+            CallRecord.objects.create(
+                uploaded_by=self.expert,
+                agent=self.expert,
+                call_queue=queue,
+                phone_number="5550000000",
+                audio_file="call_records/test.wav",
+                call_date=timezone.now(),
+            )
+            for _ in range(2)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.expert)
+
+    def test_nan_score_rejected(self):
+        for raw in ["NaN", "sNaN"]:
+            with self.subTest(raw=raw):
+                response = self.client.post(
+                    reverse("api:evaluation-list"),
+                    {
+                        "call": self.calls[0].pk,
+                        "form": self.form.pk,
+                        "scores": {"field_1": {"score": raw}},
+                        "final_note": "-",
+                    },
+                    format="json",
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(
+                    response.json()["scores"], ["field_1 için puan sayı olmalıdır."]
+                )
+        self.assertFalse(Evaluation.objects.exists())
+
+    def test_nan_row_does_not_abort_bulk(self):
+        # json modülü NaN'ı float nan olarak okur
+        rows = [
+            f'{{"call": {call.pk}, "form": {self.form.pk}, '
+            f'"scores": {{"field_1": {{"score": {score}}}}}, "final_note": "-"}}'
+            for call, score in zip(self.calls, ["NaN", "7"])
+        ]
+        response = self.client.post(
+            reverse("api:evaluation-bulk"),
+            "\n".join(rows),
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json()["created"], 1)
+        self.assertEqual(response.json()["errors"][0]["index"], 0)
+
+    def test_bulk_rejects_non_list_body(self):
+        for body in ["5", "true", "null", '"metin"', "{}"]:
+            with self.subTest(body=body):
+                response = self.client.post(
+                    reverse("api:evaluation-bulk"),
+                    body,
+                    content_type="application/json",
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(
+                    response.json()["detail"],
+                    "Gövde bir değerlendirme listesi olmalıdır.",
+                )
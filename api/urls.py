@@ -11,6 +11,8 @@ router = DefaultRouter()
 router.register(r"users", views.UserViewSet)
 router.register(r"calls", views.CallRecordViewSet, basename="calls")
 router.register(r"evaluations", views.EvaluationViewSet)
+router.register(r"uploads", views.UploadSessionViewSet, basename="uploads")
+router.register(r"work-queue", views.WorkQueueViewSet, basename="work-queue")
 router.register(r"evaluation-forms", views.EvaluationFormViewSet)
 
 urlpatterns = [
@@ -1,18 +1,31 @@
 import os
+from types import GeneratorType
 
 from rest_framework import generics, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
-from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from django.db.models import Q
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 
 from accounts.models import CustomUser
-from calls.models import CallRecord, Evaluation, EvaluationForm
+from calls import uploads, workqueue
+from calls.bulk import bulk_create_evaluations
+from calls.ingest import ManifestError, ingest_archive
+from calls.models import (
+    CallRecord,
+    Evaluation,
+    EvaluationForm,
+    EvaluationTask,
+    UploadSession,
+)
+from calls.uploadhandlers import AudioUploadHandler
 
+from .pagination import CallRecordCursorPagination, EvaluationCursorPagination
+from .parsers import NDJSONParser
 from .permissions import IsAdminOrSuperUser, IsExpertOrAdmin
 from .serializers import (
     CallRecordSerializer,
@@ -20,6 +33,7 @@ from .serializers import (
     EvaluationCreateSerializer,
     EvaluationFormSerializer,
     EvaluationSerializer,
+    EvaluationTaskSerializer,
     PasswordChangeSerializer,
     UserCreateSerializer,
     UserDetailSerializer,
@@ -142,20 +156,33 @@ class CallRecordViewSet(viewsets.ModelViewSet):
     queryset = CallRecord.objects.all().order_by("-call_date")
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
+    pagination_class = CallRecordCursorPagination
 
     def get_serializer_class(self):
         if self.action == "upload":
             return CallRecordUploadSerializer
         return CallRecordSerializer
 
+    def initialize_request(self, request, *args, **kwargs):
+        request = super().initialize_request(request, *args, **kwargs)
+        if self.action == "upload":
+            # Gövde ayrıştırılmadan önce eklenmeli; özet ve ses bilgileri
+            # dosya diske yazılırken hesaplanır
+            request.upload_handlers.insert(0, AudioUploadHandler(request._request))
+        return request
+
     def get_queryset(self):
         user = self.request.user
+        # Serileştirici temsilci, yükleyen ve kuyruk adlarını her satır için okur
+        calls = CallRecord.objects.select_related(
+            "agent", "uploaded_by", "call_queue"
+        ).order_by("-call_date")
         if hasattr(user, "is_admin") and (user.is_admin() or user.is_superuser):
-            return CallRecord.objects.all().order_by("-call_date")
+            return calls
         elif hasattr(user, "is_expert") and user.is_expert():
-            return CallRecord.objects.all().order_by("-call_date")
+            return calls
         else:
-            return CallRecord.objects.filter(agent=user).order_by("-call_date")
+            return calls.filter(agent=user)
 
     @action(
         detail=False,
@@ -188,6 +215,196 @@ class CallRecordViewSet(viewsets.ModelViewSet):
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="upload-archive",
+        permission_classes=[IsExpertOrAdmin],
+    )
+    def upload_archive(self, request):
+        """
+        Ses dosyaları ve manifest (CSV/JSON) içeren ZIP arşivini yükler.
+        Yanıt her manifest satırı için ayrı bir sonuç içerir.
+        """
+        if "archive" not in request.FILES:
+            return Response(
+                {"archive": ["Bu alan zorunludur."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            result = ingest_archive(request.FILES["archive"], request.user)
+        except ManifestError as exc:
+            return Response({"archive": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        if result.created and not result.failed:
+            response_status = status.HTTP_201_CREATED
+        elif result.created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {
+                "created": result.created,
+                "failed": result.failed,
+                "entries": result.entries,
+            },
+            status=response_status,
+        )
+
+
+class UploadSessionViewSet(viewsets.ViewSet):
+    """
+    Devam ettirilebilir ses dosyası yükleme.
+
+    create:
+    Oturum açar. Gövde: filename, size ve CallRecord alanları (agent,
+    call_queue, phone_number, call_date, call_id).
+
+    retrieve:
+    Sunucuya ulaşmış bayt sayısını (``offset``) döndürür.
+
+    update:
+    ``Content-Range: bytes <başlangıç>-<bitiş>/<toplam>`` başlığıyla ham
+    parçayı ekler. Parça ``offset``ten başlamıyorsa 409 döner.
+
+    finalize:
+    Dosyayı doğrular ve çağrı kaydını oluşturur.
+    """
+
+    permission_classes = [IsExpertOrAdmin]
+
+    def _session(self, pk):
+        return get_object_or_404(UploadSession, pk=pk, created_by=self.request.user)
+
+    def _state(self, session, response_status=status.HTTP_200_OK):
+        response = Response(
+            {
+                "id": str(session.pk),
+                "offset": session.offset,
+                "size": session.size,
+                "expires_at": session.expires_at,
+                "call": session.call_id,
+            },
+            status=response_status,
+        )
+        response["Upload-Offset"] = str(session.offset)
+        return response
+
+    def create(self, request):
+        metadata = {
+            key: request.data.get(key)
+            for key in ("agent", "call_queue", "phone_number", "call_date", "call_id")
+            if request.data.get(key) is not None
+        }
+        try:
+            size = int(request.data.get("size"))
+        except (TypeError, ValueError):
+            size = None
+        try:
+            session = uploads.create_session(
+                request.user, request.data.get("filename"), size, metadata
+            )
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._state(session, status.HTTP_201_CREATED)
+
+    def retrieve(self, request, pk=None):
+        return self._state(self._session(pk))
+
+    def update(self, request, pk=None):
+        session = self._session(pk)
+        try:
+            start, length, total = uploads.parse_content_range(
+                request.headers.get("Content-Range")
+            )
+            session = uploads.append_chunk(
+                session, start, length, request._request, total=total
+            )
+        except uploads.UploadConflict as exc:
+            response = Response(
+                {"detail": str(exc), "offset": exc.offset},
+                status=status.HTTP_409_CONFLICT,
+            )
+            response["Upload-Offset"] = str(exc.offset)
+            return response
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._state(session)
+
+    @action(detail=True, methods=["post"])
+    def finalize(self, request, pk=None):
+        session = self._session(pk)
+
+        def save(audio_file):
+            serializer = CallRecordUploadSerializer(
+                data={**session.metadata, "audio_file": audio_file}
+            )
+            serializer.is_valid(raise_exception=True)
+            return serializer.save(uploaded_by=request.user)
+
+        try:
+            call_record = uploads.finalize(session, save)
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            CallRecordSerializer(call_record, context={"request": request}).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class WorkQueueViewSet(viewsets.ViewSet):
+    """
+    Değerlendirme iş kuyruğu.
+
+    next:
+    Uzmana bir sonraki çağrıyı kiralar; süresi dolmamış bir kiralaması varsa
+    onu döndürür. ``?queue=<id>`` ile kuyruklar sınırlanabilir. Alınabilir
+    iş yoksa 204 döner.
+
+    renew:
+    Kiralama süresini uzatır; kiralama dolmuş ve iş başkasına geçmişse 409.
+
+    release:
+    İşi değerlendirmeden kuyruğa geri bırakır.
+    """
+
+    permission_classes = [IsExpertOrAdmin]
+
+    def _task(self, pk):
+        return get_object_or_404(EvaluationTask, pk=pk, claimed_by=self.request.user)
+
+    def _response(self, task):
+        return Response(
+            EvaluationTaskSerializer(task, context={"request": self.request}).data
+        )
+
+    @action(detail=False, methods=["post"])
+    def next(self, request):
+        try:
+            queue_ids = [int(value) for value in request.query_params.getlist("queue")]
+        except ValueError:
+            raise ValidationError({"queue": "Kuyruk kimlikleri sayı olmalıdır."})
+        task = workqueue.claim_next(request.user, queue_ids)
+        if task is None:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return self._response(task)
+
+    @action(detail=True, methods=["post"])
+    def renew(self, request, pk=None):
+        task = self._task(pk)
+        if not workqueue.renew(task, request.user):
+            return Response(
+                {"detail": "Kiralama süresi dolmuş."}, status=status.HTTP_409_CONFLICT
+            )
+        task.refresh_from_db()
+        return self._response(task)
+
+    @action(detail=True, methods=["post"])
+    def release(self, request, pk=None):
+        workqueue.release(self._task(pk), request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 
 class EvaluationFormViewSet(viewsets.ModelViewSet):
     """
@@ -220,6 +437,7 @@ class EvaluationViewSet(viewsets.ModelViewSet):
     permission_classes = [
         permissions.AllowAny
     ]  # Geçici olarak herkesin erişimine açıyoruz
+    pagination_class = EvaluationCursorPagination
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -228,30 +446,65 @@ class EvaluationViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
+        evaluations = Evaluation.objects.select_related("evaluator", "form").order_by(
+            "-evaluated_at"
+        )
         if hasattr(user, "is_admin") and (user.is_admin() or user.is_superuser):
-            return Evaluation.objects.all().order_by("-evaluated_at")
+            return evaluations
         elif hasattr(user, "is_expert") and user.is_expert():
-            return Evaluation.objects.filter(evaluator=user).order_by("-evaluated_at")
+            return evaluations.filter(evaluator=user)
         else:
-            return Evaluation.objects.filter(call__agent=user).order_by("-evaluated_at")
+            return evaluations.filter(call__agent=user)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            # Puan validasyonu
-            form = serializer.validated_data["form"]
-            scores = serializer.validated_data["scores"]
-
-            for key, field in form.fields.items():
-                max_score = field["max_score"]
-                if key in scores and scores[key]["score"] > max_score:
-                    return Response(
-                        {"scores": [f"{key} için maksimum puan {max_score} olabilir."]},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-
             evaluation = serializer.save(evaluator=request.user)
             return Response(
                 EvaluationSerializer(evaluation).data, status=status.HTTP_201_CREATED
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        permission_classes=[IsAuthenticated, IsExpertOrAdmin],
+        parser_classes=[JSONParser, NDJSONParser],
+    )
+    def bulk(self, request):
+        """
+        Toplu değerlendirme oluşturur. Gövde bir JSON dizisi ya da NDJSON
+        (application/x-ndjson) olabilir. Geçerli öğeler eklenir, geçersizler
+        sıra numaralarıyla birlikte ``errors`` listesinde döner.
+        """
+        items = request.data
+        # JSON gövdesi liste, NDJSON gövdesi satır üreteci olarak gelir
+        if not isinstance(items, (list, GeneratorType)):
+            return Response(
+                {"detail": "Gövde bir değerlendirme listesi olmalıdır."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        result = bulk_create_evaluations(items, evaluator=request.user)
+        created = len(result.created_ids)
+        elapsed = result.elapsed_seconds
+        if created and not result.errors:
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {
+                "created": created,
+                "failed": len(result.errors),
+                "ids": result.created_ids,
+                "errors": result.errors,
+                "elapsed_seconds": round(elapsed, 3),
+                "items_per_second": (
+                    round(result.total / elapsed, 1) if elapsed else None
+                ),
+            },
+            status=response_status,
+        )
@@ -0,0 +1,160 @@
+"""
+Çağrı kayıtlarının akustik ölçümleri.
+
+Ses ``PCMReader`` ile kanal kanal bloklar halinde okunur ve ``FRAME_SECONDS``
+uzunluğundaki karelerin enerjisi NumPy ile vektörel olarak hesaplanır. Kare
+enerjilerinden sessizlik oranı, en uzun sessizlik, kırpılma oranı ve stereo
+kayıtlarda kanal başına konuşma oranı çıkarılır; sonuçlar
+``CallAcousticMetrics`` tablosuna yazılır ve değerlendirilecek çağrıların
+önceliklendirilmesinde kullanılır.
+
+Çözme ve hesaplama işlemci yoğun olduğundan kayıtlar bir süreç havuzunda
+analiz edilir; işçiler veritabanına dokunmaz, sonuçları ana süreç toplu
+olarak kaydeder.
+"""
+
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .audio import AudioDecodeError, LocalFile, PCMReader
+from .models import CallAcousticMetrics, CallRecord
+
+FRAME_SECONDS = 0.02
+FRAMES_PER_BLOCK = 512
+# -40 dBFS altındaki kareler sessiz sayılır
+SILENCE_THRESHOLD = 10 ** (-40 / 20)
+CLIP_THRESHOLD = 0.99
+MIN_DBFS = -120.0
+
+METRIC_FIELDS = [
+    "duration_seconds",
+    "rms_dbfs",
+    "silence_ratio",
+    "longest_silence_seconds",
+    "clipping_ratio",
+    "talk_ratios",
+]
+
+
+def _longest_run(mask):
+    """Boole dizisindeki en uzun True dizisinin uzunluğu."""
+    if not mask.any():
+        return 0
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], mask.view(np.int8), [0]])))
+    return int((edges[1::2] - edges[::2]).max())
+
+
+def analyze(reader):
+    """``PCMReader``dan ``METRIC_FIELDS`` anahtarlı bir sözlük döndürür."""
+    frame_size = max(1, round(reader.sample_rate * FRAME_SECONDS))
+    energies = []
+    remainder = None
+    samples = clipped = 0
+
+    for block in reader.blocks(frame_size * FRAMES_PER_BLOCK, mono=False):
+        samples += block.shape[0]
+        clipped += np.count_nonzero(np.abs(block) >= CLIP_THRESHOLD)
+        if remainder is not None and len(remainder):
+            block = np.concatenate([remainder, block])
+        full = len(block) // frame_size * frame_size
+        squares = np.square(block[:full], dtype=np.float64)
+        energies.append(squares.reshape(-1, frame_size, block.shape[1]).mean(axis=1))
+        remainder = block[full:]
+    if remainder is not None and len(remainder):
+        energies.append(np.square(remainder, dtype=np.float64).mean(axis=0)[None])
+
+    channels = energies[0].shape[1] if energies else reader.channels
+    energy = (
+        np.concatenate(energies) if energies else np.zeros((0, channels), np.float64)
+    )
+    active = np.sqrt(energy) >= SILENCE_THRESHOLD
+    silent = ~active.any(axis=1)
+    mean_energy = float(energy.mean()) if energy.size else 0.0
+
+    return {
+        "duration_seconds": round(samples / reader.sample_rate, 3),
+        "rms_dbfs": round(max(10 * np.log10(max(mean_energy, 1e-30)), MIN_DBFS), 2),
+        "silence_ratio": round(float(silent.mean()) if len(silent) else 1.0, 4),
+        "longest_silence_seconds": round(_longest_run(silent) * FRAME_SECONDS, 2),
+        "clipping_ratio": round(clipped / (samples * channels or 1), 6),
+        "talk_ratios": (
+            [round(float(ratio), 4) for ratio in active.mean(axis=0)]
+            if channels > 1 and len(active)
+            else None
+        ),
+    }
+
+
+def analyze_file(path):
+    """
+    Süreç havuzu işçisi: (yol, ölçümler) döndürür; ses çözülemezse
+    ölçümler None olur.
+    """
+    try:
+        with PCMReader(LocalFile(path)) as reader:
+            return path, analyze(reader)
+    except (AudioDecodeError, OSError):
+        return path, None
+
+
+def analyze_call(call):
+    """Tek çağrıyı analiz edip ölçümlerini kaydeder; ses çözülemezse False."""
+    _path, metrics = analyze_file(call.audio_file.path)
+    if metrics is None:
+        return False
+    CallAcousticMetrics.objects.update_or_create(call=call, defaults=metrics)
+    return True
+
+
+def analyze_paths(paths, workers=None, chunksize=4):
+    """
+    Dosyaları ``workers`` süreçte analiz eder ve (yol, ölçümler) çiftlerini
+    üretir. ``workers`` 1 ise havuz açılmadan aynı süreçte çalışılır.
+    """
+    if workers == 1:
+        yield from map(analyze_file, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(analyze_file, paths, chunksize=chunksize)
+
+
+def analyze_calls(force=False, workers=None, batch_size=200):
+    """
+    Ölçümü olmayan çağrıları analiz edip kaydeder. (analiz edilen,
+    başarısız, geçen süre) döndürür.
+    """
+    calls = CallRecord.objects.exclude(audio_file="").order_by("pk")
+    if not force:
+        calls = calls.filter(acoustic_metrics__isnull=True)
+    started = time.perf_counter()
+    analyzed = failed = 0
+    last_pk = 0
+
+    while True:
+        batch = list(calls.filter(pk__gt=last_pk).only("pk", "audio_file")[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        # Aynı içerikteki çağrılar tek blobu paylaşır; dosya bir kez analiz edilir
+        by_path = defaultdict(list)
+        for call in batch:
+            by_path[call.audio_file.path].append(call.pk)
+        rows = []
+        for path, metrics in analyze_paths(list(by_path), workers):
+            if metrics is None:
+                failed += len(by_path[path])
+                continue
+            rows.extend(
+                CallAcousticMetrics(call_id=pk, **metrics) for pk in by_path[path]
+            )
+        CallAcousticMetrics.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["call"],
+            update_fields=METRIC_FIELDS + ["analyzed_at"],
+        )
+        analyzed += len(rows)
+    return analyzed, failed, time.perf_counter() - started
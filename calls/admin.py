@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import CallQueue, CallRecord, Evaluation, EvaluationForm
+from .models import CallQueue, CallRecord, Evaluation, EvaluationForm, SlowQuery
 
 
 @admin.register(CallQueue)
@@ -45,8 +45,21 @@ class CallRecordAdmin(admin.ModelAdmin):
     Çağrı kaydı yönetimi için admin arayüzü.
     """
 
-    list_display = ["agent", "call_queue", "phone_number", "call_date", "uploaded_at"]
-    list_filter = ["call_date", "uploaded_at", "agent", "call_queue"]
+    list_display = [
+        "agent",
+        "call_queue",
+        "phone_number",
+        "call_date",
+        "uploaded_at",
+        "processing_status",
+    ]
+    list_filter = [
+        "call_date",
+        "uploaded_at",
+        "agent",
+        "call_queue",
+        "processing_status",
+    ]
     search_fields = [
         "agent__username",
         "agent__first_name",
@@ -54,7 +67,7 @@ class CallRecordAdmin(admin.ModelAdmin):
         "call_id",
         "phone_number",
     ]
-    readonly_fields = ["uploaded_at"]
+    readonly_fields = ["uploaded_at", "processing_status", "processing_error"]
 
 
 @admin.register(Evaluation)
@@ -67,3 +80,50 @@ class EvaluationAdmin(admin.ModelAdmin):
     list_filter = ["evaluated_at", "evaluator"]
     search_fields = ["call__agent__username", "evaluator__username", "final_note"]
     readonly_fields = ["evaluated_at"]
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """
+    Yavaş sorgular; parmak izleri toplam süreye göre sıralanır.
+    """
+
+    list_display = [
+        "short_sql",
+        "calls",
+        "total_ms",
+        "avg_ms",
+        "max_ms",
+        "call_site",
+        "last_seen",
+    ]
+    search_fields = ["sql", "call_site"]
+    ordering = ["-total_ms"]
+    readonly_fields = [
+        "fingerprint",
+        "sql",
+        "call_site",
+        "calls",
+        "total_ms",
+        "max_ms",
+        "first_seen",
+        "last_seen",
+        "explain",
+        "explained_at",
+    ]
+
+    def short_sql(self, obj):
+        return obj.sql if len(obj.sql) <= 120 else f"{obj.sql[:120]}…"
+
+    short_sql.short_description = "Sorgu"
+
+    def avg_ms(self, obj):
+        return round(obj.total_ms / obj.calls, 1) if obj.calls else 0
+
+    avg_ms.short_description = "Ortalama (ms)"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
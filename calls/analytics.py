@@ -0,0 +1,127 @@
+"""
+Kriter bazında değerlendirme analizleri.
+
+Evaluation.scores JSON'ı her kayıtta EvaluationCriterionScore satırlarına
+açılır. Aşağıdaki analizler bu dar tablo üzerinde düz SQL toplamalarıyla
+çalışır; JSON Python tarafında ayrıştırılmaz.
+"""
+
+from django.db import transaction
+from django.db.models import Avg, Count, Exists, F, FloatField, OuterRef
+from django.db.models.functions import Cast, Floor, Least
+
+from .models import Evaluation, EvaluationCriterionScore
+from .queries import date_range_lookups
+from .scoring import get_scorer
+
+
+def criterion_rows(evaluation):
+    """Değerlendirmenin puanlarından kaydedilmemiş kriter satırları üretir."""
+    scorer = get_scorer(evaluation.form if evaluation.form_id else None)
+    return [
+        EvaluationCriterionScore(
+            evaluation_id=evaluation.pk,
+            criterion_key=key,
+            score=score,
+            max_score=max_score,
+        )
+        for key, score, max_score in scorer.criterion_points(evaluation.scores)
+    ]
+
+
+def sync_criterion_scores(evaluation, created=False):
+    """Değerlendirmenin kriter satırlarını puanlarıyla eşitler."""
+    with transaction.atomic():
+        if not created:
+            EvaluationCriterionScore.objects.filter(evaluation=evaluation).delete()
+        EvaluationCriterionScore.objects.bulk_create(criterion_rows(evaluation))
+
+
+def backfill_criterion_scores(batch_size=500, rebuild=False):
+    """
+    Kriter satırı olmayan değerlendirmeleri doldurur. ``rebuild`` verilirse
+    tüm tablo baştan oluşturulur. İşlenen değerlendirme sayısını döndürür.
+    """
+    evaluations = Evaluation.objects.select_related("form").order_by("pk")
+    if rebuild:
+        EvaluationCriterionScore.objects.all().delete()
+    else:
+        has_rows = EvaluationCriterionScore.objects.filter(evaluation=OuterRef("pk"))
+        evaluations = evaluations.filter(~Exists(has_rows))
+
+    processed = 0
+    batch = []
+    for evaluation in evaluations.iterator(chunk_size=batch_size):
+        batch.extend(criterion_rows(evaluation))
+        processed += 1
+        if processed % batch_size == 0:
+            EvaluationCriterionScore.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        EvaluationCriterionScore.objects.bulk_create(batch, ignore_conflicts=True)
+    return processed
+
+
+def criterion_scores(start_date=None, end_date=None, agent_id=None, queue_id=None):
+    """Tarih, temsilci ve kuyruk filtreleri uygulanmış kriter satırları."""
+    rows = EvaluationCriterionScore.objects.filter(
+        **date_range_lookups("evaluation__evaluated_at", start_date, end_date)
+    )
+    if agent_id:
+        rows = rows.filter(evaluation__call__agent_id=agent_id)
+    if queue_id:
+        rows = rows.filter(evaluation__call__call_queue_id=queue_id)
+    return rows
+
+
+def _ratio():
+    # Puanın kriterin maksimum puanına oranı (0-1)
+    return Cast("score", FloatField()) / Cast("max_score", FloatField())
+
+
+def criterion_averages(rows):
+    """Her kriter için ortalama puan ve başarı oranı."""
+    return (
+        rows.filter(max_score__gt=0)
+        .values("criterion_key")
+        .annotate(
+            total=Count("id"),
+            avg_score=Avg("score"),
+            avg_ratio=Avg(_ratio()),
+        )
+        .order_by("criterion_key")
+    )
+
+
+def criterion_averages_by_agent(rows, criterion_key):
+    """Tek bir kriterin temsilci bazında ortalaması (ör. çeyreklik Empati)."""
+    return (
+        rows.filter(criterion_key=criterion_key)
+        .values(
+            agent_id=F("evaluation__call__agent_id"),
+        )
+        .annotate(total=Count("id"), avg_score=Avg("score"))
+        .order_by("-avg_score")
+    )
+
+
+def criterion_histogram(rows, criterion_key, bins=10):
+    """
+    Kriterin başarı oranı dağılımı. ``bucket`` 0..bins-1 aralığındadır;
+    tam puan son kovaya düşer. Sonuç ``{bucket: adet}`` sözlüğüdür.
+    """
+    histogram = (
+        rows.filter(criterion_key=criterion_key, max_score__gt=0)
+        .annotate(
+            bucket=Least(Floor(_ratio() * bins), bins - 1, output_field=FloatField())
+        )
+        .values("bucket")
+        .annotate(count=Count("id"))
+        .order_by("bucket")
+    )
+    return {int(row["bucket"]): row["count"] for row in histogram}
+
+
+def weakest_criteria(rows, limit=3):
+    """Ortalama başarı oranı en düşük kriterler."""
+    return criterion_averages(rows).order_by("avg_ratio")[:limit]
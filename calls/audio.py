@@ -0,0 +1,158 @@
+"""
+Ses dosyalarını PCM örneklere çözme.
+
+WAV (PCM) dosyaları standart kütüphanedeki ``wave`` ile doğrudan okunur.
+MP3/M4A için sunucuda ``ffmpeg`` bulunmalıdır; dosya ffmpeg ile mono 16 bit
+PCM'e çevrilerek okunur. Örnekler bloklar halinde ``float32`` NumPy dizisi
+(-1..1) olarak üretilir; dosyanın tamamı belleğe alınmaz. Varsayılan olarak
+kanallar birleştirilir; ``mono=False`` ile (kare, kanal) dizileri döner.
+"""
+
+import shutil
+import subprocess  # nosec B404
+import wave
+
+import numpy as np
+
+BLOCK_FRAMES = 1 << 16
+FFMPEG_SAMPLE_RATE = 16000
+
+
+class AudioDecodeError(ValueError):
+    pass
+
+
+def _to_float(raw, sample_width):
+    """Ham PCM baytlarını -1..1 aralığında float32 diziye çevirir."""
+    if sample_width == 1:
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    if sample_width == 2:
+        return np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    if sample_width == 3:
+        data = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = data[:, 0] | (data[:, 1] << 8) | (data[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        return values.astype(np.float32) / 8388608
+    if sample_width == 4:
+        return np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    raise AudioDecodeError(f"Desteklenmeyen örnek genişliği: {sample_width}")
+
+
+def _mono(samples, channels):
+    if channels == 1:
+        return samples
+    return samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+
+
+class LocalFile:
+    """Yerel bir dosya yolunu ``PCMReader`` için ``FieldFile`` gibi sunar."""
+
+    def __init__(self, path):
+        self.name = self.path = str(path)
+
+    def open(self, mode="rb"):
+        return open(self.path, mode)
+
+
+class PCMReader:
+    """
+    ``FieldFile`` için mono PCM okuyucu. ``sample_rate`` ve ``channels``
+    kaynağın özellikleridir; ``frames`` ffmpeg ile okunan dosyalarda None
+    olabilir.
+    """
+
+    def __init__(self, field_file):
+        self.field_file = field_file
+        self._wave = None
+        self._process = None
+        if field_file.name.lower().endswith(".wav"):
+            self._open_wave()
+        else:
+            self._open_ffmpeg()
+
+    def _open_wave(self):
+        self._file = self.field_file.open("rb")
+        try:
+            self._wave = wave.open(self._file, "rb")
+        except (wave.Error, EOFError) as exc:
+            self._file.close()
+            raise AudioDecodeError(f"WAV dosyası okunamadı: {exc}")
+        self.sample_rate = self._wave.getframerate()
+        self.channels = self._wave.getnchannels()
+        self.frames = self._wave.getnframes()
+        self._sample_width = self._wave.getsampwidth()
+
+    def _open_ffmpeg(self):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise AudioDecodeError("Bu biçim için ffmpeg gerekli.")
+        try:
+            path = self.field_file.path
+        except NotImplementedError:
+            raise AudioDecodeError("ffmpeg yalnızca yerel dosyaları okuyabilir.")
+        self._process = subprocess.Popen(  # nosec B603
+            [
+                ffmpeg,
+                "-v",
+                "error",
+                "-i",
+                path,
+                "-f",
+                "s16le",
+                "-ac",
+                "1",
+                "-ar",
+                str(FFMPEG_SAMPLE_RATE),
+                "-",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self.sample_rate = FFMPEG_SAMPLE_RATE
+        self.channels = 1
+        self.frames = None
+        self._sample_width = 2
+
+    def blocks(self, block_frames=BLOCK_FRAMES, mono=True):
+        """
+        En fazla ``block_frames`` örneklik float32 bloklar üretir; ``mono``
+        False ise bloklar (kare, kanal) biçimindedir.
+        """
+        if self._wave is not None:
+            while True:
+                raw = self._wave.readframes(block_frames)
+                if not raw:
+                    return
+                samples = _to_float(raw, self._sample_width)
+                if mono:
+                    yield _mono(samples, self.channels)
+                else:
+                    yield samples.reshape(-1, self.channels)
+        else:
+            frame_bytes = self._sample_width
+            while True:
+                raw = self._process.stdout.read(block_frames * frame_bytes)
+                if not raw:
+                    break
+                # Tek bayt kalan parçalar (yarım örnek) atılır
+                raw = raw[: len(raw) - len(raw) % frame_bytes]
+                samples = _to_float(raw, self._sample_width)
+                yield samples if mono else samples.reshape(-1, 1)
+            if self._process.wait() != 0:
+                raise AudioDecodeError("ffmpeg dosyayı çözemedi.")
+
+    def close(self):
+        if self._wave is not None:
+            self._wave.close()
+            self._file.close()
+        if self._process is not None:
+            self._process.stdout.close()
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
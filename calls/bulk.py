@@ -0,0 +1,148 @@
+"""
+Toplu değerlendirme oluşturma.
+
+Kalibrasyon oturumları ve eski kalite aracından taşınan veriler binlerce
+değerlendirmeyi tek istekte gönderir. Öğeler parçalar (chunk) halinde işlenir:
+her parça için çağrılar ve formlar tek sorguyla önceden yüklenir, puanlar
+derlenmiş puanlayıcıyla doğrulanıp hesaplanır, geçerli öğeler
+``bulk_create`` ile eklenir. Günlük özetler ve kriter puanları aynı
+transaction içinde toplu olarak güncellenir. Geçersiz öğeler eklenmez ve
+sıra numaralarıyla birlikte hata listesinde döner.
+"""
+
+import time
+from collections import namedtuple
+from itertools import islice
+
+from django.db import transaction
+
+from .analytics import criterion_rows
+from .metrics import EVALUATIONS_CREATED
+from .models import CallRecord, Evaluation, EvaluationCriterionScore, EvaluationForm
+from .overview import schedule_invalidation
+from .rollups import evaluations_created
+from .scoring import get_scorer
+from .workqueue import complete_calls
+
+CHUNK_SIZE = 500
+
+BulkResult = namedtuple(
+    "BulkResult", ["created_ids", "errors", "total", "elapsed_seconds"]
+)
+
+
+def _as_int(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _validate(item, calls, forms):
+    """Öğeyi doğrular; (Evaluation, None) ya da (None, hatalar) döndürür."""
+    if isinstance(item, Exception):
+        return None, {"non_field_errors": [f"Geçersiz JSON: {item}"]}
+    if not isinstance(item, dict):
+        return None, {"non_field_errors": ["Her öğe bir JSON nesnesi olmalıdır."]}
+
+    errors = {}
+    call = calls.get(_as_int(item.get("call")))
+    if call is None:
+        errors["call"] = ["Geçerli bir çağrı kaydı seçin."]
+    form = forms.get(_as_int(item.get("form")))
+    if form is None:
+        errors["form"] = ["Geçerli bir değerlendirme formu seçin."]
+    scores = item.get("scores")
+    if not isinstance(scores, dict):
+        errors["scores"] = ["Puanlar sözlük (dict) olmalıdır."]
+    final_note = item.get("final_note")
+    if not isinstance(final_note, str) or not final_note.strip():
+        errors["final_note"] = ["Bu alan zorunludur."]
+    if errors:
+        return None, errors
+
+    result = get_scorer(form).evaluate(scores)
+    if result.errors:
+        return None, {"scores": result.errors}
+
+    evaluation = Evaluation(
+        call=call,
+        form=form,
+        scores=scores,
+        final_note=final_note,
+        total_score=result.total_score,
+    )
+    return evaluation, None
+
+
+def _insert(evaluations, calls):
+    with transaction.atomic():
+        created = Evaluation.objects.bulk_create(evaluations)
+        if created and created[0].pk is None:
+            # Veritabanı eklenen satırların id'lerini döndürmüyorsa özet ve
+            # kriter tabloları tek tek kayıtla güncellenemez
+            raise RuntimeError("bulk_create eklenen id'leri döndürmedi.")
+        evaluations_created(created, calls)
+        complete_calls({evaluation.call_id for evaluation in created})
+        schedule_invalidation()
+        transaction.on_commit(
+            lambda: EVALUATIONS_CREATED.labels("bulk").inc(len(created))
+        )
+        EvaluationCriterionScore.objects.bulk_create(
+            [row for evaluation in created for row in criterion_rows(evaluation)]
+        )
+    return created
+
+
+def bulk_create_evaluations(items, evaluator, chunk_size=CHUNK_SIZE):
+    """
+    ``items`` herhangi bir yinelenebilir olabilir (liste ya da NDJSON satır
+    üreticisi); yalnızca bir parça bellekte tutulur.
+    """
+    started = time.perf_counter()
+    created_ids = []
+    errors = []
+    forms = {}
+    index = 0
+    items = iter(items)
+
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            break
+
+        call_ids = set()
+        form_ids = set()
+        for item in chunk:
+            if isinstance(item, dict):
+                call_ids.add(_as_int(item.get("call")))
+                form_ids.add(_as_int(item.get("form")))
+        call_ids.discard(None)
+        form_ids = form_ids - set(forms) - {None}
+        calls = CallRecord.objects.only("id", "agent_id", "call_queue_id").in_bulk(
+            call_ids
+        )
+        if form_ids:
+            forms.update(EvaluationForm.objects.in_bulk(form_ids))
+
+        valid = []
+        for item in chunk:
+            evaluation, item_errors = _validate(item, calls, forms)
+            if item_errors:
+                errors.append({"index": index, "errors": item_errors})
+            else:
+                evaluation.evaluator = evaluator
+                valid.append(evaluation)
+            index += 1
+
+        if valid:
+            created_ids.extend(e.pk for e in _insert(valid, calls))
+
+    return BulkResult(
+        created_ids=created_ids,
+        errors=errors,
+        total=index,
+        elapsed_seconds=time.perf_counter() - started,
+    )
@@ -0,0 +1,53 @@
+"""
+Sık okunan, seyrek değişen tanımlar: aktif değerlendirme formları ve çağrı
+kuyrukları.
+
+Listeler önbellekte tutulur ve form ya da kuyruk kaydedildiğinde/silindiğinde
+transaction commit edildikten sonra silinir. ``warm`` işçi açılırken
+(bkz. qualityhub/health.py) listeleri önbelleğe yükler ve aktif formların
+puanlayıcılarını derler; ilk istekler bu işleri beklemez.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import CallQueue, EvaluationForm
+from .scoring import get_scorer
+
+FORMS_KEY = "catalog:evaluation_forms"
+QUEUES_KEY = "catalog:call_queues"
+
+
+def active_forms():
+    """Aktif değerlendirme formları, en yenisi önce (modelin sıralaması)."""
+    forms = cache.get(FORMS_KEY)
+    if forms is None:
+        forms = list(EvaluationForm.objects.filter(is_active=True))
+        cache.set(FORMS_KEY, forms, None)
+    return forms
+
+
+def call_queues():
+    """Tüm çağrı kuyrukları, ada göre."""
+    queues = cache.get(QUEUES_KEY)
+    if queues is None:
+        queues = list(CallQueue.objects.order_by("name"))
+        cache.set(QUEUES_KEY, queues, None)
+    return queues
+
+
+def warm():
+    """Listeleri önbelleğe yükler ve aktif formların puanlayıcılarını derler."""
+    cache.delete_many([FORMS_KEY, QUEUES_KEY])
+    for form in active_forms():
+        get_scorer(form)
+    call_queues()
+
+
+def invalidate():
+    cache.delete_many([FORMS_KEY, QUEUES_KEY])
+
+
+def schedule_invalidation():
+    """Transaction commit edildikten sonra listeleri önbellekten siler."""
+    transaction.on_commit(invalidate)
@@ -0,0 +1,81 @@
+"""
+WAV kayıtlarından kesit çıkarma.
+
+Dosya ``mmap`` ile eşlenir; başlıktan kare boyutu ve veri bölümünün konumu
+okunur, istenen ``[başlangıç, bitiş)`` aralığı bayt konumlarına çevrilip
+doğrudan dilimlenir. Ses çözülmez ve dosyanın yalnızca başlık ile kesite
+düşen sayfaları okunur; süre kaydın uzunluğundan bağımsızdır. Özgün ``fmt``
+bölümü olduğu gibi kopyalanır, böylece kesit kaynakla aynı biçimde kalır.
+"""
+
+import mmap
+import struct
+
+from django.conf import settings
+
+from .probe import AudioFormatError, wav_header
+
+
+class ClipError(ValueError):
+    pass
+
+
+def parse_bounds(start, end):
+    """Saniye cinsinden sorgu parametrelerini doğrular."""
+    try:
+        start, end = float(start), float(end)
+    except (TypeError, ValueError):
+        raise ClipError("start ve end saniye cinsinden sayı olmalıdır.")
+    if not 0 <= start < end:
+        raise ClipError("Geçersiz aralık: 0 <= start < end olmalıdır.")
+    if end - start > settings.AUDIO_CLIP_MAX_SECONDS:
+        raise ClipError(
+            f"Kesit en fazla {settings.AUDIO_CLIP_MAX_SECONDS} saniye olabilir."
+        )
+    return start, end
+
+
+def extract_clip(field_file, start, end):
+    """``field_file`` içindeki WAV kaydının ``[start, end)`` kesitini döndürür."""
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        raise ClipError("Kesit yalnızca yerel dosyalardan alınabilir.")
+
+    with open(path, "rb") as source:
+        try:
+            mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ClipError("Ses dosyası boş.")
+        with mapped:
+            try:
+                info = wav_header(mapped)
+            except AudioFormatError as exc:
+                raise ClipError(str(exc))
+            block_align = info["block_align"]
+            frames = info["data_size"] // block_align
+            first = min(round(start * info["sample_rate"]), frames)
+            last = min(round(end * info["sample_rate"]), frames)
+            if first >= last:
+                raise ClipError("İstenen aralık kaydın dışında.")
+
+            offset = info["data_offset"]
+            data = mapped[offset + first * block_align : offset + last * block_align]
+            fmt_start, fmt_length = info["fmt_chunk"]
+            fmt = mapped[fmt_start : fmt_start + fmt_length]
+
+    # RIFF bölümleri çift uzunlukta hizalanır
+    padding = b"\0" * (len(data) & 1)
+    riff_size = 4 + len(fmt) + 8 + len(data) + len(padding)
+    return b"".join(
+        [
+            b"RIFF",
+            struct.pack("<I", riff_size),
+            b"WAVE",
+            fmt,
+            b"data",
+            struct.pack("<I", len(data)),
+            data,
+            padding,
+        ]
+    )
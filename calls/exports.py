@@ -0,0 +1,104 @@
+"""
+Değerlendirmelerin CSV / NDJSON olarak akış halinde dışa aktarımı.
+
+Satırlar ``values_list(...).iterator(chunk_size=...)`` ile okunur; PostgreSQL'de
+bu sunucu tarafı imleç kullanır, yani sorgu sonucu belleğe alınmaz. Her satır
+üretildiği anda yazılır; bellek kullanımı dışa aktarılan satır sayısından
+bağımsızdır.
+"""
+
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import EvaluationForm
+
+CHUNK_SIZE = 2000
+
+# (başlık, values_list alanı)
+COLUMNS = [
+    ("evaluation_id", "id"),
+    ("evaluated_at", "evaluated_at"),
+    ("call_record_id", "call_id"),
+    ("call_id", "call__call_id"),
+    ("call_date", "call__call_date"),
+    ("phone_number", "call__phone_number"),
+    ("agent_id", "call__agent_id"),
+    ("agent_username", "call__agent__username"),
+    ("agent_first_name", "call__agent__first_name"),
+    ("agent_last_name", "call__agent__last_name"),
+    ("call_queue", "call__call_queue__name"),
+    ("evaluator_id", "evaluator_id"),
+    ("evaluator_username", "evaluator__username"),
+    ("evaluator_first_name", "evaluator__first_name"),
+    ("evaluator_last_name", "evaluator__last_name"),
+    ("form", "form__name"),
+    ("total_score", "total_score"),
+    ("final_note", "final_note"),
+]
+
+
+def criterion_keys(evaluations):
+    """
+    Dışa aktarılan değerlendirmelerin formlarındaki kriter anahtarları,
+    form tanımındaki sırayla. CSV başlığının satırlardan önce bilinmesi gerekir.
+    """
+    forms = EvaluationForm.objects.filter(
+        id__in=evaluations.order_by().values("form_id")
+    ).order_by("id")
+    keys = {}
+    for fields in forms.values_list("fields", flat=True).iterator():
+        for key in fields or {}:
+            keys.setdefault(key, None)
+    return list(keys)
+
+
+def export_rows(evaluations, keys, chunk_size=CHUNK_SIZE):
+    """Her değerlendirme için sabit sütunlar ve ardından kriter puanları."""
+    lookups = [lookup for _header, lookup in COLUMNS] + ["scores"]
+    rows = (
+        evaluations.select_related(None)
+        .order_by("-evaluated_at", "id")
+        .values_list(*lookups)
+        .iterator(chunk_size=chunk_size)
+    )
+    for row in rows:
+        scores = row[-1] or {}
+        criteria = []
+        for key in keys:
+            entry = scores.get(key)
+            criteria.append(entry.get("score") if isinstance(entry, dict) else entry)
+        yield list(row[:-1]) + criteria
+
+
+def header(keys):
+    return [name for name, _lookup in COLUMNS] + [f"score_{key}" for key in keys]
+
+
+class _Echo:
+    """csv.writer için satırı biriktirmeden geri döndüren sahte dosya."""
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(evaluations, chunk_size=CHUNK_SIZE):
+    keys = criterion_keys(evaluations)
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header(keys))
+    for row in export_rows(evaluations, keys, chunk_size):
+        yield writer.writerow(row)
+
+
+def ndjson_stream(evaluations, chunk_size=CHUNK_SIZE):
+    keys = criterion_keys(evaluations)
+    names = header(keys)
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in export_rows(evaluations, keys, chunk_size):
+        yield encoder.encode(dict(zip(names, row))) + "\n"
+
+
+FORMATS = {
+    "csv": (csv_stream, "text/csv; charset=utf-8"),
+    "ndjson": (ndjson_stream, "application/x-ndjson"),
+}
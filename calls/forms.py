@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth import get_user_model
 
 from .models import CallQueue, CallRecord, Evaluation, EvaluationForm
+from .scoring import get_scorer
 
 User = get_user_model()
 
@@ -106,13 +107,7 @@ class EvaluationCreateForm(forms.ModelForm):
         cleaned_data["scores"] = scores
 
         # Toplam puanı hesapla
-        total_points = sum(item["score"] for item in scores.values())
-        max_points = sum(item["max_score"] for item in scores.values())
-
-        if max_points > 0:
-            total_score = (total_points / max_points) * 100
-        else:
-            total_score = 0
+        total_score = get_scorer(self.form_template).total(scores)
 
         cleaned_data["total_score"] = total_score
 
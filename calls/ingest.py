@@ -0,0 +1,307 @@
+"""
+ZIP arşivinden toplu çağrı kaydı yükleme.
+
+Santral gece dışa aktarımı ses dosyalarını ve bir manifest dosyasını
+(``manifest.csv`` ya da ``manifest.json``) tek bir ZIP içinde üretir. Manifest
+satırları ``file, agent, queue, phone_number, call_date, call_id``
+sütunlarından oluşur; ``agent`` kullanıcı id'si ya da kullanıcı adı, ``queue``
+kuyruk id'si ya da adı olabilir.
+
+Arşiv belleğe alınmaz: her ses dosyası ``ZipFile.open`` ile parça parça
+okunarak doğrudan depolamaya yazılır. Manifest ise ses dosyalarından önce
+bütünüyle okunur; okunamıyorsa hiçbir dosya saklanmadan ``ManifestError``
+yükselir. Kayıtlar parçalar halinde
+``bulk_create`` ile eklenir. Her satır için ayrı bir sonuç döner; aynı
+``call_id`` ile daha önce yüklenmiş satırlar atlandığından başarısız satırlar
+arşiv yeniden gönderilerek tekrar denenebilir.
+"""
+
+import csv
+import io
+import json
+import lzma
+import os
+import zipfile
+import zlib
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import CallQueue, CallRecord
+from .overview import schedule_invalidation
+from .probe import AudioFormatError, AudioProbe, audio_fields
+from .tasks import schedule_processing
+from .workqueue import enqueue_uploaded
+
+CHUNK_SIZE = 500
+MANIFEST_NAMES = ("manifest.csv", "manifest.json")
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a")
+# Sıkıştırma bombalarına karşı tek bir ses dosyasının açılmış boyut sınırı
+MAX_ENTRY_SIZE = 200 * 1024 * 1024
+
+IngestResult = namedtuple("IngestResult", ["entries", "created", "failed"])
+
+
+class EntrySizeError(ValueError):
+    """Açılan ses dosyası ``MAX_ENTRY_SIZE`` sınırını aştı."""
+
+
+# Tek bir arşiv üyesini okurken oluşabilen hatalar; yalnızca o satır başarısız
+# olur. RuntimeError şifreli, NotImplementedError desteklenmeyen sıkıştırma,
+# zlib.error/EOFError/LZMAError bozuk sıkıştırılmış veri içindir.
+ENTRY_ERRORS = (
+    OSError,
+    EOFError,
+    RuntimeError,
+    zipfile.BadZipFile,
+    zlib.error,
+    lzma.LZMAError,
+    AudioFormatError,
+    EntrySizeError,
+)
+
+
+class ManifestError(ValueError):
+    """Arşiv ya da manifest bütünüyle okunamıyor."""
+
+
+def _find_manifest(archive):
+    for info in archive.infolist():
+        if os.path.basename(info.filename).lower() in MANIFEST_NAMES:
+            return info
+    raise ManifestError("Arşivde manifest.csv ya da manifest.json bulunamadı.")
+
+
+def read_manifest(archive):
+    """Manifest satırlarını sözlük olarak üretir."""
+    info = _find_manifest(archive)
+    with archive.open(info) as raw:
+        if info.filename.lower().endswith(".json"):
+            try:
+                rows = json.load(io.TextIOWrapper(raw, encoding="utf-8-sig"))
+            except ValueError as exc:
+                raise ManifestError(f"Manifest okunamadı: {exc}")
+            if not isinstance(rows, list):
+                raise ManifestError("JSON manifest bir liste olmalıdır.")
+            yield from rows
+        else:
+            yield from csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig"))
+
+
+def _lookup_key(value):
+    value = str(value or "").strip()
+    return int(value) if value.isdigit() else value
+
+
+def _resolve(model, field, values):
+    """id ya da ``field`` değerleriyle verilen nesneleri tek sorguda yükler."""
+    ids = {value for value in values if isinstance(value, int)}
+    names = {value for value in values if isinstance(value, str) and value}
+    objects = {}
+    for obj in model.objects.filter(pk__in=ids) | model.objects.filter(
+        **{f"{field}__in": names}
+    ):
+        objects[obj.pk] = obj
+        objects[getattr(obj, field)] = obj
+    return objects
+
+
+def _parse_call_date(value):
+    try:
+        call_date = parse_datetime(str(value or "").strip())
+    except ValueError:
+        call_date = None
+    if call_date is not None and timezone.is_naive(call_date):
+        call_date = timezone.make_aware(call_date)
+    return call_date
+
+
+def _validate(row, members, agents, queues, existing):
+    """Satırı doğrular; (alanlar, None) ya da (None, hatalar) döndürür."""
+    if not isinstance(row, dict):
+        return None, {"non_field_errors": ["Manifest satırı bir nesne olmalıdır."]}
+
+    errors = {}
+    name = str(row.get("file") or "").strip()
+    info = members.get(name)
+    if info is None:
+        errors["file"] = ["Dosya arşivde bulunamadı."]
+    elif os.path.splitext(name)[1].lower() not in AUDIO_EXTENSIONS:
+        errors["file"] = ["Sadece .mp3, .wav ve .m4a dosyaları yüklenebilir."]
+    elif info.file_size > MAX_ENTRY_SIZE:
+        errors["file"] = ["Dosya boyutu sınırı aşıldı."]
+
+    agent = agents.get(_lookup_key(row.get("agent")))
+    if agent is None:
+        errors["agent"] = ["Temsilci bulunamadı."]
+    queue = queues.get(_lookup_key(row.get("queue")))
+    if queue is None:
+        errors["queue"] = ["Kuyruk bulunamadı."]
+    phone_number = str(row.get("phone_number") or "").strip()
+    if not phone_number or len(phone_number) > 20:
+        errors["phone_number"] = ["Geçerli bir telefon numarası girin."]
+    call_date = _parse_call_date(row.get("call_date"))
+    if call_date is None:
+        errors["call_date"] = ["Geçerli bir tarih/saat girin."]
+    call_id = str(row.get("call_id") or "").strip()
+    if len(call_id) > 100:
+        errors["call_id"] = ["En fazla 100 karakter olabilir."]
+    elif call_id and call_id in existing:
+        errors["call_id"] = ["Bu çağrı daha önce yüklenmiş."]
+    if errors:
+        return None, errors
+
+    fields = {
+        "agent": agent,
+        "call_queue": queue,
+        "phone_number": phone_number,
+        "call_date": call_date,
+        "call_id": call_id,
+    }
+    return (info, fields), None
+
+
+class _ProbingReader:
+    """
+    Okunan her parçayı ``AudioProbe``a da veren dosya sarmalayıcısı. ZIP
+    başlığındaki boyut yanlış olabileceğinden açılan bayt sayısı da burada
+    sayılır.
+    """
+
+    def __init__(self, file, probe):
+        self.file = file
+        self.probe = probe
+        self.read_bytes = 0
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.read_bytes += len(data)
+        if self.read_bytes > MAX_ENTRY_SIZE:
+            raise EntrySizeError("Dosya boyutu sınırı aşıldı.")
+        self.probe.update(data)
+        return data
+
+
+def _store(archive, info):
+    """
+    Arşivdeki dosyayı parça parça depolamaya yazar ve aynı geçişte ses
+    başlığını çözümler; (kayıtlı ad, ``AudioInfo``) döndürür. İçerik ses
+    dosyası değilse yazılan dosya silinir ve ``AudioFormatError`` yükselir.
+    """
+    field = CallRecord._meta.get_field("audio_file")
+    name = field.generate_filename(None, os.path.basename(info.filename))
+    probe = AudioProbe()
+    with archive.open(info) as member:
+        content = File(
+            _ProbingReader(member, probe), name=os.path.basename(info.filename)
+        )
+        content.size = info.file_size
+        name = field.storage.save(name, content)
+    try:
+        return name, probe.result()
+    except AudioFormatError:
+        field.storage.delete(name)
+        raise
+
+
+def _ingest_chunk(archive, rows, start, members, uploaded_by):
+    agents = _resolve(
+        get_user_model(),
+        get_user_model().USERNAME_FIELD,
+        [_lookup_key(row.get("agent")) for row in rows if isinstance(row, dict)],
+    )
+    queues = _resolve(
+        CallQueue,
+        "name",
+        [_lookup_key(row.get("queue")) for row in rows if isinstance(row, dict)],
+    )
+    call_ids = {
+        str(row.get("call_id") or "").strip() for row in rows if isinstance(row, dict)
+    } - {""}
+    existing = set(
+        CallRecord.objects.filter(call_id__in=call_ids).values_list(
+            "call_id", flat=True
+        )
+    )
+
+    entries = []
+    pending = []
+    for index, row in enumerate(rows, start):
+        name = row.get("file") if isinstance(row, dict) else None
+        entry = {"index": index, "file": name}
+        entries.append(entry)
+
+        valid, errors = _validate(row, members, agents, queues, existing)
+        if errors:
+            entry.update(status="error", errors=errors)
+            continue
+        info, fields = valid
+        if fields["call_id"]:
+            # Aynı arşivde tekrarlanan call_id'ler de atlanır
+            existing.add(fields["call_id"])
+        try:
+            audio_file, audio = _store(archive, info)
+        except ENTRY_ERRORS as exc:
+            entry.update(status="error", errors={"file": [str(exc)]})
+            continue
+        fields.update(audio_fields(audio))
+        pending.append(
+            (
+                entry,
+                CallRecord(uploaded_by=uploaded_by, audio_file=audio_file, **fields),
+            )
+        )
+
+    if pending:
+        try:
+            with transaction.atomic():
+                created = CallRecord.objects.bulk_create(
+                    [record for _entry, record in pending]
+                )
+        except DatabaseError as exc:
+            storage = CallRecord._meta.get_field("audio_file").storage
+            for entry, record in pending:
+                storage.delete(record.audio_file.name)
+                entry.update(status="error", errors={"non_field_errors": [str(exc)]})
+        else:
+            for (entry, _record), record in zip(pending, created):
+                entry.update(status="created", id=record.pk)
+            # bulk_create post_save göndermediği için arka plan işleri, iş kuyruğu
+            # ve panel özeti burada güncellenir
+            schedule_processing(created)
+            enqueue_uploaded(created)
+            schedule_invalidation()
+    return entries
+
+
+def ingest_archive(file, uploaded_by, chunk_size=CHUNK_SIZE):
+    """
+    ``file`` ZIP arşivinin yolu ya da dosya nesnesidir. Bütün arşivi
+    etkileyen hatalarda ``ManifestError`` yükseltir.
+    """
+    try:
+        archive = zipfile.ZipFile(file)
+    except (zipfile.BadZipFile, OSError):
+        raise ManifestError("Geçerli bir ZIP arşivi değil.")
+
+    entries = []
+    with archive:
+        members = {
+            info.filename: info for info in archive.infolist() if not info.is_dir()
+        }
+        # Sonraki bir parçada bozuk satır çıkınca önceki parçaların kayıtları
+        # ve dosyaları yarım kalmasın diye manifest önce bütünüyle okunur
+        try:
+            rows = list(read_manifest(archive))
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise ManifestError(f"Manifest okunamadı: {exc}")
+        for index in range(0, len(rows), chunk_size):
+            chunk = rows[index : index + chunk_size]
+            entries.extend(_ingest_chunk(archive, chunk, index, members, uploaded_by))
+
+    created = sum(1 for entry in entries if entry["status"] == "created")
+    return IngestResult(entries=entries, created=created, failed=len(entries) - created)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from calls.acoustics import analyze_calls
+
+
+class Command(BaseCommand):
+    help = (
+        "Çağrı kayıtlarının akustik ölçümlerini (sessizlik, kırpılma, konuşma "
+        "oranı) süreç havuzunda hesaplayıp kaydeder"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Ölçümü olan kayıtları da yeniden analiz et",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Süreç sayısı (varsayılan: işlemci sayısı)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=200, help="Tek seferde işlenecek kayıt"
+        )
+
+    def handle(self, *args, **options):
+        analyzed, failed, seconds = analyze_calls(
+            force=options["force"],
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+        )
+        rate = analyzed / seconds if seconds else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{analyzed} kayıt analiz edildi, {failed} kayıt çözülemedi "
+                f"({seconds:.1f} sn, {rate:.1f} kayıt/sn)."
+            )
+        )
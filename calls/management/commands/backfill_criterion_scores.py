@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from calls.analytics import backfill_criterion_scores
+
+
+class Command(BaseCommand):
+    help = "Değerlendirme puanlarını kriter bazlı puan tablosuna aktarır"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Tek seferde işlenecek değerlendirme sayısı",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Mevcut kriter puanlarını silip tabloyu baştan oluşturur",
+        )
+
+    def handle(self, *args, **options):
+        processed = backfill_criterion_scores(
+            batch_size=options["batch_size"], rebuild=options["rebuild"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{processed} değerlendirme için kriter puanları yazıldı."
+            )
+        )
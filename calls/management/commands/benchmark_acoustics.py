@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+from django.core.management.base import BaseCommand, CommandError
+
+from calls.acoustics import analyze_paths
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".m4a")
+
+
+def write_samples(directory, count, seconds, rate=8000):
+    """Ölçüm için sentetik stereo WAV kayıtları üretir."""
+    rng = np.random.default_rng(0)
+    frames = int(seconds * rate)
+    for i in range(count):
+        # Sıra ile konuşan iki kanal; aralarda sessizlik
+        tone = np.sin(np.arange(frames) * 2 * np.pi * 440 / rate) * 0.5
+        gate = (np.arange(frames) // (rate * 3)) % 3
+        left = np.where(gate == 0, tone, 0) + rng.normal(0, 0.001, frames)
+        right = np.where(gate == 1, tone, 0) + rng.normal(0, 0.001, frames)
+        pcm = (np.stack([left, right], axis=1) * 32767).astype("<i2")
+        with wave.open(os.path.join(directory, f"ornek_{i}.wav"), "wb") as out:
+            out.setnchannels(2)
+            out.setsampwidth(2)
+            out.setframerate(rate)
+            out.writeframes(pcm.tobytes())
+
+
+class Command(BaseCommand):
+    help = (
+        "Akustik analizin saniyede işlediği kayıt sayısını tek süreç ve süreç "
+        "havuzu ile ölçer"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--directory",
+            help="Ölçülecek kayıtların dizini (verilmezse sentetik kayıt üretilir)",
+        )
+        parser.add_argument("--count", type=int, default=32, help="Sentetik kayıt")
+        parser.add_argument(
+            "--seconds", type=float, default=300, help="Sentetik kayıt süresi"
+        )
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count(), help="Süreç sayısı"
+        )
+
+    def handle(self, *args, **options):
+        directory = options["directory"]
+        if directory is None:
+            directory = tempfile.mkdtemp()
+            self.stdout.write(f"{options['count']} sentetik kayıt üretiliyor...")
+            write_samples(directory, options["count"], options["seconds"])
+            cleanup = True
+        elif not os.path.isdir(directory):
+            raise CommandError(f"Dizin bulunamadı: {directory}")
+        else:
+            cleanup = False
+
+        try:
+            paths = sorted(
+                os.path.join(directory, name)
+                for name in os.listdir(directory)
+                if name.lower().endswith(AUDIO_EXTENSIONS)
+            )
+            if not paths:
+                raise CommandError("Dizinde ses kaydı yok.")
+
+            results = {}
+            for workers in sorted({1, options["workers"]}):
+                started = time.perf_counter()
+                failed = sum(
+                    metrics is None for _path, metrics in analyze_paths(paths, workers)
+                )
+                results[workers] = len(paths) / (time.perf_counter() - started)
+                self.stdout.write(
+                    f"{workers:>3} süreç: {results[workers]:.1f} kayıt/sn "
+                    f"({failed} kayıt çözülemedi)"
+                )
+        finally:
+            if cleanup:
+                shutil.rmtree(directory, ignore_errors=True)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Hızlanma: {results[max(results)] / results[1]:.1f}x "
+                f"({len(paths)} kayıt)"
+            )
+        )
@@ -0,0 +1,77 @@
+import random
+import timeit
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from calls.models import EvaluationForm
+from calls.scoring import get_scorer
+
+
+def legacy_create_cost(form, scores):
+    """
+    Puanlama motorundan önceki değerlendirme oluşturma akışının puanlama
+    maliyeti: serileştiricide ve görünümde iki maksimum puan kontrolü,
+    serileştiricide ve Evaluation.save içinde iki toplam hesabı.
+    """
+    for _ in range(2):
+        for key, field in form.fields.items():
+            if key in scores and scores[key]["score"] > field["max_score"]:
+                raise ValueError(key)
+    for _ in range(2):
+        total_points = Decimal("0")
+        max_points = Decimal("0")
+        for key, field in form.fields.items():
+            max_points += Decimal(str(field.get("max_score", 0)))
+            total_points += Decimal(str(scores.get(key, {}).get("score", 0)))
+        total = ((total_points / max_points) * Decimal("100")).quantize(Decimal("0.01"))
+    return total
+
+
+def compiled_create_cost(form, scores):
+    result = get_scorer(form).evaluate(scores)
+    if result.errors:
+        raise ValueError(result.errors)
+    return result.total_score
+
+
+class Command(BaseCommand):
+    help = "Değerlendirme başına puanlama maliyetini eski ve derlenmiş motorla ölçer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fields", type=int, default=12, help="Form alan sayısı")
+        parser.add_argument(
+            "--iterations", type=int, default=20000, help="Ölçülecek oluşturma sayısı"
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        fields = {
+            f"field_{i}": {"label": f"Alan {i}", "type": "number", "max_score": 10}
+            for i in range(1, options["fields"] + 1)
+        }
+        # Önbellek anahtarı için kaydedilmiş bir form gibi davranan nesne
+        form = EvaluationForm(pk=1, fields=fields)
+        scores = {key: {"score": rng.randint(0, 10)} for key in fields}
+        iterations = options["iterations"]
+
+        if legacy_create_cost(form, scores) != compiled_create_cost(form, scores):
+            self.stdout.write(self.style.ERROR("Eski ve yeni toplam puanlar farklı!"))
+            return
+
+        results = {}
+        for name, func in (
+            ("eski", legacy_create_cost),
+            ("derlenmiş", compiled_create_cost),
+        ):
+            seconds = min(
+                timeit.repeat(lambda: func(form, scores), number=iterations, repeat=3)
+            )
+            results[name] = seconds / iterations * 1e6
+            self.stdout.write(f"{name:>10}: {results[name]:.2f} µs / değerlendirme")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Hızlanma: {results['eski'] / results['derlenmiş']:.1f}x"
+            )
+        )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+
+from calls.models import CallRecord, Evaluation, EvaluationTask
+from calls.workqueue import enqueue_calls
+
+
+class Command(BaseCommand):
+    help = (
+        "Henüz değerlendirilmemiş ve iş kuyruğunda olmayan çağrıları "
+        "değerlendirme kuyruğuna ekler"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Tek seferde eklenecek kayıt"
+        )
+
+    def handle(self, *args, **options):
+        calls = (
+            CallRecord.objects.filter(
+                ~Exists(Evaluation.objects.filter(call=OuterRef("pk"))),
+                ~Exists(EvaluationTask.objects.filter(call=OuterRef("pk"))),
+            )
+            .only("pk", "call_queue_id")
+            .order_by("pk")
+        )
+        batch_size = options["batch_size"]
+        added = 0
+        last_pk = 0
+        while True:
+            batch = list(calls.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            enqueue_calls(batch)
+            added += len(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write(self.style.SUCCESS(f"{added} çağrı kuyruğa eklendi."))
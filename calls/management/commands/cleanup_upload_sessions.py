@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from calls.uploads import collect_expired
+
+
+class Command(BaseCommand):
+    help = "Süresi dolan devam ettirilebilir yükleme oturumlarını ve geçici dosyaları siler"
+
+    def handle(self, *args, **options):
+        deleted = collect_expired()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} yükleme oturumu silindi."))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from calls import exports, queries
+
+
+class Command(BaseCommand):
+    help = "Değerlendirmeleri CSV ya da NDJSON olarak akış halinde dışa aktarır"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=sorted(exports.FORMATS), default="csv", dest="fmt"
+        )
+        parser.add_argument(
+            "--output", help="Çıktı dosyası (varsayılan: standart çıktı)"
+        )
+        parser.add_argument("--start-date", help="YYYY-AA-GG")
+        parser.add_argument("--end-date", help="YYYY-AA-GG")
+        parser.add_argument("--agent", type=int, help="Temsilci id")
+        parser.add_argument("--expert", type=int, help="Kalite uzmanı id")
+        parser.add_argument("--queue", type=int, help="Kuyruk id")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=exports.CHUNK_SIZE,
+            help="Veritabanından tek seferde okunacak satır sayısı",
+        )
+
+    def handle(self, *args, **options):
+        evaluations = queries.report_evaluations(
+            start_date=options["start_date"],
+            end_date=options["end_date"],
+            agent_id=options["agent"],
+            expert_id=options["expert"],
+            queue_id=options["queue"],
+        )
+        stream, _content_type = exports.FORMATS[options["fmt"]]
+        chunks = stream(evaluations, chunk_size=options["chunk_size"])
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as out:
+                out.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
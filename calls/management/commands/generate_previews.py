@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from calls.renditions import backfill_previews
+
+
+class Command(BaseCommand):
+    help = "Önizlemesi olmayan WAV çağrı kayıtları için 8 kHz mono önizleme üretir"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Önizlemesi olan kayıtları da yeniden üret",
+        )
+
+    def handle(self, *args, **options):
+        generated, skipped = backfill_previews(force=options["force"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{generated} önizleme üretildi, {skipped} kayıt atlandı."
+            )
+        )
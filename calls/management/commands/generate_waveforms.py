@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from calls.waveforms import backfill_waveforms
+
+
+class Command(BaseCommand):
+    help = "Dalga formu olmayan çağrı kayıtları için tepe değerleri dosyasını üretir"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Dalga formu olan kayıtları da yeniden üret",
+        )
+
+    def handle(self, *args, **options):
+        generated, failed = backfill_waveforms(force=options["force"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{generated} dalga formu üretildi, {failed} kayıt çözülemedi."
+            )
+        )
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from calls import ingest
+
+
+class Command(BaseCommand):
+    help = "Ses dosyaları ve manifest içeren ZIP arşivinden çağrı kayıtlarını yükler"
+
+    def add_arguments(self, parser):
+        parser.add_argument("archive", help="ZIP arşivinin yolu")
+        parser.add_argument(
+            "--uploaded-by", required=True, help="Yükleyen kullanıcının adı"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=ingest.CHUNK_SIZE,
+            help="Tek seferde eklenecek kayıt sayısı",
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(**{User.USERNAME_FIELD: options["uploaded_by"]})
+        except User.DoesNotExist:
+            raise CommandError("Kullanıcı bulunamadı.")
+
+        try:
+            result = ingest.ingest_archive(
+                options["archive"], user, chunk_size=options["chunk_size"]
+            )
+        except ingest.ManifestError as exc:
+            raise CommandError(str(exc))
+
+        for entry in result.entries:
+            if entry["status"] == "error":
+                self.stderr.write(
+                    f"{entry['index']} {entry['file']}: {entry['errors']}"
+                )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result.created} kayıt yüklendi, {result.failed} satır başarısız."
+            )
+        )
@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from calls.models import CallRecord
+from calls.storage import BLOB_NAME, is_blob_name
+
+
+def migrate_record(pk, legacy, keep_source=False):
+    """
+    Tek bir kaydın dosyasını içerik adresli düzene taşır. Kayıt yalnızca
+    hâlâ eski adı gösteriyorsa güncellenir; komut yarıda kesilip yeniden
+    çalıştırıldığında taşınmış kayıtlar atlanır.
+    """
+    record = CallRecord.objects.only("pk", "audio_file").get(pk=pk)
+    old_name = record.audio_file.name
+    if not old_name or is_blob_name(old_name):
+        return "skipped"
+    if not legacy.exists(old_name):
+        return "missing"
+
+    storage = record.audio_file.storage
+    with legacy.open(old_name, "rb") as source:
+        new_name = storage.save(old_name, source)
+    updated = CallRecord.objects.filter(pk=pk, audio_file=old_name).update(
+        audio_file=new_name
+    )
+    if not updated:
+        # Kayıt bu arada değişti; alınan referans geri bırakılır
+        storage.delete(new_name)
+        return "skipped"
+    if not keep_source and not CallRecord.objects.filter(audio_file=old_name).exists():
+        legacy.delete(old_name)
+    return "migrated"
+
+
+def _in_worker(pk, legacy, keep_source):
+    # Her iş parçacığı kendi bağlantısını açar; iş bitince kapatılır
+    try:
+        return migrate_record(pk, legacy, keep_source)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Mevcut ses dosyalarını içerik adresli, parçalı depolama düzenine "
+        "paralel olarak taşır; yarıda kalırsa kaldığı yerden devam eder"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=4, help="Paralel çalışan iş parçacığı"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Tek seferde kuyruğa alınacak kayıt sayısı",
+        )
+        parser.add_argument(
+            "--keep-source",
+            action="store_true",
+            help="Eski düzendeki dosyaları silme",
+        )
+
+    def handle(self, *args, **options):
+        legacy = FileSystemStorage(
+            location=CallRecord.audio_file.field.storage.location
+        )
+        ids = (
+            CallRecord.objects.exclude(audio_file="")
+            .exclude(audio_file__regex=BLOB_NAME.pattern)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        counts = {"migrated": 0, "skipped": 0, "missing": 0}
+        batch_size = options["batch_size"]
+        last_pk = 0
+
+        workers = options["workers"]
+        keep_source = options["keep_source"]
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while True:
+                batch = list(ids.filter(pk__gt=last_pk)[:batch_size])
+                if not batch:
+                    break
+                last_pk = batch[-1]
+                if executor is None:
+                    results = (migrate_record(pk, legacy, keep_source) for pk in batch)
+                else:
+                    results = executor.map(
+                        lambda pk: _in_worker(pk, legacy, keep_source), batch
+                    )
+                for result in results:
+                    counts[result] += 1
+                self.stdout.write(f"{last_pk} numaralı kayda kadar işlendi.")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{counts['migrated']} dosya taşındı, {counts['skipped']} atlandı, "
+                f"{counts['missing']} dosya bulunamadı."
+            )
+        )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from calls.models import CallRecord
+from calls.tasks import enqueue
+
+
+class Command(BaseCommand):
+    help = (
+        "Arka plan işleri tamamlanmamış çağrı kayıtlarını yeniden kuyruğa alır "
+        "(ör. aracı erişilemezken yüklenenler)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--include-failed",
+            action="store_true",
+            help="Başarısız olmuş kayıtları da yeniden dene",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Tek seferde okunacak kayıt"
+        )
+
+    def handle(self, *args, **options):
+        statuses = ["pending"]
+        if options["include_failed"]:
+            statuses.append("failed")
+        call_ids = (
+            CallRecord.objects.filter(processing_status__in=statuses)
+            .exclude(audio_file="")
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        count = 0
+        for call_id in call_ids.iterator(chunk_size=options["batch_size"]):
+            enqueue([call_id])
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"{count} çağrı kuyruğa alındı."))
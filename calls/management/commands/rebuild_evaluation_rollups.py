@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from calls.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Günlük değerlendirme özet tablosunu ham değerlendirmelerden yeniden oluşturur"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Tek seferde eklenecek özet satırı sayısı",
+        )
+
+    def handle(self, *args, **options):
+        created = rebuild_rollups(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"{created} günlük özet satırı oluşturuldu.")
+        )
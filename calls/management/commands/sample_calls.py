@@ -0,0 +1,58 @@
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from calls.queries import parse_day
+from calls.sampling import sample_week
+
+
+class Command(BaseCommand):
+    help = (
+        "Bir hafta için her (temsilci, kuyruk) katmanından rastgele çağrı "
+        "seçip değerlendirme kuyruğuna ekler"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--week",
+            help="Haftanın herhangi bir günü, YYYY-AA-GG (varsayılan: geçen hafta)",
+        )
+        parser.add_argument(
+            "--per-stratum", type=int, default=5, help="Katman başına çağrı sayısı"
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Tohum; aynı tohumla aynı örneklem üretilir (varsayılan: rastgele)",
+        )
+        parser.add_argument(
+            "--queue",
+            type=int,
+            action="append",
+            dest="queues",
+            help="Yalnızca bu kuyruk (birden çok verilebilir)",
+        )
+
+    def handle(self, *args, **options):
+        if options["week"]:
+            day = parse_day(options["week"])
+            if day is None:
+                raise CommandError("--week YYYY-AA-GG biçiminde olmalıdır.")
+        else:
+            day = timezone.localdate() - timedelta(days=7)
+        seed = options["seed"]
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**63)
+
+        result = sample_week(
+            day, options["per_stratum"], seed, queue_ids=options["queues"]
+        )
+        run = result.run
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{run.week_start} haftası: {run.strata} katmandan {run.selected} "
+                f"çağrı seçildi ({result.elapsed_seconds:.2f} sn, tohum {seed})."
+            )
+        )
@@ -0,0 +1,28 @@
+"""
+Çağrı ve değerlendirme akışının Prometheus ölçümleri.
+
+HTTP ölçümleri ve ``/metrics`` uç noktası ``qualityhub.metrics`` içindedir.
+Sayaçlar çok süreçli modda da (``PROMETHEUS_MULTIPROC_DIR``) doğru toplanır.
+"""
+
+from prometheus_client import Counter, Histogram
+
+# 64 KB'tan 2 GB'a (UPLOAD_SESSION_MAX_SIZE) 4'er kat artan kovalar
+UPLOAD_SIZE_BUCKETS = tuple(64 * 1024 * 4**i for i in range(9))
+
+UPLOAD_RECEIVED_BYTES = Counter(
+    "qualityhub_upload_received_bytes_total",
+    "Alınan ses yükleme baytları",
+    ["kind"],
+)
+UPLOAD_SIZE = Histogram(
+    "qualityhub_upload_size_bytes",
+    "Tamamlanan ses yüklemelerinin boyutu",
+    ["kind"],
+    buckets=UPLOAD_SIZE_BUCKETS,
+)
+EVALUATIONS_CREATED = Counter(
+    "qualityhub_evaluations_created_total",
+    "Oluşturulan değerlendirmeler",
+    ["source"],
+)
@@ -0,0 +1,69 @@
+from django.db import migrations, models
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """
+    PostgreSQL'de indeksi CREATE INDEX CONCURRENTLY ile oluşturur, böylece
+    büyük tablolarda yazma işlemleri kilitlenmez. Diğer veritabanlarında
+    (testlerdeki SQLite gibi) normal AddIndex gibi davranır.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.add_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.remove_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.remove_index(model, self.index)
+
+
+class Migration(migrations.Migration):
+    # CONCURRENTLY bir transaction bloğu içinde çalışamaz
+    atomic = False
+
+    dependencies = [
+        ("calls", "0002_call_callevaluation"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="callrecord",
+            index=models.Index(
+                fields=["agent", "call_date"], name="calls_rec_agent_date_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="callrecord",
+            index=models.Index(
+                fields=["call_queue", "call_date"], name="calls_rec_queue_date_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="callrecord",
+            index=models.Index(
+                fields=["-call_date", "id"], name="calls_rec_date_id_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="evaluation",
+            index=models.Index(
+                fields=["evaluator", "evaluated_at"], name="calls_eval_evaluator_at_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="evaluation",
+            index=models.Index(
+                fields=["-evaluated_at", "id"], name="calls_eval_at_id_idx"
+            ),
+        ),
+    ]
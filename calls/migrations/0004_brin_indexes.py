@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# Yalnızca eklenen (append-only) zaman sütunları için BRIN indeksleri.
+# BRIN, B-tree'nin küçük bir kesri boyutundadır ve tarih aralığı taramalarında
+# ilgisiz blok aralıklarını atlar. Yalnızca PostgreSQL'de oluşturulur; model
+# durumuna eklenmez çünkü diğer veritabanları BRIN desteklemez.
+BRIN_INDEXES = [
+    ("calls_callrecord", "call_date", "calls_rec_date_brin"),
+    ("calls_evaluation", "evaluated_at", "calls_eval_at_brin"),
+]
+
+
+def create_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    quote = schema_editor.quote_name
+    for table, column, name in BRIN_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(name)} "
+            f"ON {quote(table)} USING brin ({quote(column)}) "
+            "WITH (autosummarize = on)"
+        )
+
+
+def drop_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    quote = schema_editor.quote_name
+    for _table, _column, name in BRIN_INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {quote(name)}")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("calls", "0003_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("calls", "0004_brin_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EvaluationDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("evaluation_count", models.PositiveIntegerField(default=0)),
+                (
+                    "score_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "score_min",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=5),
+                ),
+                (
+                    "score_max",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=5),
+                ),
+                ("last_evaluated_at", models.DateTimeField()),
+                (
+                    "agent",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "call_queue",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="calls.callqueue",
+                    ),
+                ),
+                (
+                    "evaluator",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Günlük Değerlendirme Özeti",
+                "verbose_name_plural": "Günlük Değerlendirme Özetleri",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="evaluationdailyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("day", "agent", "evaluator", "call_queue"),
+                name="calls_rollup_bucket_uniq",
+            ),
+        ),
+    ]
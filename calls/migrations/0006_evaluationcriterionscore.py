@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0005_evaluationdailyrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EvaluationCriterionScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("criterion_key", models.CharField(max_length=50)),
+                ("score", models.DecimalField(decimal_places=2, max_digits=6)),
+                ("max_score", models.DecimalField(decimal_places=2, max_digits=6)),
+                (
+                    "evaluation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="criterion_scores",
+                        to="calls.evaluation",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Kriter Puanı",
+                "verbose_name_plural": "Kriter Puanları",
+                "indexes": [
+                    models.Index(
+                        fields=["criterion_key", "evaluation"],
+                        name="calls_criterion_key_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="evaluationcriterionscore",
+            constraint=models.UniqueConstraint(
+                fields=("evaluation", "criterion_key"),
+                name="calls_criterion_score_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0006_evaluationcriterionscore"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evaluationform",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0008_uploadsession"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="callrecord",
+            name="waveform",
+            field=models.FileField(blank=True, editable=False, upload_to="waveforms/"),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:29
+
+import calls.probe
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0009_callrecord_waveform"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="callrecord",
+            name="audio_format",
+            field=models.CharField(blank=True, editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name="callrecord",
+            name="channels",
+            field=models.PositiveSmallIntegerField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="callrecord",
+            name="duration_seconds",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="callrecord",
+            name="sample_rate",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="callrecord",
+            name="sha256",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name="callrecord",
+            name="audio_file",
+            field=models.FileField(
+                upload_to="call_records/",
+                validators=[
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=["mp3", "wav", "m4a"]
+                    ),
+                    calls.probe.validate_audio_file,
+                ],
+            ),
+        ),
+    ]
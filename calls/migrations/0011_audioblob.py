@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:31
+
+import calls.probe
+import calls.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0010_callrecord_audio_metadata"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AudioBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("sha256", models.CharField(max_length=64)),
+                ("size", models.PositiveBigIntegerField()),
+                ("ref_count", models.PositiveIntegerField(default=1)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Ses Dosyası",
+                "verbose_name_plural": "Ses Dosyaları",
+            },
+        ),
+        migrations.AlterField(
+            model_name="callrecord",
+            name="audio_file",
+            field=models.FileField(
+                storage=calls.storage.get_audio_storage,
+                upload_to="call_records/",
+                validators=[
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=["mp3", "wav", "m4a"]
+                    ),
+                    calls.probe.validate_audio_file,
+                ],
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0011_audioblob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CallAcousticMetrics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("duration_seconds", models.FloatField(verbose_name="Süre (sn)")),
+                ("rms_dbfs", models.FloatField(verbose_name="Ortalama Enerji (dBFS)")),
+                ("silence_ratio", models.FloatField(verbose_name="Sessizlik Oranı")),
+                (
+                    "longest_silence_seconds",
+                    models.FloatField(verbose_name="En Uzun Sessizlik (sn)"),
+                ),
+                ("clipping_ratio", models.FloatField(verbose_name="Kırpılma Oranı")),
+                (
+                    "talk_ratios",
+                    models.JSONField(
+                        blank=True, null=True, verbose_name="Kanal Başına Konuşma Oranı"
+                    ),
+                ),
+                (
+                    "analyzed_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Analiz Tarihi"),
+                ),
+                (
+                    "call",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="acoustic_metrics",
+                        to="calls.callrecord",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Akustik Ölçüm",
+                "verbose_name_plural": "Akustik Ölçümler",
+            },
+        ),
+    ]
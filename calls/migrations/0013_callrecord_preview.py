@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:37
+
+import calls.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0012_callacousticmetrics"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="callrecord",
+            name="preview",
+            field=models.FileField(
+                blank=True,
+                editable=False,
+                storage=calls.storage.get_audio_storage,
+                upload_to="",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0013_callrecord_preview"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="callrecord",
+            name="processing_error",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="callrecord",
+            name="processing_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Bekliyor"),
+                    ("processing", "İşleniyor"),
+                    ("ready", "Hazır"),
+                    ("failed", "Başarısız"),
+                ],
+                default="pending",
+                editable=False,
+                max_length=20,
+            ),
+        ),
+    ]
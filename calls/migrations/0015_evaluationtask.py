@@ -0,0 +1,90 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("calls", "0014_callrecord_processing_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EvaluationTask",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Bekliyor"),
+                            ("claimed", "Üstlenildi"),
+                            ("done", "Tamamlandı"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "enqueued_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("available_at", models.DateTimeField(blank=True, null=True)),
+                ("claimed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "call",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="evaluation_task",
+                        to="calls.callrecord",
+                    ),
+                ),
+                (
+                    "call_queue",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="calls.callqueue",
+                    ),
+                ),
+                (
+                    "claimed_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Değerlendirme İşi",
+                "verbose_name_plural": "Değerlendirme İşleri",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("available_at__isnull", False)),
+                        fields=["call_queue", "available_at"],
+                        name="calls_task_available_idx",
+                    ),
+                    models.Index(
+                        fields=["call_queue", "claimed_at"],
+                        name="calls_task_claimed_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
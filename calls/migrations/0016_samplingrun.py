@@ -0,0 +1,75 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:43
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("calls", "0015_evaluationtask"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SamplingRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("week_start", models.DateField(verbose_name="Hafta Başlangıcı")),
+                (
+                    "per_stratum",
+                    models.PositiveIntegerField(verbose_name="Katman Başına Çağrı"),
+                ),
+                ("seed", models.BigIntegerField(verbose_name="Tohum")),
+                ("queue_ids", models.JSONField(blank=True, default=list)),
+                (
+                    "strata",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Katman Sayısı"
+                    ),
+                ),
+                (
+                    "selected",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Seçilen Çağrı"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Örneklem",
+                "verbose_name_plural": "Örneklemler",
+            },
+        ),
+        migrations.AddField(
+            model_name="evaluationtask",
+            name="sampling_run",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="tasks",
+                to="calls.samplingrun",
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0016_samplingrun"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("fingerprint", models.CharField(max_length=40, unique=True)),
+                ("sql", models.TextField(verbose_name="Sorgu")),
+                (
+                    "call_site",
+                    models.CharField(max_length=500, verbose_name="Çağrı Yeri"),
+                ),
+                ("calls", models.PositiveIntegerField(default=0, verbose_name="Sayı")),
+                (
+                    "total_ms",
+                    models.FloatField(default=0, verbose_name="Toplam Süre (ms)"),
+                ),
+                (
+                    "max_ms",
+                    models.FloatField(default=0, verbose_name="En Uzun Süre (ms)"),
+                ),
+                (
+                    "first_seen",
+                    models.DateTimeField(auto_now_add=True, verbose_name="İlk Görülme"),
+                ),
+                ("last_seen", models.DateTimeField(verbose_name="Son Görülme")),
+                ("explain", models.TextField(blank=True, verbose_name="Sorgu Planı")),
+                (
+                    "explained_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Plan Tarihi"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Yavaş Sorgu",
+                "verbose_name_plural": "Yavaş Sorgular",
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+from django.db import migrations
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncDate
+
+BATCH_SIZE = 1000
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    Özet tablosundan önce kaydedilmiş değerlendirmelerin kovalarını
+    oluşturur (``rebuild_evaluation_rollups`` komutunun migration hali).
+    """
+    Evaluation = apps.get_model("calls", "Evaluation")
+    EvaluationDailyRollup = apps.get_model("calls", "EvaluationDailyRollup")
+
+    rows = (
+        Evaluation.objects.annotate(day=TruncDate("evaluated_at"))
+        .values("day", "evaluator_id", "call__agent_id", "call__call_queue_id")
+        .annotate(
+            evaluation_count=Count("id"),
+            score_sum=Sum("total_score"),
+            score_min=Min("total_score"),
+            score_max=Max("total_score"),
+            last_evaluated_at=Max("evaluated_at"),
+        )
+        .order_by()
+    )
+    EvaluationDailyRollup.objects.all().delete()
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(
+            EvaluationDailyRollup(
+                day=row["day"],
+                agent_id=row["call__agent_id"],
+                evaluator_id=row["evaluator_id"],
+                call_queue_id=row["call__call_queue_id"],
+                evaluation_count=row["evaluation_count"],
+                score_sum=row["score_sum"],
+                score_min=row["score_min"],
+                score_max=row["score_max"],
+                last_evaluated_at=row["last_evaluated_at"],
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            EvaluationDailyRollup.objects.bulk_create(batch)
+            batch = []
+    EvaluationDailyRollup.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0017_slowquery"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
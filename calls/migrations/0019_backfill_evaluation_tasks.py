@@ -0,0 +1,55 @@
+from django.db import migrations
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def backfill_tasks(apps, schema_editor):
+    """
+    Kuyruktan önce yüklenmiş, henüz değerlendirilmemiş çağrıları kuyruğa
+    ekler (``build_work_queue`` komutunun migration hali); aksi halde bu
+    çağrılar bekleyenler listesinden düşer.
+    """
+    CallRecord = apps.get_model("calls", "CallRecord")
+    Evaluation = apps.get_model("calls", "Evaluation")
+    EvaluationTask = apps.get_model("calls", "EvaluationTask")
+
+    calls = (
+        CallRecord.objects.filter(
+            ~Exists(Evaluation.objects.filter(call=OuterRef("pk"))),
+            ~Exists(EvaluationTask.objects.filter(call=OuterRef("pk"))),
+        )
+        .values_list("pk", "call_queue_id")
+        .order_by("pk")
+    )
+    now = timezone.now()
+    last_pk = 0
+    while True:
+        batch = list(calls.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            break
+        EvaluationTask.objects.bulk_create(
+            [
+                EvaluationTask(
+                    call_id=call_id,
+                    call_queue_id=queue_id,
+                    enqueued_at=now,
+                    available_at=now,
+                )
+                for call_id, queue_id in batch
+            ],
+            ignore_conflicts=True,
+        )
+        last_pk = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0018_backfill_evaluation_rollups"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:24
+
+import calls.storage
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+OLD_PREFIX = "waveforms/"
+
+
+def drop_old_sidecars(apps, schema_editor):
+    """
+    ``waveforms/`` altındaki eski yan dosyaları siler ve sütunu boşaltır;
+    dalga formu ilk istekte (ya da ``generate_waveforms`` ile) ses dosyasının
+    yanında yeniden üretilir.
+    """
+    CallRecord = apps.get_model("calls", "CallRecord")
+    calls = CallRecord.objects.filter(waveform__startswith=OLD_PREFIX)
+    for name in calls.values_list("waveform", flat=True).distinct().iterator():
+        default_storage.delete(name)
+    calls.update(waveform="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0019_backfill_evaluation_tasks"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="callrecord",
+            name="waveform",
+            field=models.FileField(
+                blank=True,
+                editable=False,
+                storage=calls.storage.get_audio_storage,
+                upload_to="",
+            ),
+        ),
+        migrations.RunPython(drop_old_sidecars, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,16 @@
-from decimal import Decimal
+import uuid
 
 from django.conf import settings
 from django.core.validators import FileExtensionValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .metrics import EVALUATIONS_CREATED
+from .probe import AudioFormatError, audio_fields, audio_info, validate_audio_file
+from .storage import get_audio_storage, is_blob_name
 
 
 class CallQueue(models.Model):
@@ -49,6 +57,16 @@ class EvaluationForm(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    # Her kayıtta artar; derlenmiş puanlayıcı önbelleği (id, version) ile anahtarlanır
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    def save(self, *args, **kwargs):
+        if self.pk:
+            self.version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -127,12 +145,23 @@ class EvaluationForm(models.Model):
         )
 
 
+# Değiştiğinde değerlendirme özetlerinin yeniden hesaplandığı alanlar
+REASSIGN_FIELDS = {"agent", "agent_id", "call_queue", "call_queue_id"}
+
+
 class CallRecord(models.Model):
     """
     Çağrı kayıtları için model.
     Ses dosyaları MP3 formatında saklanacaktır.
     """
 
+    PROCESSING_STATUS_CHOICES = [
+        ("pending", "Bekliyor"),
+        ("processing", "İşleniyor"),
+        ("ready", "Hazır"),
+        ("failed", "Başarısız"),
+    ]
+
     uploaded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -147,20 +176,87 @@ class CallRecord(models.Model):
     phone_number = models.CharField(max_length=20)
     audio_file = models.FileField(
         upload_to="call_records/",
-        validators=[FileExtensionValidator(allowed_extensions=["mp3", "wav", "m4a"])],
+        storage=get_audio_storage,
+        validators=[
+            FileExtensionValidator(allowed_extensions=["mp3", "wav", "m4a"]),
+            validate_audio_file,
+        ],
     )
     call_id = models.CharField(max_length=100, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     call_date = models.DateTimeField()
+    # Oynatıcı için dalga formu tepe değerleri; orijinalin yanında tutulur
+    # (bkz. calls/waveforms.py)
+    waveform = models.FileField(storage=get_audio_storage, blank=True, editable=False)
+    # 8 kHz mono önizleme; orijinalin yanında tutulur (bkz. calls/renditions.py)
+    preview = models.FileField(storage=get_audio_storage, blank=True, editable=False)
+    # Yükleme sırasında ses başlığından okunan bilgiler (bkz. calls/probe.py)
+    sha256 = models.CharField(max_length=64, blank=True, editable=False)
+    audio_format = models.CharField(max_length=10, blank=True, editable=False)
+    duration_seconds = models.FloatField(null=True, blank=True, editable=False)
+    sample_rate = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    channels = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    # Yükleme sonrası arka plan işlerinin durumu (bkz. calls/tasks.py)
+    processing_status = models.CharField(
+        max_length=20,
+        choices=PROCESSING_STATUS_CHOICES,
+        default="pending",
+        editable=False,
+    )
+    processing_error = models.TextField(blank=True, editable=False)
 
     def __str__(self):
         agent_name = self.agent.get_full_name() if self.agent else "Bilinmeyen"
         return f"Çağrı - {self.call_id} - {self.call_date}"
 
+    def save(self, *args, **kwargs):
+        # Yeni yüklenen dosyanın bilgileri yükleme işleyicisinin hesapladığı
+        # değerlerden alınır; işleyici kullanılmadıysa dosya bir kez okunur
+        if self.audio_file and not self.audio_file._committed:
+            try:
+                info = audio_info(self.audio_file.file)
+            except AudioFormatError:
+                info = None
+            if info is not None:
+                for field, value in audio_fields(info).items():
+                    setattr(self, field, value)
+
+        # Temsilci ya da kuyruk değişirse değerlendirmelerin günlük özet
+        # kovaları da değişir
+        update_fields = kwargs.get("update_fields")
+        previous = None
+        if self.pk is not None and (
+            update_fields is None or REASSIGN_FIELDS & set(update_fields)
+        ):
+            previous = (
+                CallRecord.objects.filter(pk=self.pk)
+                .values_list("agent_id", "call_queue_id")
+                .first()
+            )
+        if previous is None or previous == (self.agent_id, self.call_queue_id):
+            super().save(*args, **kwargs)
+            return
+
+        from .rollups import call_reassigned
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            call_reassigned(self, *previous)
+
     class Meta:
         verbose_name = "Çağrı Kaydı"
         verbose_name_plural = "Çağrı Kayıtları"
         ordering = ["-call_date"]
+        # PostgreSQL'de call_date için ayrıca BRIN indeksi vardır (0004 migration)
+        indexes = [
+            models.Index(
+                fields=["agent", "call_date"], name="calls_rec_agent_date_idx"
+            ),
+            models.Index(
+                fields=["call_queue", "call_date"], name="calls_rec_queue_date_idx"
+            ),
+            models.Index(fields=["-call_date", "id"], name="calls_rec_date_id_idx"),
+        ]
 
 
 class Evaluation(models.Model):
@@ -183,26 +279,29 @@ class Evaluation(models.Model):
     total_score = models.DecimalField(max_digits=5, decimal_places=2, default=0)
     evaluated_at = models.DateTimeField(auto_now_add=True)
 
-    def save(self, *args, **kwargs):
-        # Toplam puanı hesapla
-        total_points = Decimal("0")
-        max_points = Decimal("0")
-
-        if self.form and hasattr(self.form, "fields"):
-            for key, value in self.form.fields.items():
-                max_score = Decimal(str(value.get("max_score", 0)))
-                score = Decimal(str(self.scores.get(key, {}).get("score", 0)))
-                total_points += score
-                max_points += max_score
-
-        if max_points > 0:
-            self.total_score = ((total_points / max_points) * Decimal("100")).quantize(
-                Decimal("0.01")
-            )
-        else:
-            self.total_score = Decimal("0")
-
-        super().save(*args, **kwargs)
+    def save(self, *args, scored=False, **kwargs):
+        # Toplam puanı hesapla. ``scored=True`` ise total_score aynı puanlar için
+        # puanlama motoruyla zaten hesaplanmıştır (ör. API serileştiricisi).
+        if not scored:
+            from .scoring import get_scorer
+
+            self.total_score = get_scorer(self.form).total(self.scores)
+
+        from .analytics import sync_criterion_scores
+        from .rollups import evaluation_bucket, evaluation_saved
+        from .workqueue import complete_calls
+
+        # Günlük özet ve kriter puanı tabloları değerlendirmeyle aynı
+        # transaction içinde güncellenir
+        with transaction.atomic():
+            created = self.pk is None
+            previous_bucket = None if created else evaluation_bucket(self.pk)
+            super().save(*args, **kwargs)
+            evaluation_saved(self, previous_bucket)
+            sync_criterion_scores(self, created=created)
+            if created:
+                complete_calls([self.call_id])
+                transaction.on_commit(EVALUATIONS_CREATED.labels("single").inc)
 
     def __str__(self):
         return f"Değerlendirme - {self.call} - {self.evaluator}"
@@ -211,6 +310,360 @@ class Evaluation(models.Model):
         verbose_name = "Değerlendirme"
         verbose_name_plural = "Değerlendirmeler"
         ordering = ["-evaluated_at"]
+        # PostgreSQL'de evaluated_at için ayrıca BRIN indeksi vardır (0004 migration)
+        indexes = [
+            models.Index(
+                fields=["evaluator", "evaluated_at"], name="calls_eval_evaluator_at_idx"
+            ),
+            models.Index(fields=["-evaluated_at", "id"], name="calls_eval_at_id_idx"),
+        ]
+
+
+class EvaluationDailyRollup(models.Model):
+    """
+    Değerlendirmelerin gün, temsilci, kalite uzmanı ve kuyruk bazında özeti.
+    Evaluation kaydedildiğinde/silindiğinde aynı transaction içinde güncellenir;
+    raporlar ham değerlendirmeler yerine bu tabloyu toplar.
+    ``rebuild_evaluation_rollups`` komutu tabloyu baştan oluşturur.
+    """
+
+    day = models.DateField()
+    agent = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    evaluator = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    call_queue = models.ForeignKey(
+        CallQueue, on_delete=models.CASCADE, related_name="+"
+    )
+    evaluation_count = models.PositiveIntegerField(default=0)
+    score_sum = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    score_min = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    score_max = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    last_evaluated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Günlük Özet - {self.day} - {self.evaluation_count}"
+
+    class Meta:
+        verbose_name = "Günlük Değerlendirme Özeti"
+        verbose_name_plural = "Günlük Değerlendirme Özetleri"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "agent", "evaluator", "call_queue"],
+                name="calls_rollup_bucket_uniq",
+            )
+        ]
+
+
+class EvaluationCriterionScore(models.Model):
+    """
+    Değerlendirme puanlarının kriter bazında normalize edilmiş hali.
+    Evaluation.scores JSON'ını ayrıştırmadan kriter ortalamaları, dağılımları
+    ve en zayıf kriter gibi analizlerin SQL ile yapılabilmesi içindir.
+    """
+
+    evaluation = models.ForeignKey(
+        Evaluation, on_delete=models.CASCADE, related_name="criterion_scores"
+    )
+    criterion_key = models.CharField(max_length=50)
+    score = models.DecimalField(max_digits=6, decimal_places=2)
+    max_score = models.DecimalField(max_digits=6, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.criterion_key}: {self.score}/{self.max_score}"
+
+    class Meta:
+        verbose_name = "Kriter Puanı"
+        verbose_name_plural = "Kriter Puanları"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["evaluation", "criterion_key"],
+                name="calls_criterion_score_uniq",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["criterion_key", "evaluation"], name="calls_criterion_key_idx"
+            ),
+        ]
+
+
+@receiver(post_delete, sender=Evaluation)
+def remove_evaluation_from_rollup(sender, instance, **kwargs):
+    """Silinen değerlendirmeyi günlük özetten çıkarır (silme transaction'ı içinde)."""
+    from .rollups import evaluation_deleted
+
+    evaluation_deleted(instance)
+
+
+@receiver(post_delete, sender=Evaluation)
+def reopen_evaluation_task(sender, instance, **kwargs):
+    from .workqueue import reopen_call
+
+    reopen_call(instance.call_id)
+
+
+class UploadSession(models.Model):
+    """
+    Parça parça (devam ettirilebilir) ses dosyası yükleme oturumu.
+    Parçalar ``calls.uploads`` tarafından diskteki geçici dosyaya eklenir;
+    ``offset`` o ana kadar yazılan bayt sayısıdır.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    # Tamamlandığında CallRecord'a yazılacak alanlar (agent, call_queue, ...)
+    metadata = models.JSONField(default=dict, blank=True)
+    call = models.ForeignKey(
+        CallRecord,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"Yükleme - {self.filename} ({self.offset}/{self.size})"
+
+    class Meta:
+        verbose_name = "Yükleme Oturumu"
+        verbose_name_plural = "Yükleme Oturumları"
+
+
+class AudioBlob(models.Model):
+    """
+    İçerik adresli depolamadaki ses dosyası ve onu kullanan kayıt sayısı
+    (bkz. calls/storage.py). Aynı içerik tekrar yüklendiğinde yeni dosya
+    yazılmaz, ``ref_count`` artırılır.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
+
+    class Meta:
+        verbose_name = "Ses Dosyası"
+        verbose_name_plural = "Ses Dosyaları"
+
+
+class SamplingRun(models.Model):
+    """
+    Katmanlı örneklem çalıştırması (bkz. calls/sampling.py). Aynı hafta,
+    katman başına sayı, tohum ve kuyruklarla tekrar çalıştırıldığında aynı
+    çağrılar seçilir.
+    """
+
+    week_start = models.DateField(verbose_name="Hafta Başlangıcı")
+    per_stratum = models.PositiveIntegerField(verbose_name="Katman Başına Çağrı")
+    seed = models.BigIntegerField(verbose_name="Tohum")
+    queue_ids = models.JSONField(default=list, blank=True)
+    strata = models.PositiveIntegerField(default=0, verbose_name="Katman Sayısı")
+    selected = models.PositiveIntegerField(default=0, verbose_name="Seçilen Çağrı")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Örneklem - {self.week_start} ({self.selected} çağrı)"
+
+    class Meta:
+        verbose_name = "Örneklem"
+        verbose_name_plural = "Örneklemler"
+
+
+class EvaluationTask(models.Model):
+    """
+    Değerlendirme iş kuyruğundaki çağrı (bkz. calls/workqueue.py).
+    ``available_at`` işin alınabileceği andır: bekleyen işlerde kuyruğa
+    girdiği an, üstlenilmiş işlerde kiralamanın bittiği an; tamamlanan
+    işlerde boştur.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Bekliyor"),
+        ("claimed", "Üstlenildi"),
+        ("done", "Tamamlandı"),
+    ]
+
+    call = models.OneToOneField(
+        CallRecord, on_delete=models.CASCADE, related_name="evaluation_task"
+    )
+    # Kuyruk bazında seçim için çağrıdan kopyalanır
+    call_queue = models.ForeignKey(
+        CallQueue, on_delete=models.CASCADE, related_name="+"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    enqueued_at = models.DateTimeField(default=timezone.now)
+    available_at = models.DateTimeField(null=True, blank=True)
+    claimed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    # Çağrıyı kuyruğa ekleyen örneklem (yüklemede eklendiyse boş)
+    sampling_run = models.ForeignKey(
+        "SamplingRun",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="tasks",
+    )
+
+    def __str__(self):
+        return f"{self.call} - {self.get_status_display()}"
+
+    class Meta:
+        verbose_name = "Değerlendirme İşi"
+        verbose_name_plural = "Değerlendirme İşleri"
+        indexes = [
+            models.Index(
+                fields=["call_queue", "available_at"],
+                name="calls_task_available_idx",
+                condition=models.Q(available_at__isnull=False),
+            ),
+            models.Index(
+                fields=["call_queue", "claimed_at"], name="calls_task_claimed_idx"
+            ),
+        ]
+
+
+class CallAcousticMetrics(models.Model):
+    """
+    Çağrı kaydının akustik ölçümleri (bkz. calls/acoustics.py). Oranlar 0-1
+    aralığındadır; ``talk_ratios`` yalnızca çok kanallı kayıtlarda kanal
+    sırasıyla doldurulur.
+    """
+
+    call = models.OneToOneField(
+        CallRecord, on_delete=models.CASCADE, related_name="acoustic_metrics"
+    )
+    duration_seconds = models.FloatField(verbose_name="Süre (sn)")
+    rms_dbfs = models.FloatField(verbose_name="Ortalama Enerji (dBFS)")
+    silence_ratio = models.FloatField(verbose_name="Sessizlik Oranı")
+    longest_silence_seconds = models.FloatField(verbose_name="En Uzun Sessizlik (sn)")
+    clipping_ratio = models.FloatField(verbose_name="Kırpılma Oranı")
+    talk_ratios = models.JSONField(
+        null=True, blank=True, verbose_name="Kanal Başına Konuşma Oranı"
+    )
+    analyzed_at = models.DateTimeField(auto_now=True, verbose_name="Analiz Tarihi")
+
+    def __str__(self):
+        return f"{self.call} - sessizlik %{self.silence_ratio * 100:.0f}"
+
+    class Meta:
+        verbose_name = "Akustik Ölçüm"
+        verbose_name_plural = "Akustik Ölçümler"
+
+
+class SlowQuery(models.Model):
+    """
+    ``SLOW_QUERY_MS`` süresini aşan sorguların parmak izi bazında toplamı
+    (bkz. calls/slowqueries.py). ``sql`` sabitleri atılmış sorgu kalıbıdır;
+    ``call_site`` ve ``explain`` son görülen/örneklenen çalışmaya aittir.
+    """
+
+    fingerprint = models.CharField(max_length=40, unique=True)
+    sql = models.TextField(verbose_name="Sorgu")
+    call_site = models.CharField(max_length=500, verbose_name="Çağrı Yeri")
+    calls = models.PositiveIntegerField(default=0, verbose_name="Sayı")
+    total_ms = models.FloatField(default=0, verbose_name="Toplam Süre (ms)")
+    max_ms = models.FloatField(default=0, verbose_name="En Uzun Süre (ms)")
+    first_seen = models.DateTimeField(auto_now_add=True, verbose_name="İlk Görülme")
+    last_seen = models.DateTimeField(verbose_name="Son Görülme")
+    explain = models.TextField(blank=True, verbose_name="Sorgu Planı")
+    explained_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Plan Tarihi"
+    )
+
+    def __str__(self):
+        return f"{self.sql[:80]} ({self.calls}×)"
+
+    class Meta:
+        verbose_name = "Yavaş Sorgu"
+        verbose_name_plural = "Yavaş Sorgular"
+
+
+@receiver(post_delete, sender=CallRecord)
+def release_audio_file(sender, instance, **kwargs):
+    name = instance.audio_file.name
+    storage = instance.audio_file.storage
+    if getattr(storage, "reference_counted", False) and is_blob_name(name):
+        transaction.on_commit(lambda: storage.delete(name))
+
+
+@receiver(post_save, sender=CallRecord)
+def enqueue_call_processing(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.audio_file:
+        from .tasks import schedule_processing
+
+        schedule_processing([instance])
+
+
+@receiver(post_save, sender=CallRecord)
+def add_to_work_queue(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        from .workqueue import enqueue_uploaded
+
+        enqueue_uploaded([instance])
+
+
+@receiver(post_save, sender=CallRecord)
+@receiver(post_save, sender=Evaluation)
+def invalidate_dashboard_overview(sender, instance, created, raw=False, **kwargs):
+    # Çağrı güncellemeleri panel sayılarını değiştirmez
+    if not raw and (created or sender is Evaluation):
+        from .overview import schedule_invalidation
+
+        schedule_invalidation()
+
+
+@receiver(post_delete, sender=CallRecord)
+@receiver(post_delete, sender=Evaluation)
+def invalidate_dashboard_overview_on_delete(sender, instance, **kwargs):
+    from .overview import schedule_invalidation
+
+    schedule_invalidation()
+
+
+@receiver(post_save, sender=EvaluationForm)
+@receiver(post_save, sender=CallQueue)
+@receiver(post_delete, sender=EvaluationForm)
+@receiver(post_delete, sender=CallQueue)
+def invalidate_catalog(sender, instance, **kwargs):
+    from .catalog import schedule_invalidation
+
+    schedule_invalidation()
+
+
+@receiver(connection_created)
+def install_slow_query_log(sender, connection, **kwargs):
+    from .slowqueries import install
+
+    install(connection)
 
 
 # Simple models for testing compatibility
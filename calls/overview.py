@@ -0,0 +1,165 @@
+"""
+Yönetici paneli özet sayıları.
+
+Sayılar tek bir SQL sorgusuyla hesaplanır: kullanıcı, çağrı ve form sayıları
+skaler alt sorgulardır; değerlendirme sayısı, ortalama puan ve son 7 günün
+grafiği günlük özet tablosundan (EvaluationDailyRollup) okunur. PostgreSQL'de
+çağrı tablosu ``DASHBOARD_ESTIMATE_MIN_ROWS`` satırdan büyükse ``COUNT(*)``
+yerine planlayıcının ``pg_class.reltuples`` tahmini kullanılır.
+
+Sonuç önbellekte (Redis) tutulur. Çağrı ya da değerlendirme değiştiğinde
+sürüm anahtarı artırılır ve kayıt bayatlar; bayat kayıt
+``DASHBOARD_STALE_SECONDS`` boyunca sunulmaya devam eder. Süresi dolan ya da
+bayatlayan kaydı yalnızca kilidi alan işçi yeniden hesaplar (single-flight),
+diğerleri eski değeri döndürür. Önbellekte hiç kayıt yoksa kilidi alamayan
+işçiler hesaplamanın bitmesini kısa bir süre bekler.
+"""
+
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import CallRecord, EvaluationDailyRollup, EvaluationForm
+
+CHART_DAYS = 7
+ENTRY_KEY = "dashboard:overview:{day}"
+VERSION_KEY = "dashboard:overview:version"
+LOCK_KEY = "dashboard:overview:lock"
+LOCK_SECONDS = 30
+WAIT_SECONDS = 5
+POLL_SECONDS = 0.05
+
+
+def chart_days(today):
+    return [today - timedelta(days=i) for i in range(CHART_DAYS - 1, -1, -1)]
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _count_sql(model):
+    """Tablonun satır sayısı; PostgreSQL'de büyük tablolar için tahmin."""
+    exact = f"(SELECT COUNT(*) FROM {_table(model)})"
+    if connection.vendor != "postgresql":
+        return exact, []
+    # Hiç ANALYZE edilmemiş tabloda reltuples -1'dir; o zaman tam sayılır
+    return (
+        f"(SELECT CASE WHEN c.reltuples >= %s THEN c.reltuples::bigint "
+        f"ELSE {exact} END FROM pg_class c WHERE c.oid = %s::regclass)",
+        [settings.DASHBOARD_ESTIMATE_MIN_ROWS, model._meta.db_table],
+    )
+
+
+def compute_overview(today=None):
+    """Panel sayılarını tek sorguyla hesaplar."""
+    days = chart_days(today or timezone.localdate())
+    calls_sql, params = _count_sql(CallRecord)
+    per_day = ", ".join(
+        "COALESCE(SUM(CASE WHEN r.day = %s THEN r.evaluation_count END), 0)"
+        for _day in days
+    )
+    sql = (
+        f"SELECT (SELECT COUNT(*) FROM {_table(get_user_model())}), {calls_sql}, "
+        f"(SELECT COUNT(*) FROM {_table(EvaluationForm)}), "
+        f"COALESCE(SUM(r.evaluation_count), 0), SUM(r.score_sum), {per_day} "
+        f"FROM {_table(EvaluationDailyRollup)} r"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + days)
+        row = cursor.fetchone()
+
+    user_count, call_count, form_count, evaluation_count, score_sum = row[:5]
+    avg_score = float(score_sum) / evaluation_count if evaluation_count else 0
+    return {
+        "user_count": user_count,
+        "call_count": int(call_count),
+        "evaluation_count": evaluation_count,
+        "form_count": form_count,
+        "avg_score": round(avg_score, 1),
+        "evals_chart": [int(count) for count in row[5:]],
+        "evals_chart_labels": [day.strftime("%d.%m") for day in days],
+    }
+
+
+def _acquire():
+    token = uuid.uuid4().hex
+    return token if cache.add(LOCK_KEY, token, LOCK_SECONDS) else None
+
+
+def _release(token):
+    # Kilit süresi dolup başka işçiye geçtiyse onunkine dokunulmaz
+    if cache.get(LOCK_KEY) == token:
+        cache.delete(LOCK_KEY)
+
+
+def _store(key, version, data):
+    entry = {
+        "data": data,
+        "version": version,
+        "fresh_until": time.time() + settings.DASHBOARD_CACHE_SECONDS,
+    }
+    cache.set(
+        key,
+        entry,
+        settings.DASHBOARD_CACHE_SECONDS + settings.DASHBOARD_STALE_SECONDS,
+    )
+
+
+def _refresh(key, version, today):
+    token = _acquire()
+    if token is None:
+        return None
+    try:
+        data = compute_overview(today)
+        _store(key, version, data)
+        return data
+    finally:
+        _release(token)
+
+
+def _wait_for(key):
+    deadline = time.monotonic() + WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(POLL_SECONDS)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["data"]
+    return None
+
+
+def get_overview(today=None):
+    """Panel sayılarını önbellekten, gerekirse yeniden hesaplayarak döndürür."""
+    today = today or timezone.localdate()
+    key = ENTRY_KEY.format(day=today.isoformat())
+    cached = cache.get_many([key, VERSION_KEY])
+    entry, version = cached.get(key), cached.get(VERSION_KEY, 0)
+
+    if entry is not None:
+        if entry["version"] == version and entry["fresh_until"] > time.time():
+            return entry["data"]
+        # Bayat: kilidi alan yeniler, diğerleri eski değeri döndürür
+        return _refresh(key, version, today) or entry["data"]
+
+    data = _refresh(key, version, today) or _wait_for(key)
+    # Hesaplayan işçi zamanında bitiremediyse önbelleğe yazmadan hesaplanır
+    return data if data is not None else compute_overview(today)
+
+
+def invalidate():
+    """Önbellekteki özeti bayatlatır; bir sonraki istek yeniler."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+def schedule_invalidation():
+    """Transaction commit edildikten sonra özeti bayatlatır."""
+    transaction.on_commit(invalidate)
@@ -0,0 +1,432 @@
+"""
+Ses dosyası başlıklarının akış halinde çözümlenmesi.
+
+``AudioProbe`` dosyayı yükleme sırasında gelen parçalarla besler: SHA-256
+özeti hesaplanır, sihirli baytlarla biçim (WAV/MP3/M4A) belirlenir ve
+başlıklardan süre, örnekleme hızı ve kanal sayısı okunur. Dosya yeniden
+okunmaz; bellekte yalnızca dosyanın ilk ``HEAD_SIZE`` baytı ve o an beklenen
+başlık parçası tutulur (MP4 ``moov`` kutusu için üst sınır ``MAX_BOX_SIZE``).
+
+Biçim çözümleyicileri, ihtiyaç duydukları bayt aralığını ``(başlangıç,
+uzunluk)`` olarak ``yield`` eden üreteçlerdir; motor aralık akıştan geldikçe
+baytları üretece geri gönderir.
+"""
+
+import hashlib
+import struct
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db.models.fields.files import FieldFile
+
+HEAD_SIZE = 64 * 1024
+MAX_BOX_SIZE = 8 * 1024 * 1024
+MP3_SCAN_SIZE = 16 * 1024
+
+AudioInfo = namedtuple(
+    "AudioInfo",
+    ["format", "duration", "sample_rate", "channels", "sha256", "size"],
+)
+
+
+class AudioFormatError(ValueError):
+    pass
+
+
+# --- WAV -------------------------------------------------------------------
+
+
+def _wav(head):
+    offset = 12
+    fmt = None
+    while True:
+        header = yield (offset, 8)
+        if len(header) < 8:
+            raise AudioFormatError("WAV dosyasında veri bölümü bulunamadı.")
+        chunk_id, size = header[:4], struct.unpack_from("<I", header, 4)[0]
+        if chunk_id == b"fmt ":
+            body = yield (offset + 8, min(size, 40))
+            if len(body) < 16:
+                raise AudioFormatError("WAV fmt bölümü eksik.")
+            fields = struct.unpack_from("<HHIIH", body)
+            fmt = fields[1:] + ((offset, 8 + size),)
+        elif chunk_id == b"data":
+            if fmt is None or not fmt[2] or not fmt[3]:
+                raise AudioFormatError("WAV fmt bölümü eksik.")
+            channels, sample_rate, byte_rate, block_align, fmt_chunk = fmt
+            return {
+                "format": "wav",
+                "channels": channels,
+                "sample_rate": sample_rate,
+                "byte_rate": byte_rate,
+                "block_align": block_align,
+                "fmt_chunk": fmt_chunk,
+                "data_offset": offset + 8,
+                "data_size": size,
+            }
+        offset += 8 + size + (size & 1)
+
+
+def _wav_data_size(info, size):
+    data_size = info["data_size"]
+    available = size - info["data_offset"]
+    # Akış halinde yazılmış dosyalarda boyut alanı 0 ya da 0xFFFFFFFF olabilir
+    if not data_size or data_size == 0xFFFFFFFF or data_size > available:
+        data_size = available
+    return data_size
+
+
+def _wav_duration(info, size):
+    return _wav_data_size(info, size) / info["byte_rate"]
+
+
+# --- MP3 -------------------------------------------------------------------
+
+# MPEG Layer III bit hızları (kbps); [MPEG-1, MPEG-2/2.5]
+_MP3_BITRATES = (
+    (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+)
+# Sürüm alanı: 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+
+def _mp3_header(data, i):
+    """``data[i:]`` geçerli bir Layer III çerçeve başlığıysa alanlarını döndürür."""
+    if data[i] != 0xFF or data[i + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[i + 1] >> 3) & 3
+    layer = (data[i + 1] >> 1) & 3
+    bitrate_index = data[i + 2] >> 4
+    rate_index = (data[i + 2] >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    return {
+        "mpeg1": version == 3,
+        "bitrate": _MP3_BITRATES[version != 3][bitrate_index] * 1000,
+        "sample_rate": _MP3_SAMPLE_RATES[version][rate_index],
+        "channels": 1 if data[i + 3] >> 6 == 3 else 2,
+    }
+
+
+def _syncsafe(data):
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+def _mp3(head):
+    offset = 0
+    if head[:3] == b"ID3":
+        tag = yield (0, 10)
+        if len(tag) < 10:
+            raise AudioFormatError("MP3 ID3 etiketi eksik.")
+        offset = 10 + _syncsafe(tag[6:10]) + (10 if tag[5] & 0x10 else 0)
+
+    window = yield (offset, MP3_SCAN_SIZE)
+    for i in range(max(0, len(window) - 4)):
+        frame = _mp3_header(window, i)
+        if frame is not None:
+            break
+    else:
+        raise AudioFormatError("MP3 çerçevesi bulunamadı.")
+
+    # Xing/Info başlığı VBR dosyalarda toplam çerçeve sayısını verir
+    stereo = frame["channels"] == 2
+    if frame["mpeg1"]:
+        side_info = 32 if stereo else 17
+    else:
+        side_info = 17 if stereo else 9
+    tag_at = i + 4 + side_info
+    frames = None
+    if window[tag_at : tag_at + 4] in (b"Xing", b"Info") and len(window) >= tag_at + 12:
+        flags = struct.unpack_from(">I", window, tag_at + 4)[0]
+        if flags & 1:
+            frames = struct.unpack_from(">I", window, tag_at + 8)[0]
+    return {
+        "format": "mp3",
+        "channels": frame["channels"],
+        "sample_rate": frame["sample_rate"],
+        "bitrate": frame["bitrate"],
+        "frames": frames,
+        "samples_per_frame": 1152 if frame["mpeg1"] else 576,
+        "audio_offset": offset + i,
+    }
+
+
+def _mp3_duration(info, size):
+    if info["frames"]:
+        return info["frames"] * info["samples_per_frame"] / info["sample_rate"]
+    return (size - info["audio_offset"]) * 8 / info["bitrate"]
+
+
+# --- M4A (MP4) -------------------------------------------------------------
+
+
+def _boxes(data, start=0, end=None):
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header:
+            return
+        yield box_type, offset + header, min(offset + size, end)
+        offset += size
+
+
+def _find(data, start, end, path):
+    for box_type, body, box_end in _boxes(data, start, end):
+        if box_type == path[0]:
+            if len(path) == 1:
+                return body, box_end
+            found = _find(data, body, box_end, path[1:])
+            if found:
+                return found
+    return None
+
+
+def _parse_moov(moov):
+    mvhd = _find(moov, 0, len(moov), [b"mvhd"])
+    if mvhd is None:
+        raise AudioFormatError("M4A mvhd kutusu bulunamadı.")
+    body = mvhd[0]
+    if moov[body] == 1:
+        timescale, duration = struct.unpack_from(">IQ", moov, body + 20)
+    else:
+        timescale, duration = struct.unpack_from(">II", moov, body + 12)
+
+    channels = sample_rate = None
+    for box_type, trak, trak_end in _boxes(moov):
+        if box_type != b"trak":
+            continue
+        stsd = _find(moov, trak, trak_end, [b"mdia", b"minf", b"stbl", b"stsd"])
+        if stsd is None:
+            continue
+        # stsd: sürüm/bayraklar (4), kayıt sayısı (4), ardından AudioSampleEntry
+        entry = stsd[0] + 8
+        if entry + 36 <= stsd[1]:
+            channels = struct.unpack_from(">H", moov, entry + 24)[0]
+            sample_rate = struct.unpack_from(">I", moov, entry + 32)[0] >> 16
+            break
+    if not timescale or not sample_rate:
+        raise AudioFormatError("M4A ses izi bulunamadı.")
+    return {
+        "format": "m4a",
+        "channels": channels,
+        "sample_rate": sample_rate,
+        "duration": duration / timescale,
+    }
+
+
+def _m4a(head):
+    offset = 0
+    while True:
+        header = yield (offset, 16)
+        if len(header) < 8:
+            raise AudioFormatError("M4A moov kutusu bulunamadı.")
+        size, box_type = struct.unpack_from(">I4s", header)
+        header_size = 8
+        if size == 1 and len(header) >= 16:
+            size = struct.unpack_from(">Q", header, 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = None
+        if offset == 0 and box_type != b"ftyp":
+            raise AudioFormatError("M4A ftyp kutusu bulunamadı.")
+        if box_type == b"moov":
+            if size is None or size > MAX_BOX_SIZE:
+                raise AudioFormatError("M4A moov kutusu çok büyük.")
+            body = yield (offset + header_size, size - header_size)
+            return _parse_moov(body)
+        if size is None or size < header_size:
+            raise AudioFormatError("M4A moov kutusu bulunamadı.")
+        offset += size
+
+
+# --- Motor -----------------------------------------------------------------
+
+
+def _detect(head):
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return _wav(head)
+    if head[4:8] == b"ftyp":
+        return _m4a(head)
+    if head[:3] == b"ID3" or (len(head) >= 4 and _mp3_header(head, 0)):
+        return _mp3(head)
+    raise AudioFormatError("Ses dosyası biçimi tanınmadı (WAV, MP3 ya da M4A).")
+
+
+def _format_error(exc):
+    if isinstance(exc, AudioFormatError):
+        return exc
+    return AudioFormatError("Ses dosyası başlığı bozuk.")
+
+
+class AudioProbe:
+    """Parça parça beslenen ses dosyası çözümleyicisi."""
+
+    def __init__(self):
+        self._sha256 = hashlib.sha256()
+        self._head = bytearray()
+        self.size = 0
+        self._parser = None
+        self._want = None
+        self._got = bytearray()
+        self._info = None
+        self._error = None
+
+    def update(self, chunk):
+        chunk_start = self.size
+        self.size += len(chunk)
+        self._sha256.update(chunk)
+        if len(self._head) < HEAD_SIZE:
+            self._head += chunk[: HEAD_SIZE - len(self._head)]
+        if self._error is not None or self._info is not None:
+            return
+        try:
+            if self._parser is None:
+                if len(self._head) < 12:
+                    return
+                self._parser = _detect(bytes(self._head[:12]))
+                self._want = self._parser.send(None)
+            self._serve(chunk, chunk_start)
+        except (AudioFormatError, struct.error, IndexError) as exc:
+            self._error = _format_error(exc)
+
+    def _send(self, data):
+        try:
+            self._want = self._parser.send(bytes(data))
+        except StopIteration as stop:
+            self._info, self._want = stop.value, None
+        self._got = bytearray()
+
+    def _serve(self, chunk, chunk_start):
+        chunk_end = chunk_start + len(chunk)
+        while self._want is not None:
+            start, length = self._want
+            offset = start + len(self._got)
+            need = length - len(self._got)
+            if need > 0:
+                if offset < len(self._head):
+                    self._got += self._head[offset : offset + need]
+                elif chunk_start <= offset < chunk_end:
+                    begin = offset - chunk_start
+                    self._got += chunk[begin : begin + need]
+                elif offset >= self.size:
+                    # Aralığın kalanı sonraki parçalarda gelecek
+                    return
+                else:
+                    raise AudioFormatError("Başlık okunamadı.")
+            if len(self._got) == length:
+                self._send(self._got)
+            elif start + len(self._got) >= self.size:
+                return
+
+    def result(self):
+        """Dosya bittiğinde ``AudioInfo`` döndürür ya da ``AudioFormatError``."""
+        if self._error is None and self._info is None:
+            try:
+                if self._parser is None:
+                    self._parser = _detect(bytes(self._head[:12]))
+                    self._want = self._parser.send(None)
+                    self._serve(b"", self.size)
+                # Dosya beklenen aralıktan kısa: eldeki baytlar gönderilir
+                while self._want is not None:
+                    self._send(self._got)
+            except (AudioFormatError, struct.error, IndexError) as exc:
+                self._error = _format_error(exc)
+        if self._error is not None:
+            raise self._error
+
+        info = self._info
+        if info["format"] == "wav":
+            duration = _wav_duration(info, self.size)
+        elif info["format"] == "mp3":
+            duration = _mp3_duration(info, self.size)
+        else:
+            duration = info["duration"]
+        return AudioInfo(
+            format=info["format"],
+            duration=round(duration, 3),
+            sample_rate=info["sample_rate"],
+            channels=info["channels"],
+            sha256=self._sha256.hexdigest(),
+            size=self.size,
+        )
+
+
+def wav_header(data):
+    """
+    Bellekteki (ya da ``mmap`` ile eşlenmiş) bir WAV dosyasının başlığını
+    çözer. Yalnızca başlık baytlarına dokunulur; ``data_size`` dosyada
+    gerçekten bulunan veri uzunluğuna göre düzeltilir.
+    """
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise AudioFormatError("Dosya WAV biçiminde değil.")
+    parser = _wav(None)
+    want = parser.send(None)
+    try:
+        while True:
+            start, length = want
+            want = parser.send(bytes(data[start : start + length]))
+    except StopIteration as stop:
+        info = stop.value
+    except struct.error as exc:
+        raise _format_error(exc)
+    info["data_size"] = _wav_data_size(info, len(data))
+    return info
+
+
+def probe_file(file, chunk_size=None):
+    """Dosya nesnesini baştan sona okuyup ``AudioInfo`` döndürür."""
+    probe = AudioProbe()
+    for chunk in file.chunks(chunk_size):
+        probe.update(chunk)
+    return probe.result()
+
+
+def audio_info(file):
+    """
+    Yüklenen dosyanın ``AudioInfo``sunu döndürür. ``AudioUploadHandler``
+    bunu yükleme sırasında hesaplamışsa dosya yeniden okunmaz.
+    """
+    info = getattr(file, "audio_info", None)
+    if info is None:
+        error = getattr(file, "audio_error", None)
+        if error is not None:
+            raise error
+        info = probe_file(file)
+        file.audio_info = info
+    return info
+
+
+def audio_fields(info):
+    """``AudioInfo``yu ``CallRecord`` sütunlarına çevirir."""
+    return {
+        "sha256": info.sha256,
+        "audio_format": info.format,
+        "duration_seconds": info.duration,
+        "sample_rate": info.sample_rate,
+        "channels": info.channels,
+    }
+
+
+def validate_audio_file(file):
+    """Dosya içeriğinin gerçekten WAV, MP3 ya da M4A olduğunu doğrular."""
+    if isinstance(file, FieldFile):
+        if file._committed:
+            # Depolamadaki mevcut dosyalar yeniden doğrulanmaz
+            return
+        file = file.file
+    try:
+        audio_info(file)
+    except AudioFormatError as exc:
+        raise ValidationError(str(exc), code="invalid_audio")
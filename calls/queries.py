@@ -0,0 +1,185 @@
+"""
+Dashboard ve rapor ekranlarının kullandığı sorgular.
+
+Sorgular burada tek bir yerde tanımlanır; böylece hem görünümler hem de sorgu
+planı testleri (``calls/test_query_plans.py``) aynı queryset'leri kullanır.
+Tarih filtreleri ``evaluated_at__date`` yerine gün başlangıcına göre aralık
+olarak yazılır, aksi halde sütun bir fonksiyona sarılır ve indeks kullanılamaz.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import Count, FloatField, Max, Min, Sum
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import CallRecord, Evaluation, EvaluationDailyRollup
+
+
+def parse_day(value):
+    """``date`` ya da "YYYY-AA-GG" metnini ``date``e çevirir; geçersizse None."""
+    if isinstance(value, str):
+        try:
+            value = parse_date(value)
+        except ValueError:
+            value = None
+    return value if isinstance(value, date) else None
+
+
+def day_start(day):
+    """Verilen günün yerel saat dilimindeki başlangıcını döndürür."""
+    day = parse_day(day)
+    if day is None:
+        return None
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def date_range_lookups(field, start_date=None, end_date=None):
+    """
+    ``field__date__gte`` / ``field__date__lte`` filtrelerinin indeks dostu
+    karşılığını üretir: ``field >= start`` ve ``field < end + 1 gün``.
+    """
+    lookups = {}
+    start = day_start(start_date) if start_date else None
+    end = day_start(end_date) if end_date else None
+    if start:
+        lookups[f"{field}__gte"] = start
+    if end:
+        lookups[f"{field}__lt"] = end + timedelta(days=1)
+    return lookups
+
+
+def pending_calls():
+    """
+    Değerlendirme kuyruğunda bekleyen çağrılar, en yeniden eskiye. Kuyruk
+    (``EvaluationTask``) değerlendirmelerle birlikte güncellendiğinden
+    değerlendirme tablosu taranmaz.
+    """
+    return CallRecord.objects.filter(
+        evaluation_task__available_at__isnull=False
+    ).order_by("-call_date")
+
+
+def expert_evaluations(user):
+    return Evaluation.objects.filter(evaluator=user).order_by("-evaluated_at")
+
+
+def agent_calls(user):
+    return CallRecord.objects.filter(agent=user).order_by("-call_date")
+
+
+def agent_evaluations(user):
+    return Evaluation.objects.filter(call__agent=user).order_by("-evaluated_at")
+
+
+def evaluations_since(day):
+    return Evaluation.objects.filter(**date_range_lookups("evaluated_at", day))
+
+
+def evaluations_by_day(since):
+    """``since`` gününden itibaren günlük değerlendirme sayıları."""
+    return (
+        evaluations_since(since)
+        .values("evaluated_at__date")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+
+def parse_id(value):
+    """Boşsa None, değilse pozitif tam sayı; geçersizse ``ValueError``."""
+    value = str(value or "").strip()
+    if not value:
+        return None
+    if not value.isdigit() or int(value) == 0:
+        raise ValueError(f"Geçersiz filtre değeri: {value}")
+    return int(value)
+
+
+def report_filters(params):
+    """
+    İstek parametrelerinden ``admin_reports`` filtrelerini okur. Temsilci,
+    uzman ve kuyruk id'leri tam sayı olmalıdır; değilse ``ValueError``.
+    """
+    return {
+        "start_date": params.get("start_date"),
+        "end_date": params.get("end_date"),
+        "agent_id": parse_id(params.get("agent")),
+        "expert_id": parse_id(params.get("expert")),
+        "queue_id": parse_id(params.get("queue")),
+    }
+
+
+def report_evaluations(
+    start_date=None, end_date=None, agent_id=None, expert_id=None, queue_id=None
+):
+    """``admin_reports`` filtrelerini uygulanmış değerlendirme queryset'i."""
+    evals = Evaluation.objects.select_related(
+        "call", "evaluator", "call__agent", "call__call_queue"
+    ).filter(**date_range_lookups("evaluated_at", start_date, end_date))
+    if agent_id:
+        evals = evals.filter(call__agent_id=agent_id)
+    if expert_id:
+        evals = evals.filter(evaluator_id=expert_id)
+    if queue_id:
+        evals = evals.filter(call__call_queue_id=queue_id)
+    return evals
+
+
+def report_rollups(
+    start_date=None, end_date=None, agent_id=None, expert_id=None, queue_id=None
+):
+    """
+    ``admin_reports`` filtrelerini günlük özet tablosuna uygular. Filtreler
+    gün hassasiyetinde olduğundan sonuçlar ham değerlendirmelerle aynıdır.
+    """
+    rollups = EvaluationDailyRollup.objects.all()
+    start_date, end_date = parse_day(start_date), parse_day(end_date)
+    if start_date:
+        rollups = rollups.filter(day__gte=start_date)
+    if end_date:
+        rollups = rollups.filter(day__lte=end_date)
+    if agent_id:
+        rollups = rollups.filter(agent_id=agent_id)
+    if expert_id:
+        rollups = rollups.filter(evaluator_id=expert_id)
+    if queue_id:
+        rollups = rollups.filter(call_queue_id=queue_id)
+    return rollups
+
+
+def _rollup_average():
+    # Ağırlıklı ortalama: toplam puan / toplam değerlendirme sayısı
+    return Cast(Sum("score_sum"), FloatField()) / Sum("evaluation_count")
+
+
+def report_summary(rollups):
+    summary = rollups.aggregate(total=Sum("evaluation_count"), avg=_rollup_average())
+    return summary["total"] or 0, summary["avg"] or 0
+
+
+def agent_report_stats(rollups):
+    return (
+        rollups.values("agent__id", "agent__first_name", "agent__last_name")
+        .annotate(
+            total=Sum("evaluation_count"),
+            avg_score=_rollup_average(),
+            last_eval=Max("last_evaluated_at"),
+            min_score=Min("score_min"),
+            max_score=Max("score_max"),
+        )
+        .order_by("-avg_score")
+    )
+
+
+def expert_report_stats(rollups):
+    return (
+        rollups.values("evaluator__id", "evaluator__first_name", "evaluator__last_name")
+        .annotate(
+            total=Sum("evaluation_count"),
+            avg_score=_rollup_average(),
+            last_eval=Max("last_evaluated_at"),
+        )
+        .order_by("-total")
+    )
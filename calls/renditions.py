@@ -0,0 +1,142 @@
+"""
+Oynatıcı için düşük bit hızlı önizleme kopyaları.
+
+Değerlendirme sırasında anlaşılır konuşma yeterlidir; 44,1 kHz stereo
+kayıtlar yerine 8 kHz mono 16 bit bir WAV önizlemesi sunulur (yaklaşık on
+kat daha küçük). Ses ``PCMReader`` ile bloklar halinde okunur, NumPy ile
+alçak geçiren bir FIR süzgecinden geçirilip doğrusal aradeğerlemeyle yeniden
+örneklenir.
+
+Önizleme orijinalin yanına ``<özet>.preview.wav`` adıyla yazılır. Ad içerikten
+türetildiği için aynı ses için bir kez üretilir; orijinalin son referansı
+kalktığında depolama bu dosyayı da siler (bkz. calls/storage.py).
+"""
+
+import math
+import os
+import tempfile
+import wave
+
+import numpy as np
+
+from .audio import AudioDecodeError, PCMReader
+from .models import CallRecord
+from .storage import derived_name
+
+PREVIEW_RATE = 8000
+PREVIEW_SUFFIX = ".preview.wav"
+FILTER_TAPS = 63
+
+
+def lowpass(src_rate, dst_rate, taps=FILTER_TAPS):
+    """Hedef hızın Nyquist frekansının biraz altında kesen FIR katsayıları."""
+    if src_rate <= dst_rate:
+        return np.ones(1)
+    cutoff = 0.45 * dst_rate / src_rate
+    n = np.arange(taps) - (taps - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return h / h.sum()
+
+
+class Resampler:
+    """
+    Blok blok çalışan yeniden örnekleyici. Süzgecin geçmişi ve bir sonraki
+    çıkış örneğinin kaynaktaki konumu bloklar arasında taşınır; süzgecin
+    (``taps / 2`` örneklik) gecikmesi düzeltilmez.
+    """
+
+    def __init__(self, src_rate, dst_rate):
+        self.step = src_rate / dst_rate
+        self.taps = lowpass(src_rate, dst_rate)
+        self._history = np.zeros(len(self.taps) - 1, dtype=np.float64)
+        self._tail = np.zeros(0, dtype=np.float64)
+        self._consumed = 0
+        self._next = 0.0
+
+    def process(self, block):
+        data = np.concatenate([self._history, block])
+        filtered = np.convolve(data, self.taps, mode="valid")
+        if len(self.taps) > 1:
+            self._history = data[-(len(self.taps) - 1) :]
+
+        # Önceki bloğun son örneği, sınırdaki aradeğerleme için eklenir
+        ext = np.concatenate([self._tail, filtered])
+        base = self._consumed - len(self._tail)
+        last = base + len(ext) - 1
+        count = max(0, math.ceil((last - self._next) / self.step))
+        positions = self._next + self.step * np.arange(count) - base
+        index = positions.astype(np.int64)
+        frac = positions - index
+        out = ext[index] * (1 - frac) + ext[np.minimum(index + 1, len(ext) - 1)] * frac
+
+        self._next += count * self.step
+        self._tail = filtered[-1:]
+        self._consumed += len(filtered)
+        return out
+
+
+def needs_preview(reader):
+    return reader.sample_rate > PREVIEW_RATE or reader.channels > 1
+
+
+def write_preview(reader, path):
+    """``reader``ı 8 kHz mono 16 bit WAV olarak ``path``e yazar."""
+    resampler = Resampler(reader.sample_rate, PREVIEW_RATE)
+    with wave.open(path, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(PREVIEW_RATE)
+        for block in reader.blocks():
+            samples = resampler.process(block)
+            pcm = np.clip(np.round(samples * 32767), -32768, 32767).astype("<i2")
+            out.writeframes(pcm.tobytes())
+
+
+def generate_preview(call, force=False):
+    """
+    Çağrının önizlemesini üretip kaydeder; diskte varsa yeniden üretilmez
+    (``force`` verilmedikçe). Kayıt WAV değilse, çözülemezse ya da zaten
+    8 kHz mono ise False döner; oynatıcı orijinali kullanır.
+    """
+    if not call.audio_file or not call.audio_file.name.lower().endswith(".wav"):
+        return False
+    storage = call.audio_file.storage
+    name = derived_name(call.audio_file.name, PREVIEW_SUFFIX)
+
+    if force or not storage.exists(name):
+        try:
+            with PCMReader(call.audio_file) as reader:
+                if not needs_preview(reader):
+                    return False
+                path = storage.path(name)
+                # Yarım kalan dosya önbellekte görünmesin diye geçici dosyaya
+                # yazılıp yerine taşınır
+                fd, staged = tempfile.mkstemp(dir=os.path.dirname(path))
+                os.close(fd)
+                try:
+                    write_preview(reader, staged)
+                    os.replace(staged, path)
+                except BaseException:
+                    os.remove(staged)
+                    raise
+        except (AudioDecodeError, OSError):
+            return False
+
+    call.preview.name = name
+    # save() sinyalleri tekrar tetiklemesin diye yalnızca sütun güncellenir
+    CallRecord.objects.filter(pk=call.pk).update(preview=name)
+    return True
+
+
+def backfill_previews(force=False, batch_size=100):
+    """Önizlemesi olmayan çağrılar için üretir; (üretilen, atlanan) döndürür."""
+    calls = CallRecord.objects.exclude(audio_file="").order_by("pk")
+    if not force:
+        calls = calls.filter(preview="")
+    generated = skipped = 0
+    for call in calls.iterator(chunk_size=batch_size):
+        if generate_preview(call, force=force):
+            generated += 1
+        else:
+            skipped += 1
+    return generated, skipped
@@ -0,0 +1,227 @@
+"""
+Günlük değerlendirme özetlerinin (EvaluationDailyRollup) bakımı.
+
+Her özet satırı bir "kova"dır: (gün, temsilci, kalite uzmanı, kuyruk).
+Yeni değerlendirmeler kovaya artımlı olarak eklenir. Güncelleme ve silmede
+minimum/maksimum geri alınamadığından yalnızca etkilenen kova ham
+kayıtlardan yeniden hesaplanır; kova tek bir uzmanın tek bir gününü
+kapsadığından bu hesap (evaluator, evaluated_at) indeksiyle yapılır.
+"""
+
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum, Value
+from django.db.models.functions import Greatest, Least, TruncDate
+from django.utils import timezone
+
+from .models import CallRecord, Evaluation, EvaluationDailyRollup
+from .queries import day_start
+
+Bucket = namedtuple("Bucket", ["day", "agent_id", "evaluator_id", "call_queue_id"])
+
+
+def bucket_of(evaluation, agent_id=None, call_queue_id=None):
+    if agent_id is None or call_queue_id is None:
+        call = (
+            CallRecord.objects.filter(pk=evaluation.call_id)
+            .values("agent_id", "call_queue_id")
+            .first()
+        )
+        if call is None:
+            return None
+        agent_id, call_queue_id = call["agent_id"], call["call_queue_id"]
+    return Bucket(
+        day=timezone.localtime(evaluation.evaluated_at).date(),
+        agent_id=agent_id,
+        evaluator_id=evaluation.evaluator_id,
+        call_queue_id=call_queue_id,
+    )
+
+
+def evaluation_bucket(evaluation_id):
+    """Veritabanındaki haliyle bir değerlendirmenin kovası."""
+    row = (
+        Evaluation.objects.filter(pk=evaluation_id)
+        .values("evaluated_at", "evaluator_id", "call__agent_id", "call__call_queue_id")
+        .first()
+    )
+    if row is None:
+        return None
+    return Bucket(
+        day=timezone.localtime(row["evaluated_at"]).date(),
+        agent_id=row["call__agent_id"],
+        evaluator_id=row["evaluator_id"],
+        call_queue_id=row["call__call_queue_id"],
+    )
+
+
+def _bucket_filter(bucket):
+    return EvaluationDailyRollup.objects.filter(**bucket._asdict())
+
+
+def add_to_bucket(bucket, count, score_sum, score_min, score_max, last_evaluated_at):
+    """Yeni değerlendirmeleri kovaya artımlı olarak ekler."""
+    with transaction.atomic():
+        (
+            rollup,
+            created,
+        ) = EvaluationDailyRollup.objects.select_for_update().get_or_create(
+            **bucket._asdict(),
+            defaults={
+                "evaluation_count": count,
+                "score_sum": score_sum,
+                "score_min": score_min,
+                "score_max": score_max,
+                "last_evaluated_at": last_evaluated_at,
+            },
+        )
+        if not created:
+            EvaluationDailyRollup.objects.filter(pk=rollup.pk).update(
+                evaluation_count=F("evaluation_count") + count,
+                score_sum=F("score_sum") + score_sum,
+                score_min=Least("score_min", Value(score_min)),
+                score_max=Greatest("score_max", Value(score_max)),
+                last_evaluated_at=Greatest(
+                    "last_evaluated_at", Value(last_evaluated_at)
+                ),
+            )
+
+
+def refresh_bucket(bucket, create=True):
+    """
+    Kovayı ham değerlendirmelerden yeniden hesaplar. Kovada değerlendirme
+    kalmadıysa satır silinir. ``create=False`` ise var olmayan satır
+    oluşturulmaz (silme sırasında, kovanın yabancı anahtarları da silinmekte
+    olabilir).
+    """
+    start = day_start(bucket.day)
+    with transaction.atomic():
+        existing = list(_bucket_filter(bucket).select_for_update())
+        if not existing and not create:
+            return
+        stats = Evaluation.objects.filter(
+            evaluator_id=bucket.evaluator_id,
+            evaluated_at__gte=start,
+            evaluated_at__lt=start + timedelta(days=1),
+            call__agent_id=bucket.agent_id,
+            call__call_queue_id=bucket.call_queue_id,
+        ).aggregate(
+            evaluation_count=Count("id"),
+            score_sum=Sum("total_score"),
+            score_min=Min("total_score"),
+            score_max=Max("total_score"),
+            last_evaluated_at=Max("evaluated_at"),
+        )
+        if not stats["evaluation_count"]:
+            _bucket_filter(bucket).delete()
+        elif existing:
+            _bucket_filter(bucket).update(**stats)
+        else:
+            EvaluationDailyRollup.objects.create(**bucket._asdict(), **stats)
+
+
+def evaluation_saved(evaluation, previous_bucket=None):
+    bucket = bucket_of(evaluation)
+    if bucket is None:
+        return
+    if previous_bucket is None:
+        score = evaluation.total_score
+        add_to_bucket(bucket, 1, score, score, score, evaluation.evaluated_at)
+        return
+    refresh_bucket(bucket)
+    if previous_bucket != bucket:
+        refresh_bucket(previous_bucket, create=False)
+
+
+def evaluations_created(evaluations, calls):
+    """
+    Toplu eklenen değerlendirmeleri özetlere işler. ``calls`` id -> CallRecord
+    sözlüğüdür; kovalar ek sorgu yapılmadan hesaplanır ve her kovaya tek bir
+    artımlı güncelleme uygulanır.
+    """
+    stats = {}
+    for evaluation in evaluations:
+        call = calls[evaluation.call_id]
+        bucket = bucket_of(evaluation, call.agent_id, call.call_queue_id)
+        score = evaluation.total_score
+        if bucket not in stats:
+            stats[bucket] = [0, 0, score, score, evaluation.evaluated_at]
+        entry = stats[bucket]
+        entry[0] += 1
+        entry[1] += score
+        entry[2] = min(entry[2], score)
+        entry[3] = max(entry[3], score)
+        entry[4] = max(entry[4], evaluation.evaluated_at)
+    for bucket, (count, score_sum, score_min, score_max, last) in stats.items():
+        add_to_bucket(bucket, count, score_sum, score_min, score_max, last)
+
+
+def call_reassigned(call, previous_agent_id, previous_call_queue_id):
+    """
+    Çağrının temsilcisi ya da kuyruğu değiştiğinde değerlendirmelerinin eski
+    ve yeni kovalarını yeniden hesaplar.
+    """
+    rows = Evaluation.objects.filter(call_id=call.pk).values(
+        "evaluated_at", "evaluator_id"
+    )
+    previous, current = set(), set()
+    for row in rows:
+        day = timezone.localtime(row["evaluated_at"]).date()
+        previous.add(
+            Bucket(day, previous_agent_id, row["evaluator_id"], previous_call_queue_id)
+        )
+        current.add(Bucket(day, call.agent_id, row["evaluator_id"], call.call_queue_id))
+    for bucket in current:
+        refresh_bucket(bucket)
+    for bucket in previous - current:
+        refresh_bucket(bucket, create=False)
+
+
+def evaluation_deleted(evaluation):
+    bucket = bucket_of(evaluation)
+    if bucket is not None:
+        refresh_bucket(bucket, create=False)
+
+
+def rebuild_rollups(batch_size=1000):
+    """Tüm özet tablosunu ham değerlendirmelerden yeniden oluşturur."""
+    rows = (
+        Evaluation.objects.annotate(day=TruncDate("evaluated_at"))
+        .values("day", "evaluator_id", "call__agent_id", "call__call_queue_id")
+        .annotate(
+            evaluation_count=Count("id"),
+            score_sum=Sum("total_score"),
+            score_min=Min("total_score"),
+            score_max=Max("total_score"),
+            last_evaluated_at=Max("evaluated_at"),
+        )
+        .order_by()
+    )
+    created = 0
+    with transaction.atomic():
+        EvaluationDailyRollup.objects.all().delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(
+                EvaluationDailyRollup(
+                    day=row["day"],
+                    agent_id=row["call__agent_id"],
+                    evaluator_id=row["evaluator_id"],
+                    call_queue_id=row["call__call_queue_id"],
+                    evaluation_count=row["evaluation_count"],
+                    score_sum=row["score_sum"],
+                    score_min=row["score_min"],
+                    score_max=row["score_max"],
+                    last_evaluated_at=row["last_evaluated_at"],
+                )
+            )
+            if len(batch) >= batch_size:
+                EvaluationDailyRollup.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            EvaluationDailyRollup.objects.bulk_create(batch)
+            created += len(batch)
+    return created
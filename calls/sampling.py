@@ -0,0 +1,113 @@
+"""
+Değerlendirilecek çağrıların katmanlı rastgele örneklemi.
+
+Kalite politikası "her temsilci için her kuyruktan haftada N rastgele çağrı"
+biçimindedir. Katmanlar (temsilci, kuyruk, hafta) üçlüleridir. Haftanın
+çağrıları ``call_date`` indeksiyle aralık taraması yapılarak yalnızca
+(id, temsilci, kuyruk) sütunlarıyla okunur; veritabanında ``ORDER BY
+random()`` ya da başka bir sıralama yapılmaz.
+
+Her çağrıya tohum ve çağrı kimliğinden türetilen sözde rastgele bir öncelik
+verilir (splitmix64) ve her katmandan en küçük öncelikli N çağrı seçilir.
+Bu, katman başına rezervuar örneklemesiyle aynı dağılımı verir; ayrıca
+sonuç okuma sırasından bağımsızdır ve aynı tohumla tekrar üretilebilir.
+Seçilen çağrılar değerlendirme iş kuyruğuna (bkz. calls/workqueue.py)
+eklenir.
+"""
+
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+import numpy as np
+
+from django.db import transaction
+
+from .models import CallRecord, SamplingRun
+from .queries import day_start
+from .workqueue import enqueue_ids
+
+FETCH_SIZE = 50000
+
+SampleResult = namedtuple("SampleResult", ["run", "calls", "elapsed_seconds"])
+
+
+def week_start(day):
+    """Günün içinde bulunduğu haftanın pazartesisi."""
+    return day - timedelta(days=day.weekday())
+
+
+def priorities(ids, seed):
+    """Çağrı kimliklerinden tohuma bağlı 64 bit öncelikler (splitmix64)."""
+    with np.errstate(over="ignore"):
+        x = ids.astype(np.uint64) + np.uint64(seed % 2**64) * np.uint64(
+            0x9E3779B97F4A7C15
+        )
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def select(rows, per_stratum, seed):
+    """
+    ``rows`` (n, 3) biçiminde (id, temsilci, kuyruk) dizisidir. Her katmandan
+    en fazla ``per_stratum`` satır seçer; seçilen satırların indekslerini ve
+    katman sayısını döndürür.
+    """
+    if not len(rows):
+        return np.empty(0, dtype=np.int64), 0
+    _keys, stratum = np.unique(rows[:, 1:], axis=0, return_inverse=True)
+    stratum = stratum.ravel()
+    order = np.lexsort((priorities(rows[:, 0], seed), stratum))
+    grouped = stratum[order]
+    # Her katmanın sıralı dizideki ilk konumu
+    starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    return order[rank < per_stratum], len(starts)
+
+
+def _fetch(queryset):
+    """Sorgu sonucunu model nesnesi üretmeden int64 diziye okur."""
+    values = queryset.values_list("id", "agent_id", "call_queue_id").order_by()
+    chunks = []
+    iterator = values.iterator(chunk_size=FETCH_SIZE)
+    while True:
+        chunk = [row for _, row in zip(range(FETCH_SIZE), iterator)]
+        if not chunk:
+            break
+        chunks.append(np.array(chunk, dtype=np.int64))
+    return np.concatenate(chunks) if chunks else np.empty((0, 3), dtype=np.int64)
+
+
+def sample_week(day, per_stratum, seed, queue_ids=None, created_by=None):
+    """
+    ``day`` gününün haftası için örneklem alır, seçilen çağrıları iş
+    kuyruğuna ekler ve ``SampleResult`` döndürür.
+    """
+    started = time.perf_counter()
+    first_day = week_start(day)
+    calls = CallRecord.objects.filter(
+        call_date__gte=day_start(first_day),
+        call_date__lt=day_start(first_day + timedelta(days=7)),
+    )
+    if queue_ids:
+        calls = calls.filter(call_queue_id__in=queue_ids)
+
+    rows = _fetch(calls)
+    chosen, strata = select(rows, per_stratum, seed)
+    chosen = rows[np.sort(chosen)]
+
+    with transaction.atomic():
+        run = SamplingRun.objects.create(
+            week_start=first_day,
+            per_stratum=per_stratum,
+            seed=seed,
+            queue_ids=sorted(queue_ids or []),
+            strata=strata,
+            selected=len(chosen),
+            created_by=created_by,
+        )
+        enqueue_ids(chosen[:, [0, 2]].tolist(), sampling_run=run)
+    return SampleResult(
+        run, [int(call_id) for call_id in chosen[:, 0]], time.perf_counter() - started
+    )
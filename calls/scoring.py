@@ -0,0 +1,168 @@
+"""
+Değerlendirme formları için derlenmiş puanlama motoru.
+
+``EvaluationForm.fields`` tanımı bir kez ``Scorer`` nesnesine derlenir:
+maksimum puanlar ``Decimal``e çevrilir ve alan tipleri çözülür. Derlenen
+nesne form id'si ve sürümüyle önbelleğe alınır; böylece model, serileştirici
+ve API görünümü aynı puanlayıcıyı kullanır ve doğrulama ile toplam puan tek
+geçişte hesaplanır.
+"""
+
+import threading
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+
+NUMBER = "number"
+BOOLEAN = "boolean"
+
+HUNDRED = Decimal("100")
+CENT = Decimal("0.01")
+ZERO = Decimal("0")
+ONE = Decimal("1")
+
+Criterion = namedtuple("Criterion", ["key", "type", "max_score"])
+ScoreResult = namedtuple("ScoreResult", ["total_score", "errors"])
+
+_BOOLEAN_VALUES = {
+    True: ONE,
+    False: ZERO,
+    1: ONE,
+    0: ZERO,
+    "1": ONE,
+    "0": ZERO,
+    "true": ONE,
+    "false": ZERO,
+}
+
+
+def _to_decimal(value):
+    """Sonlu bir ``Decimal``; NaN, sonsuz ve sayı olmayan değerlerde None."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return Decimal(value)
+    if not isinstance(value, Decimal):
+        try:
+            value = Decimal(str(value))
+        except (InvalidOperation, ValueError):
+            return None
+    # NaN ile karşılaştırma InvalidOperation yükseltir
+    return value if value.is_finite() else None
+
+
+class Scorer:
+    """
+    Derlenmiş form tanımı.
+
+    ``number`` alanlarında puan 0 ile ``max_score`` arasında olmalıdır.
+    ``boolean`` alanlarında 1/0 (ya da True/False) beklenir; "evet" cevabı
+    alanın ``max_score`` değeri kadar puan getirir.
+    """
+
+    def __init__(self, fields):
+        self.criteria = tuple(
+            Criterion(
+                key=key,
+                type=field.get("type", NUMBER),
+                max_score=_to_decimal(field.get("max_score", 0)) or ZERO,
+            )
+            for key, field in (fields or {}).items()
+        )
+        self.max_points = sum((c.max_score for c in self.criteria), ZERO)
+
+    def _points(self, criterion, raw):
+        """Tek bir kriterin puanını ve varsa hata mesajını döndürür."""
+        if criterion.type == BOOLEAN:
+            key = raw.lower() if isinstance(raw, str) else raw
+            try:
+                value = _BOOLEAN_VALUES.get(key)
+            except TypeError:
+                value = None
+            if value is None:
+                return None, f"{criterion.key} için puan 1 ya da 0 olmalıdır."
+            return value * criterion.max_score, None
+
+        value = _to_decimal(raw)
+        if value is None:
+            return None, f"{criterion.key} için puan sayı olmalıdır."
+        if value > criterion.max_score:
+            return (
+                None,
+                f"{criterion.key} için maksimum puan {criterion.max_score} olabilir.",
+            )
+        if value < ZERO:
+            return None, f"{criterion.key} için puan negatif olamaz."
+        return value, None
+
+    def criterion_points(self, scores):
+        """
+        Geçerli her kriter için (anahtar, puan, maksimum puan) üretir; puanı
+        girilmemiş ya da geçersiz kriterler atlanır.
+        """
+        scores = scores or {}
+        for criterion in self.criteria:
+            entry = scores.get(criterion.key)
+            if entry is None:
+                continue
+            raw = entry.get("score", 0) if isinstance(entry, dict) else entry
+            value, error = self._points(criterion, raw)
+            if error is None:
+                yield criterion.key, value, criterion.max_score
+
+    def evaluate(self, scores):
+        """Puanları doğrular ve yüzdelik toplam puanı tek geçişte hesaplar."""
+        scores = scores or {}
+        total_points = ZERO
+        errors = []
+
+        for criterion in self.criteria:
+            entry = scores.get(criterion.key)
+            if entry is None:
+                continue
+            raw = entry.get("score", 0) if isinstance(entry, dict) else entry
+            value, error = self._points(criterion, raw)
+            if error is None:
+                total_points += value
+            else:
+                errors.append(error)
+
+        if self.max_points > 0:
+            total = (total_points / self.max_points * HUNDRED).quantize(CENT)
+        else:
+            total = ZERO
+        return ScoreResult(total_score=total, errors=errors)
+
+    def total(self, scores):
+        return self.evaluate(scores).total_score
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+CACHE_SIZE = 256
+
+
+def get_scorer(form):
+    """
+    Formun derlenmiş puanlayıcısını döndürür. Önbellek anahtarı
+    (form id, sürüm) olduğundan form alanları değiştiğinde yeniden derlenir.
+    Anahtara oluşturulma zamanı da eklenir; geri alınan transaction'lardan
+    sonra (ör. testlerde) yeniden kullanılan id'ler eski tanımı getirmez.
+    Kaydedilmemiş formlar önbelleğe alınmaz.
+    """
+    if form is None:
+        return Scorer({})
+    if form.pk is None:
+        return Scorer(form.fields)
+
+    key = (form.pk, form.version, form.created_at)
+    scorer = _cache.get(key)
+    if scorer is None:
+        scorer = Scorer(form.fields)
+        with _cache_lock:
+            if len(_cache) >= CACHE_SIZE:
+                _cache.clear()
+            _cache[key] = scorer
+    return scorer
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,186 @@
+"""
+Yavaş sorgu günlüğü.
+
+Her veritabanı bağlantısına açılırken bir ``execute_wrapper`` eklenir (bkz.
+``install_slow_query_log`` alıcısı). ``SLOW_QUERY_MS`` süresini aşan sorgular
+çağrıldıkları kod satırıyla birlikte ``calls.slowqueries`` günlüğüne yazılır
+ve parmak izlerine göre ``SlowQuery`` tablosunda toplanır. Parmak izi,
+sabitleri ve ``IN (...)`` listelerini atılmış SQL metninin özetidir; aynı
+sorgunun farklı parametrelerle çalışmaları tek satırda birikir. Parametreler
+kişisel veri içerebileceğinden saklanmaz.
+
+``SLOW_QUERY_EXPLAIN_RATE`` oranındaki yavaş SELECT sorgularının planı da
+alınır: PostgreSQL'de ``EXPLAIN``, SQLite'ta ``EXPLAIN QUERY PLAN``.
+``SLOW_QUERY_EXPLAIN_ANALYZE`` açıksa PostgreSQL'de ``EXPLAIN (ANALYZE,
+BUFFERS)`` kullanılır; bu sorguyu yeniden çalıştırır. Satır kilidi alan
+(``FOR UPDATE``/``FOR SHARE``) sorguların planı hiç alınmaz; yeniden
+çalıştırmak kilitleri tekrar alır ve iş kuyruğundan satır kapabilir.
+
+Kayıt ve plan, sorgunun transaction'ı commit edildikten sonra yazılır; geri
+alınan transaction'lardaki sorgular kaydedilmez. Yönetim panelindeki "Yavaş
+Sorgular" sayfası parmak izlerini toplam süreye göre sıralar.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import re
+import sys
+import time
+from contextvars import ContextVar
+from functools import partial
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Kaydın kendi sorguları ölçülmez
+_recording = ContextVar("slow_query_recording", default=False)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+_LOCKING = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE
+)
+
+
+def normalize(sql):
+    """Sabitleri ve parametre listelerini atarak sorgunun kalıbını döndürür."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _SPACE.sub(" ", sql).strip()
+    sql = _LIST.sub("(...)", sql)
+    return _REPEATED_LIST.sub("(...)", sql)
+
+
+def fingerprint(sql):
+    normalized = normalize(sql)
+    return hashlib.sha1(normalized.encode()).hexdigest(), normalized
+
+
+def call_site(connection):
+    """
+    Sorguyu çalıştıran proje kodundaki ilk satır ("calls/queries.py:120 in
+    report_rollups"). Django, kütüphaneler ve execute_wrapper'lar atlanır.
+    """
+    wrappers = {getattr(w, "__code__", None) for w in connection.execute_wrappers}
+    base = str(settings.BASE_DIR) + os.sep
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename
+        if (
+            filename.startswith(base)
+            and "site-packages" not in filename
+            and filename != __file__
+            and code not in wrappers
+        ):
+            relative = os.path.relpath(filename, base)
+            return f"{relative}:{frame.f_lineno} in {code.co_name}"
+        frame = frame.f_back
+    return "-"
+
+
+def explain(connection, sql, params):
+    """Sorgunun planını metin olarak döndürür."""
+    options = {}
+    if connection.vendor == "postgresql" and settings.SLOW_QUERY_EXPLAIN_ANALYZE:
+        options = {"analyze": True, "buffers": True}
+    prefix = connection.ops.explain_query_prefix(**options)
+    with connection.cursor() as cursor:
+        cursor.execute(f"{prefix} {sql}", params)
+        return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+
+def explainable(sql, many):
+    """Planı güvenle alınabilecek sorgu mu: kilit almayan tek SELECT."""
+    return (
+        not many and sql.lstrip()[:6].upper() == "SELECT" and not _LOCKING.search(sql)
+    )
+
+
+def record(alias, sql, params, duration_ms, site, capture_plan):
+    """Yavaş sorguyu parmak izinin satırına ekler; plan istenmişse alır."""
+    from .models import SlowQuery
+
+    connection = connections[alias]
+    token = _recording.set(True)
+    try:
+        key, normalized = fingerprint(sql)
+        now = timezone.now()
+        changes = {"last_seen": now, "call_site": site}
+        if capture_plan:
+            changes.update(explain=explain(connection, sql, params), explained_at=now)
+        queries = SlowQuery.objects.using(alias)
+        with transaction.atomic(using=alias):
+            entry, created = queries.select_for_update().get_or_create(
+                fingerprint=key,
+                defaults={
+                    "sql": normalized,
+                    "calls": 1,
+                    "total_ms": duration_ms,
+                    "max_ms": duration_ms,
+                    **changes,
+                },
+            )
+            if not created:
+                queries.filter(pk=entry.pk).update(
+                    calls=F("calls") + 1,
+                    total_ms=F("total_ms") + duration_ms,
+                    max_ms=Greatest("max_ms", Value(duration_ms)),
+                    **changes,
+                )
+    except DatabaseError:
+        # Ölçüm hatası isteği bozmamalı
+        logger.exception("Yavaş sorgu kaydedilemedi.")
+    finally:
+        _recording.reset(token)
+
+
+def slow_query_logger(execute, sql, params, many, context):
+    if _recording.get():
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - started) * 1000
+    threshold = settings.SLOW_QUERY_MS
+    if threshold and duration_ms >= threshold:
+        connection = context["connection"]
+        site = call_site(connection)
+        logger.warning(
+            "slow_query duration_ms=%.1f site=%s sql=%s",
+            duration_ms,
+            site,
+            normalize(sql),
+        )
+        capture_plan = (
+            explainable(sql, many)
+            and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE
+        )
+        transaction.on_commit(
+            partial(
+                record,
+                connection.alias,
+                sql,
+                params if capture_plan else None,
+                duration_ms,
+                site,
+                capture_plan,
+            ),
+            using=connection.alias,
+        )
+    return result
+
+
+def install(connection):
+    if slow_query_logger not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_logger)
@@ -0,0 +1,156 @@
+"""
+Ses kayıtları için içerik adresli, parçalı (sharded) depolama.
+
+Dosyalar SHA-256 özetine göre ``call_records/ab/cd/<sha256>.<uzantı>``
+yoluna yazılır; tek dizinde biriken dosya sayısı sınırlı kalır. Aynı içerik
+ikinci kez yüklendiğinde yeni dosya yazılmaz, ``AudioBlob`` satırındaki
+referans sayısı artırılır. ``delete`` sayacı azaltır; dosya son referans
+kalktığında yanındaki türetilmiş dosyalarla (``derived_name``) birlikte silinir.
+
+Özet yükleme işleyicisi tarafından hesaplanmışsa (``audio_info``) dosya
+yeniden okunmaz. Aksi halde içerik geçici bir dosyaya yazılırken özet
+hesaplanır ve dosya hedef yoluna taşınır; her iki durumda da tek geçiş yapılır.
+"""
+
+import hashlib
+import os
+import re
+import uuid
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+BLOB_NAME = re.compile(r"(^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.\w+)?$")
+STAGING_DIR = ".staging"
+
+
+def blob_name(name, digest):
+    """``call_records/kayit.wav`` -> ``call_records/ab/cd/<özet>.wav``"""
+    directory = os.path.dirname(name)
+    extension = os.path.splitext(name)[1].lower()
+    return os.path.join(directory, digest[:2], digest[2:4], digest + extension)
+
+
+def derived_name(name, suffix):
+    """Orijinalin yanında tutulan türetilmiş dosyanın adı (ör. önizleme)."""
+    return os.path.splitext(name)[0] + suffix
+
+
+def is_blob_name(name):
+    return bool(BLOB_NAME.search(name or ""))
+
+
+def known_digest(content):
+    """İçerik için önceden hesaplanmış SHA-256 özeti varsa döndürür."""
+    for obj in (content, getattr(content, "file", None)):
+        info = getattr(obj, "audio_info", None)
+        if info is not None:
+            return info.sha256
+    return None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    # CallRecord silindiğinde dosya bu depolamada güvenle serbest bırakılabilir
+    reference_counted = True
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        digest = known_digest(content)
+        staged = None
+        if digest is None:
+            staged, digest = self._stage(content)
+
+        target = blob_name(name, digest)
+        try:
+            if not self.exists(target):
+                if staged is not None:
+                    path = self.path(target)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(staged, path)
+                    staged = None
+                    if self.file_permissions_mode is not None:
+                        os.chmod(path, self.file_permissions_mode)
+                else:
+                    written = self._save(target, content)
+                    if written != target:
+                        # Aynı içerik eşzamanlı yazıldı; fazla kopya silinir
+                        super().delete(written)
+        finally:
+            if staged is not None:
+                os.remove(staged)
+
+        self._acquire(target, digest)
+        return target
+
+    def _stage(self, content):
+        """İçeriği geçici dosyaya yazar ve özetini hesaplar."""
+        directory = self.path(STAGING_DIR)
+        os.makedirs(directory, exist_ok=True)
+        staged = os.path.join(directory, uuid.uuid4().hex)
+        digest = hashlib.sha256()
+        try:
+            with open(staged, "wb") as out:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    out.write(chunk)
+        except BaseException:
+            os.remove(staged)
+            raise
+        return staged, digest.hexdigest()
+
+    def _acquire(self, name, digest):
+        from .models import AudioBlob
+
+        with transaction.atomic():
+            blob, created = AudioBlob.objects.select_for_update().get_or_create(
+                name=name,
+                defaults={"sha256": digest, "size": self.size(name), "ref_count": 1},
+            )
+            if not created:
+                AudioBlob.objects.filter(pk=blob.pk).update(
+                    ref_count=F("ref_count") + 1
+                )
+
+    def delete(self, name):
+        """Referansı bırakır; dosya son referansla birlikte silinir."""
+        from .models import AudioBlob
+
+        with transaction.atomic():
+            blob = AudioBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                # Sayacı olmayan (eski düzendeki) dosyalar doğrudan silinir
+                super().delete(name)
+                return
+            if blob.ref_count > 1:
+                AudioBlob.objects.filter(pk=blob.pk).update(
+                    ref_count=F("ref_count") - 1
+                )
+                return
+            blob.delete()
+        super().delete(name)
+        self._delete_derived(name)
+
+    def _delete_derived(self, name):
+        """Aynı özetle adlandırılmış türetilmiş dosyaları da siler."""
+        directory, filename = os.path.split(name)
+        prefix = os.path.splitext(filename)[0] + "."
+        try:
+            _dirs, files = self.listdir(directory)
+        except FileNotFoundError:
+            return
+        for sibling in files:
+            if sibling.startswith(prefix):
+                super().delete(os.path.join(directory, sibling))
+
+
+audio_storage = ContentAddressedStorage()
+
+
+def get_audio_storage():
+    return audio_storage
@@ -0,0 +1,139 @@
+"""
+Ses dosyalarının yetki kontrolünden sonra sunulması.
+
+Üretimde dosya gövdesini nginx gönderir: görünüm yalnızca ``X-Accel-Redirect``
+başlığıyla ``internal`` işaretli konuma yönlendirir, Range istekleri ve
+sendfile nginx tarafında işlenir (``AUDIO_ACCEL_REDIRECT_PREFIX``). Ayar boşsa
+Django tek aralıklı ``Range``/``If-Range`` isteklerini kendisi yanıtlar.
+``FileResponse`` dosya nesnesini WSGI sunucusuna verdiğinden gunicorn aralığı
+``sendfile`` ile kopyalamadan gönderir.
+"""
+
+import mimetypes
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeFile:
+    """
+    Dosyanın [start, start + length) aralığını okuyan sarmalayıcı. ``fileno``
+    korunur; sendfile destekleyen sunucular okumayı dosyanın o anki
+    konumundan ``Content-Length`` kadar yapar.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Tek aralıklı ``Range`` başlığını (başlangıç, bitiş) olarak döndürür.
+    Başlık yoksa ya da desteklenmiyorsa None (tüm dosya), karşılanamıyorsa
+    ``ValueError``.
+    """
+    match = _RANGE.match((header or "").strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-N: son N bayt
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, end
+
+
+def _validators(storage, name, size):
+    try:
+        modified = int(storage.get_modified_time(name).timestamp())
+    except (NotImplementedError, OSError):
+        return None, None
+    return f'"{size:x}-{modified:x}"', modified
+
+
+def _if_range_matches(request, etag, modified):
+    value = request.headers.get("If-Range")
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith("W/"):
+        return etag is not None and value == etag
+    return modified is not None and parse_http_date_safe(value) == modified
+
+
+def serve_file(request, field_file, content_type=None):
+    """``FieldFile``i Range desteğiyle sunar."""
+    name = field_file.name
+    content_type = (
+        content_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+    )
+
+    prefix = getattr(settings, "AUDIO_ACCEL_REDIRECT_PREFIX", "")
+    if prefix:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(name)
+        response["Cache-Control"] = "private"
+        return response
+
+    storage = field_file.storage
+    size = storage.size(name)
+    etag, modified = _validators(storage, name, size)
+    response = get_conditional_response(request, etag=etag, last_modified=modified)
+    if response is not None:
+        return response
+
+    try:
+        byte_range = parse_range(request.headers.get("Range"), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    if byte_range is not None and not _if_range_matches(request, etag, modified):
+        byte_range = None
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1 if size else 0
+    response = FileResponse(
+        RangeFile(storage.open(name, "rb"), start, length),
+        content_type=content_type,
+        status=206 if byte_range else 200,
+    )
+    response["Content-Length"] = str(length)
+    if byte_range:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    response["Cache-Control"] = "private"
+    if etag:
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(modified)
+    return response
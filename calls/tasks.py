@@ -0,0 +1,132 @@
+"""
+Çağrı kaydı yüklendikten sonraki arka plan işleri.
+
+Kayıt veritabanına yazıldıktan sonra (``transaction.on_commit``) her çağrı
+için ``process_call`` Celery kuyruğuna alınır; yükleme isteği bu işleri
+beklemez. Görev sırasıyla:
+
+1. ses bilgileri (biçim, süre, SHA-256) eksikse dosyadan okur,
+2. depolanan dosyanın özetini kayıttaki özetle karşılaştırır,
+3. dalga formu ve önizlemeyi üretir,
+4. önceliklendirmede kullanılan akustik ölçüm satırını yazar.
+
+Adımlar yeniden çalıştırılabilir; üretilmiş çıktılar atlanır. Geçici
+hatalarda (dosya sistemi, veritabanı) görev artan aralıklarla yeniden
+denenir; denemeler tükenirse ya da özet tutmazsa çağrı ``failed`` olur.
+"""
+
+import hashlib
+import logging
+
+from celery import Task, shared_task
+from kombu.exceptions import OperationalError
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from . import acoustics, renditions, waveforms
+from .models import CallAcousticMetrics, CallRecord
+from .probe import AudioFormatError, audio_fields, probe_file
+
+logger = logging.getLogger(__name__)
+
+RETRY_ON = (OSError, DatabaseError)
+
+
+class ChecksumMismatch(Exception):
+    pass
+
+
+def _set_status(call_id, status, error=""):
+    CallRecord.objects.filter(pk=call_id).update(
+        processing_status=status, processing_error=error
+    )
+
+
+class CallProcessingTask(Task):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        _set_status(args[0], "failed", f"{type(exc).__name__}: {exc}")
+
+
+def extract_metadata(call):
+    """
+    Yükleme sırasında okunamayan ses bilgilerini dosyadan okur. Özet bu
+    adımda hesaplandıysa True döner; ayrıca doğrulamaya gerek kalmaz.
+    """
+    if call.sha256:
+        return False
+    try:
+        info = probe_file(call.audio_file)
+    except AudioFormatError:
+        with call.audio_file.open("rb"):
+            fields = {"sha256": _file_digest(call.audio_file)}
+    else:
+        fields = audio_fields(info)
+    finally:
+        call.audio_file.close()
+    CallRecord.objects.filter(pk=call.pk).update(**fields)
+    for field, value in fields.items():
+        setattr(call, field, value)
+    return True
+
+
+def _file_digest(field_file):
+    digest = hashlib.sha256()
+    for chunk in field_file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_checksum(call):
+    """Depolanan dosyanın içeriği yüklemede hesaplanan özetle aynı olmalı."""
+    with call.audio_file.open("rb"):
+        actual = _file_digest(call.audio_file)
+    if actual != call.sha256:
+        raise ChecksumMismatch(
+            f"Dosya özeti tutmuyor: beklenen {call.sha256}, bulunan {actual}"
+        )
+
+
+@shared_task(
+    bind=True,
+    base=CallProcessingTask,
+    autoretry_for=RETRY_ON,
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=settings.CALL_PROCESSING_MAX_RETRIES,
+)
+def process_call(self, call_id):
+    call = CallRecord.objects.filter(pk=call_id).first()
+    if call is None or not call.audio_file:
+        return
+    _set_status(call_id, "processing")
+
+    if not extract_metadata(call):
+        verify_checksum(call)
+    if not call.waveform:
+        waveforms.generate_waveform(call)
+    if not call.preview:
+        renditions.generate_preview(call)
+    if not CallAcousticMetrics.objects.filter(call=call).exists():
+        acoustics.analyze_call(call)
+
+    _set_status(call_id, "ready")
+
+
+def enqueue(call_ids):
+    """
+    Çağrıları kuyruğa alır. Aracıya ulaşılamazsa kayıtlar ``pending`` kalır;
+    ``process_pending_calls`` komutu bunları sonradan kuyruğa alır.
+    """
+    for call_id in call_ids:
+        try:
+            process_call.delay(call_id)
+        except OperationalError:
+            logger.warning("Çağrı %s kuyruğa alınamadı; aracıya ulaşılamıyor.", call_id)
+
+
+def schedule_processing(calls):
+    """Kayıtlar veritabanına yazıldıktan sonra arka plan işlerini başlatır."""
+    call_ids = [call.pk for call in calls]
+    transaction.on_commit(lambda: enqueue(call_ids))
@@ -0,0 +1,233 @@
+"""
+Görünüm ve API uç noktalarının sorgu sayısı regresyon testleri.
+
+``calls``, ``api`` ve ``dashboard`` URLconf'larındaki her adlandırılmış rota
+önce N, sonra 10·N satırlık veriyle istenir; iki istekteki sorgu sayısı aynı
+olmalıdır. Sayı veriyle artıyorsa bir yerde satır başına sorgu (N+1) vardır;
+genellikle eksik bir ``select_related``/``prefetch_related``.
+
+Rotalar URLconf'lardan otomatik toplanır, yeni bir rota eklendiğinde ayrıca
+test yazmak gerekmez; yalnızca yeni bir yol parametresi ``route_kwargs``'a
+eklenmelidir. Projeye henüz bağlanmamış uygulamaların rotaları bu modülün
+URLconf'una eklenir; kurulu olmayan uygulamaların testleri atlanır.
+"""
+
+import shutil
+import tempfile
+from copy import deepcopy
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, include, path, reverse
+from django.utils import timezone
+
+from qualityhub import urls as project_urls
+
+from .models import (
+    CallQueue,
+    CallRecord,
+    Evaluation,
+    EvaluationForm,
+    EvaluationTask,
+    UploadSession,
+)
+from .tests import make_wav
+
+User = get_user_model()
+
+N = 3
+
+URLCONFS = {"calls": "calls.urls", "api": "api.urls", "dashboard": "dashboard.urls"}
+
+_routed = {p.namespace for p in project_urls.urlpatterns if isinstance(p, URLResolver)}
+urlpatterns = list(project_urls.urlpatterns) + [
+    path(f"{app}/", include(module))
+    for app, module in URLCONFS.items()
+    if apps.is_installed(app) and app not in _routed
+]
+
+# base.html oturum menüsü için accounts URL'lerini kullanır; accounts kurulu
+# değilse sayfalar yalnızca blokları işleyen yalın bir tabanla çizilir
+BASE_TEMPLATE = (
+    "{% block extra_head %}{% endblock %}{% block content %}{% endblock %}"
+    "{% block extra_body %}{% endblock %}{% block extra_js %}{% endblock %}"
+)
+
+
+def query_count_templates():
+    engine = deepcopy(settings.TEMPLATES[0])
+    if not apps.is_installed("accounts"):
+        engine["APP_DIRS"] = False
+        engine["OPTIONS"]["loaders"] = [
+            ("django.template.loaders.locmem.Loader", {"base.html": BASE_TEMPLATE}),
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ]
+    return [engine]
+
+
+def routes(namespace):
+    """
+    Ad alanındaki adlandırılmış rotalar ve yol parametreleri. İç içe ad
+    alanları (ör. DRF'nin oturum görünümleri) ve ``format`` sonekli
+    kopyalar atlanır.
+    """
+    found = {}
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                if pattern.namespace is None:
+                    walk(pattern.url_patterns)
+            elif pattern.name:
+                params = set(pattern.pattern.regex.groupindex)
+                if "format" not in params:
+                    found.setdefault(f"{namespace}:{pattern.name}", params)
+
+    for pattern in get_resolver(__name__).url_patterns:
+        if isinstance(pattern, URLResolver) and pattern.namespace == namespace:
+            walk(pattern.url_patterns)
+    return sorted(found.items())
+
+
+class RouteQueryCountMixin:
+    namespace = None
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.admin = User.objects.create_superuser(username="admin", password="x")
+        self.expert = User.objects.create_user(username="expert", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+        self.form = EvaluationForm.objects.create(
+            name="Form",
+            created_by=self.admin,
+            fields={"field_1": {"label": "Empati", "type": "number", "max_score": 10}},
+        )
+        self.call = CallRecord.objects.create(
+            uploaded_by=self.admin,
+            agent=self.expert,
+            call_queue=self.queue,
+            phone_number="5550000000",
+            audio_file=ContentFile(make_wav(), name="test.wav"),
+            call_date=timezone.now(),
+        )
+        self.evaluation = self.evaluate(self.call)
+        self.session = UploadSession.objects.create(
+            created_by=self.admin,
+            filename="test.wav",
+            size=1,
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        self.task = EvaluationTask.objects.get(call=self.call)
+        self.client.force_login(self.admin)
+
+    def evaluate(self, call):
+        return Evaluation.objects.create(
+            call=call,
+            evaluator=self.expert,
+            form=self.form,
+            scores={"field_1": {"score": 7}},
+            final_note="-",
+        )
+
+    def seed(self, count):
+        """
+        Listelenen her tabloya ``count`` satır ekler: kendi temsilcisi olan
+        çağrılar ve değerlendirmeleri, sınanan çağrıya yeni değerlendirmeler.
+        """
+        start = User.objects.count()
+        agents = User.objects.bulk_create(
+            User(username=f"agent{start + i}") for i in range(count)
+        )
+        calls = CallRecord.objects.bulk_create(
+            CallRecord(
+                uploaded_by=self.admin,
+                agent=agent,
+                call_queue=self.queue,
+                phone_number="5550000000",
+                audio_file="call_records/test.wav",
+                call_date=timezone.now(),
+            )
+            for agent in agents
+        )
+        for call in calls:
+            self.evaluate(call)
+            self.evaluate(self.call)
+
+    def route_kwargs(self, name, params):
+        values = {"call_id": self.call.pk, "evaluation_id": self.evaluation.pk}
+        # DRF yönlendiricisinin ``pk`` parametresi rota adının ön ekine göre
+        details = {
+            "api:calls-": self.call,
+            "api:customuser-": self.expert,
+            "api:evaluation-": self.evaluation,
+            "api:evaluationform-": self.form,
+            "api:uploads-": self.session,
+            "api:work-queue-": self.task,
+        }
+        for prefix, obj in details.items():
+            if name.startswith(prefix):
+                values["pk"] = obj.pk
+        missing = params - set(values)
+        if missing:
+            self.fail(f"{name}: bilinmeyen yol parametresi {sorted(missing)}")
+        return {param: values[param] for param in params}
+
+    def query_counts(self):
+        counts = {}
+        for name, params in routes(self.namespace):
+            url = reverse(name, kwargs=self.route_kwargs(name, params))
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            response.close()
+            self.assertLess(response.status_code, 500, url)
+            counts[url] = len(queries)
+        return counts
+
+    def test_query_count_independent_of_rows(self):
+        # İlk istekler önizleme, dalga formu gibi tek seferlik işleri yapar
+        self.query_counts()
+        self.seed(N)
+        small = self.query_counts()
+        self.assertTrue(small)
+        self.seed(9 * N)
+        large = self.query_counts()
+        for url, count in small.items():
+            with self.subTest(url=url):
+                self.assertEqual(large[url], count)
+
+
+query_count_settings = override_settings(
+    ROOT_URLCONF=__name__, TEMPLATES=query_count_templates()
+)
+
+
+@query_count_settings
+class CallsQueryCountTest(RouteQueryCountMixin, TestCase):
+    namespace = "calls"
+
+
+@skipUnless(apps.is_installed("api"), "api uygulaması kurulu değil")
+@query_count_settings
+class ApiQueryCountTest(RouteQueryCountMixin, TestCase):
+    namespace = "api"
+
+
+@skipUnless(apps.is_installed("dashboard"), "dashboard uygulaması kurulu değil")
+@query_count_settings
+class DashboardQueryCountTest(RouteQueryCountMixin, TestCase):
+    namespace = "dashboard"
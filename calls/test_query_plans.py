@@ -0,0 +1,126 @@
+"""
+Dashboard ve rapor sorgularının sorgu planı testleri.
+
+Her sorgu için EXPLAIN çalıştırılır ve büyük tablolardan
+(``calls_callrecord``, ``calls_evaluation``, ``calls_evaluationdailyrollup``)
+biri sıralı taramayla okunuyorsa test başarısız olur. PostgreSQL'de küçük test tablolarında planlayıcı zaten
+sıralı taramayı seçeceğinden ``enable_seqscan`` kapatılır; yalnızca uygun
+indeks yoksa sıralı tarama yine de seçilir. Filtresiz tüm tablo sayımları
+(``admin_dashboard`` toplamları) doğası gereği tam tarama olduğundan kapsam
+dışıdır.
+"""
+
+import re
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from . import queries
+from .models import CallQueue, CallRecord, Evaluation, EvaluationForm
+
+User = get_user_model()
+
+LARGE_TABLES = ("calls_callrecord", "calls_evaluation", "calls_evaluationdailyrollup")
+
+
+def sequential_scans(plan):
+    """
+    Plan metninde büyük tablolar üzerindeki sıralı taramaları bulur.
+
+    SQLite'ta "SCAN tablo" indekssiz tam taramadır; "SCAN tablo USING INDEX"
+    ve "SEARCH tablo USING INDEX" indeks üzerinden erişimdir.
+    """
+    if connection.vendor == "postgresql":
+        pattern = r"Seq Scan on (\w+)"
+    else:
+        pattern = r"\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)"
+    return [t for t in re.findall(pattern, plan) if t in LARGE_TABLES]
+
+
+class QueryPlanTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = User.objects.create_user(username="agent", password="x")
+        cls.expert = User.objects.create_user(username="expert", password="x")
+        cls.queue = CallQueue.objects.create(name="Genel")
+        cls.form = EvaluationForm.objects.create(
+            name="Form",
+            created_by=cls.expert,
+            fields={"field_1": {"label": "Empati", "type": "number", "max_score": 5}},
+        )
+        now = timezone.now()
+        for i in range(20):
+            call = CallRecord.objects.create(
+                uploaded_by=cls.expert,
+                agent=cls.agent,
+                call_queue=cls.queue,
+                phone_number="5550000000",
+                audio_file="call_records/test.wav",
+                call_date=now - timedelta(days=i),
+            )
+            if i % 2:
+                Evaluation.objects.create(
+                    call=call,
+                    evaluator=cls.expert,
+                    form=cls.form,
+                    scores={"field_1": {"score": 3}},
+                    final_note="-",
+                )
+
+    def assertNoSequentialScan(self, queryset):
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        self.assertEqual(sequential_scans(plan), [], msg=plan)
+
+    def test_dashboard_queries(self):
+        week_ago = timezone.localdate() - timedelta(days=6)
+        month_start = timezone.localdate().replace(day=1)
+        cases = {
+            "pending_calls": queries.pending_calls()[:5],
+            "expert_evaluations": queries.expert_evaluations(self.expert)[:5],
+            "expert_month": queries.expert_evaluations(self.expert).filter(
+                **queries.date_range_lookups("evaluated_at", month_start)
+            ),
+            "agent_calls": queries.agent_calls(self.agent)[:5],
+            "agent_evaluations": queries.agent_evaluations(self.agent)[:5],
+            "evaluations_by_day": queries.evaluations_by_day(week_ago),
+        }
+        for name, queryset in cases.items():
+            with self.subTest(query=name):
+                self.assertNoSequentialScan(queryset)
+
+    def test_report_queries(self):
+        today = timezone.localdate()
+        filters = {
+            "date_range": {"start_date": str(today - timedelta(days=7))},
+            "agent": {"agent_id": self.agent.id},
+            "expert": {"expert_id": self.expert.id},
+            "queue": {"queue_id": self.queue.id},
+        }
+        # İstatistikler günlük özet tablosundan gelir; ham sorgu dışa aktarım
+        # gibi satır bazlı yollar tarafından kullanılır. report_summary aynı
+        # filtrelenmiş özet sorgusunun toplamıdır
+        for name, kwargs in filters.items():
+            rollups = queries.report_rollups(**kwargs)
+            cases = {
+                "evaluations": queries.report_evaluations(**kwargs),
+                "rollups": rollups,
+                "agent_stats": queries.agent_report_stats(rollups),
+                "expert_stats": queries.expert_report_stats(rollups),
+            }
+            for query, queryset in cases.items():
+                with self.subTest(filter=name, query=query):
+                    self.assertNoSequentialScan(queryset)
+
+    def test_date_range_matches_date_lookup(self):
+        start = timezone.localdate() - timedelta(days=7)
+        self.assertEqual(
+            queries.report_evaluations(start_date=str(start)).count(),
+            Evaluation.objects.filter(evaluated_at__date__gte=start).count(),
+        )
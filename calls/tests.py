@@ -1,8 +1,84 @@
+import csv
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+import wave
+import zipfile
+from collections import Counter
+from datetime import datetime, timedelta
+from decimal import Decimal
+from importlib import import_module
+from io import BytesIO, StringIO
+from unittest import mock
+
+import numpy as np
+from prometheus_client import REGISTRY
+
+from django.apps import apps as django_apps
 from django.contrib.auth.models import User
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
+
+from . import (
+    acoustics,
+    analytics,
+    catalog,
+    ingest,
+    overview,
+    queries,
+    renditions,
+    sampling,
+    slowqueries,
+    tasks,
+    uploads,
+    waveforms,
+    workqueue,
+)
+from .bulk import bulk_create_evaluations
+from .ingest import ManifestError, ingest_archive
+from .models import (
+    AudioBlob,
+    Call,
+    CallAcousticMetrics,
+    CallEvaluation,
+    CallQueue,
+    CallRecord,
+    Evaluation,
+    EvaluationCriterionScore,
+    EvaluationDailyRollup,
+    EvaluationForm,
+    EvaluationTask,
+    SlowQuery,
+    UploadSession,
+)
+from .probe import AudioFormatError, AudioProbe, validate_audio_file
+from .scoring import get_scorer
+from .storage import derived_name, is_blob_name
+from .uploadhandlers import AudioUploadHandler
 
-from .models import Call, CallEvaluation
+
+def make_wav(seconds=1.0, rate=8000, channels=1, amplitude=0.5):
+    """Testler için 16 bit PCM sinüs WAV içeriği üretir."""
+    frames = int(seconds * rate)
+    tone = (
+        np.sin(np.arange(frames) * 2 * np.pi * 440 / rate) * amplitude * 32767
+    ).astype("<i2")
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(channels)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(np.repeat(tone, channels).tobytes())
+    return buffer.getvalue()
 
 
 class CallModelTest(TestCase):
@@ -94,3 +170,1720 @@ class CallEvaluationTest(TestCase):
         )
         expected_str = f"Evaluation for Call {self.call.id} - Score: 85"
         self.assertEqual(str(evaluation), expected_str)
+
+
+class EvaluationRollupTest(TestCase):
+    def setUp(self):
+        self.agent = User.objects.create_user(username="agent", password="x")
+        self.expert = User.objects.create_user(username="expert", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+        self.form = EvaluationForm.objects.create(
+            name="Form",
+            created_by=self.expert,
+            fields={"field_1": {"label": "Empati", "type": "number", "max_score": 10}},
+        )
+        self.call = CallRecord.objects.create(
+            uploaded_by=self.expert,
+            agent=self.agent,
+            call_queue=self.queue,
+            phone_number="5550000000",
+            audio_file="call_records/test.wav",
+            call_date=timezone.now(),
+        )
+
+    def _evaluate(self, score):
+        return Evaluation.objects.create(
+            call=self.call,
+            evaluator=self.expert,
+            form=self.form,
+            scores={"field_1": {"score": score}},
+            final_note="-",
+        )
+
+    def test_create_updates_rollup(self):
+        self._evaluate(8)
+        self._evaluate(4)
+        rollup = EvaluationDailyRollup.objects.get()
+        self.assertEqual(rollup.evaluation_count, 2)
+        self.assertEqual(rollup.score_sum, Decimal("120"))
+        self.assertEqual(rollup.score_min, Decimal("40"))
+        self.assertEqual(rollup.score_max, Decimal("80"))
+        self.assertEqual(rollup.day, timezone.localdate())
+
+    def test_update_and_delete_recompute_bucket(self):
+        first = self._evaluate(8)
+        second = self._evaluate(4)
+        first.scores = {"field_1": {"score": 2}}
+        first.save()
+        rollup = EvaluationDailyRollup.objects.get()
+        self.assertEqual(rollup.score_max, Decimal("40"))
+        self.assertEqual(rollup.score_min, Decimal("20"))
+
+        second.delete()
+        rollup.refresh_from_db()
+        self.assertEqual(rollup.evaluation_count, 1)
+        self.assertEqual(rollup.score_sum, Decimal("20"))
+
+        first.delete()
+        self.assertFalse(EvaluationDailyRollup.objects.exists())
+
+    def test_rebuild_command_matches_incremental(self):
+        self._evaluate(8)
+        self._evaluate(5)
+        expected = list(
+            EvaluationDailyRollup.objects.values(
+                "day", "evaluation_count", "score_sum", "score_min", "score_max"
+            )
+        )
+        EvaluationDailyRollup.objects.all().delete()
+        call_command("rebuild_evaluation_rollups", stdout=StringIO())
+        self.assertEqual(
+            list(
+                EvaluationDailyRollup.objects.values(
+                    "day", "evaluation_count", "score_sum", "score_min", "score_max"
+                )
+            ),
+            expected,
+        )
+
+    def test_backfill_migration_builds_missing_rollups(self):
+        self._evaluate(8)
+        self._evaluate(5)
+        EvaluationDailyRollup.objects.all().delete()
+        migration = import_module("calls.migrations.0018_backfill_evaluation_rollups")
+        migration.backfill_rollups(django_apps, None)
+        rollup = EvaluationDailyRollup.objects.get()
+        self.assertEqual(rollup.evaluation_count, 2)
+        self.assertEqual(rollup.score_sum, Decimal("130"))
+
+    def test_call_reassignment_moves_evaluations_between_buckets(self):
+        self._evaluate(8)
+        other_agent = User.objects.create_user(username="other", password="x")
+        other_queue = CallQueue.objects.create(name="Satış")
+
+        self.call.agent = other_agent
+        self.call.save()
+        rollup = EvaluationDailyRollup.objects.get()
+        self.assertEqual(rollup.agent_id, other_agent.id)
+        self.assertEqual(rollup.evaluation_count, 1)
+
+        self.call.call_queue = other_queue
+        self.call.save(update_fields=["call_queue"])
+        rollup = EvaluationDailyRollup.objects.get()
+        self.assertEqual(
+            (rollup.agent_id, rollup.call_queue_id), (other_agent.id, other_queue.id)
+        )
+        self.assertEqual(rollup.score_sum, Decimal("80"))
+
+    def test_unrelated_call_update_skips_reassignment_lookup(self):
+        with self.assertNumQueries(1):
+            self.call.save(update_fields=["phone_number"])
+
+    def test_report_stats_from_rollups(self):
+        self._evaluate(8)
+        self._evaluate(5)
+        rollups = queries.report_rollups(agent_id=self.agent.id)
+        total, avg = queries.report_summary(rollups)
+        self.assertEqual(total, 2)
+        self.assertAlmostEqual(avg, 65.0)
+        stats = list(queries.agent_report_stats(rollups))
+        self.assertEqual(stats[0]["total"], 2)
+        self.assertEqual(stats[0]["max_score"], Decimal("80"))
+        self.assertFalse(
+            queries.report_rollups(start_date=timezone.localdate().replace(year=2100))
+        )
+
+
+class CriterionScoreTest(TestCase):
+    def setUp(self):
+        self.agent = User.objects.create_user(username="agent", password="x")
+        self.expert = User.objects.create_user(username="expert", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+        self.form = EvaluationForm.objects.create(
+            name="Form",
+            created_by=self.expert,
+            fields={
+                "field_1": {"label": "Açılış", "type": "number", "max_score": 10},
+                "field_2": {"label": "Empati", "type": "number", "max_score": 5},
+            },
+        )
+        self.call = CallRecord.objects.create(
+            uploaded_by=self.expert,
+            agent=self.agent,
+            call_queue=self.queue,
+            phone_number="5550000000",
+            audio_file="call_records/test.wav",
+            call_date=timezone.now(),
+        )
+
+    def _evaluate(self, opening, empathy):
+        return Evaluation.objects.create(
+            call=self.call,
+            evaluator=self.expert,
+            form=self.form,
+            scores={
+                "field_1": {"score": opening},
+                "field_2": {"score": empathy},
+            },
+            final_note="-",
+        )
+
+    def test_rows_follow_scores(self):
+        evaluation = self._evaluate(10, 1)
+        rows = dict(evaluation.criterion_scores.values_list("criterion_key", "score"))
+        self.assertEqual(rows, {"field_1": Decimal("10"), "field_2": Decimal("1")})
+        self.assertEqual(
+            evaluation.criterion_scores.get(criterion_key="field_2").max_score,
+            Decimal("5"),
+        )
+
+        evaluation.scores["field_2"]["score"] = 4
+        evaluation.save()
+        self.assertEqual(
+            evaluation.criterion_scores.get(criterion_key="field_2").score,
+            Decimal("4"),
+        )
+
+    def test_sql_aggregates(self):
+        self._evaluate(10, 1)
+        self._evaluate(8, 3)
+        rows = analytics.criterion_scores(agent_id=self.agent.id)
+
+        averages = {
+            row["criterion_key"]: row for row in analytics.criterion_averages(rows)
+        }
+        self.assertAlmostEqual(averages["field_1"]["avg_ratio"], 0.9)
+        self.assertEqual(
+            analytics.weakest_criteria(rows, limit=1)[0]["criterion_key"], "field_2"
+        )
+        by_agent = list(analytics.criterion_averages_by_agent(rows, "field_2"))
+        self.assertEqual(by_agent[0]["agent_id"], self.agent.id)
+        self.assertAlmostEqual(float(by_agent[0]["avg_score"]), 2.0)
+        self.assertEqual(analytics.criterion_histogram(rows, "field_1", bins=5), {4: 2})
+
+    def test_backfill_command(self):
+        evaluation = self._evaluate(7, 2)
+        EvaluationCriterionScore.objects.all().delete()
+        call_command("backfill_criterion_scores", stdout=StringIO())
+        self.assertEqual(evaluation.criterion_scores.count(), 2)
+
+
+class ScoringTest(TestCase):
+    def setUp(self):
+        self.expert = User.objects.create_user(username="expert", password="x")
+        self.form = EvaluationForm.objects.create(
+            name="Form",
+            created_by=self.expert,
+            fields={
+                "field_1": {"label": "Açılış", "type": "number", "max_score": 10},
+                "field_2": {"label": "Kapanış", "type": "boolean", "max_score": 5},
+            },
+        )
+
+    def test_total_and_boolean(self):
+        result = get_scorer(self.form).evaluate(
+            {"field_1": {"score": 7}, "field_2": {"score": "1"}}
+        )
+        self.assertEqual(result.errors, [])
+        self.assertEqual(result.total_score, Decimal("80.00"))
+
+    def test_validation_errors(self):
+        result = get_scorer(self.form).evaluate(
+            {"field_1": {"score": 11}, "field_2": {"score": 3}}
+        )
+        self.assertEqual(len(result.errors), 2)
+        self.assertIn("field_1 için maksimum puan 10 olabilir.", result.errors)
+
+    def test_non_finite_scores_rejected(self):
+        for raw in ["NaN", "sNaN", float("nan"), "Infinity", Decimal("NaN")]:
+            with self.subTest(raw=raw):
+                result = get_scorer(self.form).evaluate({"field_1": {"score": raw}})
+                self.assertEqual(result.errors, ["field_1 için puan sayı olmalıdır."])
+
+    def test_cache_follows_form_version(self):
+        scorer = get_scorer(self.form)
+        self.assertIs(get_scorer(self.form), scorer)
+
+        self.form.fields["field_1"]["max_score"] = 20
+        self.form.save()
+        self.assertEqual(self.form.version, 2)
+        self.assertIsNot(get_scorer(self.form), scorer)
+        self.assertEqual(get_scorer(self.form).max_points, Decimal("25"))
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("benchmark_scoring", iterations=10, stdout=out)
+        self.assertIn("µs", out.getvalue())
+
+
+class EvaluationExportTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="x")
+        self.agent = User.objects.create_user(username="agent", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+        self.form = EvaluationForm.objects.create(
+            name="Form",
+            created_by=self.admin,
+            fields={
+                "field_1": {"label": "Açılış", "type": "number", "max_score": 10},
+                "field_2": {"label": "Empati", "type": "number", "max_score": 5},
+            },
+        )
+        for score in (4, 9):
+            call = CallRecord.objects.create(
+                uploaded_by=self.admin,
+                agent=self.agent,
+                call_queue=self.queue,
+                phone_number="5550000000",
+                audio_file="call_records/test.wav",
+                call_date=timezone.now(),
+            )
+            Evaluation.objects.create(
+                call=call,
+                evaluator=self.admin,
+                form=self.form,
+                scores={"field_1": {"score": score}, "field_2": {"score": 5}},
+                final_note="Not, virgüllü",
+            )
+
+    def test_requires_admin(self):
+        self.client.force_login(self.agent)
+        response = self.client.get(reverse("calls:evaluation_export"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_csv_stream(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("calls:evaluation_export"))
+        self.assertTrue(response.streaming)
+        rows = list(
+            csv.reader(
+                b"".join(response.streaming_content).decode("utf-8").splitlines()
+            )
+        )
+        self.assertEqual(rows[0][-2:], ["score_field_1", "score_field_2"])
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(sorted(row[-2] for row in rows[1:]), ["4", "9"])
+        self.assertIn("Not, virgüllü", rows[1])
+
+    def test_ndjson_stream_with_filters(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("calls:evaluation_export"),
+            {"format": "ndjson", "agent": self.agent.id, "queue": self.queue.id},
+        )
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["agent_username"], "agent")
+        self.assertEqual(records[0]["call_queue"], "Genel")
+
+        response = self.client.get(
+            reverse("calls:evaluation_export"), {"format": "xml"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_filters_rejected(self):
+        self.client.force_login(self.admin)
+        for params in [{"agent": "abc"}, {"expert": "-1"}, {"queue": "1.5"}]:
+            with self.subTest(params=params):
+                response = self.client.get(reverse("calls:evaluation_export"), params)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.streaming)
+
+    def test_export_command(self):
+        out = StringIO()
+        call_command("export_evaluations", fmt="ndjson", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+
+class BulkEvaluationTest(TestCase):
+    def setUp(self):
+        self.agent = User.objects.create_user(username="agent", password="x")
+        self.expert = User.objects.create_user(username="expert", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+        self.form = EvaluationForm.objects.create(
+            name="Form",
+            created_by=self.expert,
+            fields={
+                "field_1": {"label": "Açılış", "type": "number", "max_score": 10},
+                "field_2": {"label": "Empati", "type": "number", "max_score": 10},
+            },
+        )
+        self.calls = [
+            CallRecord.objects.create(
+                uploaded_by=self.expert,
+                agent=self.agent,
+                call_queue=self.queue,
+                phone_number="5550000000",
+                audio_file=f"call_records/{i}.wav",
+                call_date=timezone.now(),
+            )
+            for i in range(3)
+        ]
+
+    def _item(self, call, opening, empathy=5):
+        return {
+            "call": call.id,
+            "form": self.form.id,
+            "scores": {"field_1": {"score": opening}, "field_2": {"score": empathy}},
+            "final_note": "Toplu",
+        }
+
+    def test_valid_items_created_in_chunks(self):
+        items = [self._item(call, 10) for call in self.calls]
+        result = bulk_create_evaluations(items, self.expert, chunk_size=2)
+
+        self.assertEqual(len(result.created_ids), 3)
+        self.assertEqual(result.errors, [])
+        evaluation = Evaluation.objects.get(pk=result.created_ids[0])
+        self.assertEqual(evaluation.total_score, Decimal("75.00"))
+        self.assertEqual(evaluation.evaluator, self.expert)
+        self.assertEqual(evaluation.criterion_scores.count(), 2)
+
+        total, avg = queries.report_summary(queries.report_rollups())
+        self.assertEqual(total, 3)
+        self.assertAlmostEqual(avg, 75.0)
+
+    def test_invalid_items_reported_with_index(self):
+        items = [
+            self._item(self.calls[0], 10),
+            self._item(self.calls[1], 11),
+            {"call": 0, "form": self.form.id, "scores": {}, "final_note": ""},
+            ValueError("Expecting value"),
+            "metin",
+        ]
+        result = bulk_create_evaluations(iter(items), self.expert)
+
+        self.assertEqual(len(result.created_ids), 1)
+        self.assertEqual(result.total, 5)
+        self.assertEqual([error["index"] for error in result.errors], [1, 2, 3, 4])
+        self.assertIn("scores", result.errors[0]["errors"])
+        self.assertEqual(set(result.errors[1]["errors"]), {"call", "final_note"})
+        self.assertEqual(Evaluation.objects.count(), 1)
+
+    def test_non_finite_scores_reported_as_row_errors(self):
+        items = [
+            self._item(self.calls[0], float("nan")),
+            self._item(self.calls[1], "sNaN"),
+            self._item(self.calls[2], 10),
+        ]
+        result = bulk_create_evaluations(items, self.expert)
+
+        self.assertEqual(len(result.created_ids), 1)
+        self.assertEqual([error["index"] for error in result.errors], [0, 1])
+        self.assertEqual(
+            result.errors[0]["errors"],
+            {"scores": ["field_1 için puan sayı olmalıdır."]},
+        )
+
+    def test_created_evaluations_counted_after_commit(self):
+        def created():
+            return REGISTRY.get_sample_value(
+                "qualityhub_evaluations_created_total", {"source": "bulk"}
+            )
+
+        before = created() or 0
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_create_evaluations(
+                [self._item(call, 10) for call in self.calls], self.expert
+            )
+        self.assertEqual(created(), before + 3)
+
+
+class CallArchiveIngestTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.expert = User.objects.create_user(username="expert", password="x")
+        self.agent = User.objects.create_user(username="agent", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+
+    def _archive(self, manifest, files, name="manifest.csv"):
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr(name, manifest)
+            for filename in files:
+                archive.writestr(filename, make_wav(seconds=0.1))
+        buffer.seek(0)
+        return buffer
+
+    def test_csv_manifest_partial_failure_and_retry(self):
+        manifest = (
+            "file,agent,queue,phone_number,call_date,call_id\n"
+            "a.wav,agent,Genel,5550000001,2024-05-01 10:00,C-1\n"
+            f"b.wav,{self.agent.id},{self.queue.id},5550000002,2024-05-01T11:00,C-2\n"
+            "c.wav,yok,Genel,5550000003,2024-05-01 12:00,C-3\n"
+            "d.txt,agent,Genel,5550000004,dün,C-4\n"
+        )
+        files = ["a.wav", "b.wav", "c.wav", "d.txt"]
+        result = ingest_archive(self._archive(manifest, files), self.expert)
+
+        self.assertEqual((result.created, result.failed), (2, 2))
+        statuses = [entry["status"] for entry in result.entries]
+        self.assertEqual(statuses, ["created", "created", "error", "error"])
+        self.assertEqual(set(result.entries[3]["errors"]), {"file", "call_date"})
+        record = CallRecord.objects.get(call_id="C-2")
+        self.assertEqual(record.agent, self.agent)
+        self.assertEqual(record.uploaded_by, self.expert)
+        self.assertTrue(record.audio_file.storage.exists(record.audio_file.name))
+
+        # Yeniden gönderimde yüklenmiş satırlar tekrar eklenmez
+        result = ingest_archive(self._archive(manifest, files), self.expert)
+        self.assertEqual(result.created, 0)
+        self.assertIn("call_id", result.entries[0]["errors"])
+        self.assertEqual(CallRecord.objects.count(), 2)
+
+    def test_json_manifest_and_command(self):
+        manifest = json.dumps(
+            [
+                {
+                    "file": "calls/a.wav",
+                    "agent": "agent",
+                    "queue": "Genel",
+                    "phone_number": "5550000001",
+                    "call_date": "2024-05-01T10:00:00+03:00",
+                    "call_id": "J-1",
+                }
+            ]
+        )
+        path = os.path.join(self.media_root, "batch.zip")
+        with open(path, "wb") as out:
+            out.write(
+                self._archive(manifest, ["calls/a.wav"], "manifest.json").getvalue()
+            )
+        out = StringIO()
+        call_command("ingest_calls", path, uploaded_by="expert", stdout=out)
+        self.assertIn("1 kayıt yüklendi", out.getvalue())
+        self.assertTrue(CallRecord.objects.filter(call_id="J-1").exists())
+
+    def _corrupt(self, archive, name, flag=0, method=None, garbage=False):
+        """Üyenin yerel ve merkezi dizin başlıklarını yerinde bozar."""
+        data = bytearray(archive.getvalue())
+        info = zipfile.ZipFile(BytesIO(bytes(data))).getinfo(name)
+        local = info.header_offset
+        central = data.index(b"PK\x01\x02")
+        while data[central + 46 : central + 46 + len(name)] != name.encode():
+            central = data.index(b"PK\x01\x02", central + 4)
+        data[local + 6] |= flag
+        data[central + 8] |= flag
+        if method is not None:
+            data[local + 8] = data[central + 10] = method
+        if garbage:
+            start = local + 30 + len(info.filename) + len(info.extra)
+            data[start : start + info.compress_size] = b"\xff" * info.compress_size
+        return BytesIO(bytes(data))
+
+    def test_unreadable_entries_reported_per_row(self):
+        names = ["a.wav", "sifreli.wav", "yontem.wav", "bozuk.wav", "b.wav"]
+        manifest = "file,agent,queue,phone_number,call_date,call_id\n" + "".join(
+            f"{name},agent,Genel,5550000001,2024-05-01 10:00,\n" for name in names
+        )
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("manifest.csv", manifest)
+            for index, name in enumerate(names):
+                archive.writestr(name, make_wav(seconds=0.1 * (index + 1)))
+        archive = self._corrupt(buffer, "sifreli.wav", flag=0x1)
+        archive = self._corrupt(archive, "yontem.wav", method=99)
+        archive = self._corrupt(archive, "bozuk.wav", garbage=True)
+
+        result = ingest_archive(archive, self.expert)
+
+        statuses = [entry["status"] for entry in result.entries]
+        self.assertEqual(statuses, ["created", "error", "error", "error", "created"])
+        self.assertIn("encrypted", result.entries[1]["errors"]["file"][0])
+        # Başarısız satırlar depolamada sahipsiz dosya bırakmaz
+        self.assertEqual(AudioBlob.objects.count(), 2)
+        stored = [files for _dir, _dirs, files in os.walk(self.media_root)]
+        self.assertEqual(sum(map(len, stored)), 2)
+
+    def test_entry_size_counted_while_streaming(self):
+        archive = zipfile.ZipFile(self._archive("", ["a.wav"]))
+        info = archive.getinfo("a.wav")
+        # Başlıktaki boyut sınırın altında olsa da açılan bayt sayısı sayılır
+        with mock.patch("calls.ingest.MAX_ENTRY_SIZE", info.file_size - 1):
+            with self.assertRaises(ingest.EntrySizeError):
+                ingest._store(archive, info)
+        self.assertFalse(AudioBlob.objects.exists())
+
+    def test_broken_manifest_stores_nothing(self):
+        manifest = (
+            "file,agent,queue,phone_number,call_date,call_id\n"
+            "a.wav,agent,Genel,5550000001,2024-05-01 10:00,C-1\n"
+            # Bozuk bayt okuma tamponunun ötesine, sonraki parçalara düşsün
+            + "yok.wav,agent,Genel,5550000002,2024-05-01 10:00,\n" * 500
+        ).encode() + b"b.wav,agent,Genel,5550000003,\xff\xfe,C-3\n"
+        with self.assertRaises(ManifestError):
+            ingest_archive(self._archive(manifest, ["a.wav"]), self.expert)
+        self.assertFalse(CallRecord.objects.exists())
+        self.assertFalse(AudioBlob.objects.exists())
+
+    def test_missing_manifest(self):
+        with self.assertRaises(ManifestError):
+            ingest_archive(self._archive("", [], name="notes.txt"), self.expert)
+        with self.assertRaises(ManifestError):
+            ingest_archive(BytesIO(b"zip degil"), self.expert)
+
+
+class ResumableUploadTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=os.path.join(self.tmp, "media"),
+            UPLOAD_SESSION_DIR=os.path.join(self.tmp, "uploads"),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.expert = User.objects.create_user(username="expert", password="x")
+        self.agent = User.objects.create_user(username="agent", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+        self.data = b"RIFF" + bytes(range(256)) * 4
+
+    def _save(self, audio_file):
+        return CallRecord.objects.create(
+            uploaded_by=self.expert,
+            agent=self.agent,
+            call_queue=self.queue,
+            phone_number="5550000000",
+            audio_file=audio_file,
+            call_date=timezone.now(),
+        )
+
+    def test_chunks_resume_and_finalize(self):
+        session = uploads.create_session(self.expert, "uzun.wav", len(self.data))
+        session = uploads.append_chunk(session, 0, 500, BytesIO(self.data[:500]))
+        self.assertEqual(session.offset, 500)
+
+        # Yarıda kesilen parça yazılmamış sayılır
+        with self.assertRaises(uploads.UploadError):
+            uploads.append_chunk(session, 500, 300, BytesIO(self.data[500:600]))
+        with self.assertRaises(uploads.UploadConflict) as conflict:
+            uploads.append_chunk(session, 0, 500, BytesIO(self.data[:500]))
+        self.assertEqual(conflict.exception.offset, 500)
+        with self.assertRaises(uploads.UploadError):
+            uploads.finalize(session, self._save)
+
+        start, length, total = uploads.parse_content_range(
+            f"bytes 500-{len(self.data) - 1}/{len(self.data)}"
+        )
+        uploads.append_chunk(
+            session, start, length, BytesIO(self.data[500:]), total=total
+        )
+        record = uploads.finalize(session, self._save)
+        with record.audio_file.open("rb") as audio:
+            self.assertEqual(audio.read(), self.data)
+        self.assertFalse(os.path.exists(uploads.session_path(session)))
+        self.assertEqual(uploads.finalize(session, self._save), record)
+
+    def test_chunk_read_before_row_is_locked(self):
+        session = uploads.create_session(self.expert, "uzun.wav", len(self.data))
+        events = []
+        real_atomic = uploads.transaction.atomic
+
+        class SlowClient(BytesIO):
+            def read(self, size=-1):
+                events.append("read")
+                return super().read(size)
+
+        def atomic(*args, **kwargs):
+            events.append("lock")
+            return real_atomic(*args, **kwargs)
+
+        with mock.patch.object(uploads.transaction, "atomic", atomic):
+            uploads.append_chunk(session, 0, 500, SlowClient(self.data[:500]))
+        self.assertEqual(events[-1], "lock")
+        self.assertNotIn("lock", events[:-1])
+
+    def test_offset_rechecked_after_read(self):
+        session = uploads.create_session(self.expert, "uzun.wav", len(self.data))
+
+        class RacingClient(BytesIO):
+            def read(self, size=-1):
+                # Aynı parça başka bir istekle bu sırada eklendi
+                UploadSession.objects.filter(pk=session.pk).update(offset=500)
+                return super().read(size)
+
+        with self.assertRaises(uploads.UploadConflict):
+            uploads.append_chunk(session, 0, 500, RacingClient(self.data[:500]))
+        self.assertEqual(
+            os.listdir(os.path.dirname(uploads.session_path(session))),
+            [os.path.basename(uploads.session_path(session))],
+        )
+
+    def test_expired_session_not_finalized(self):
+        session = uploads.create_session(self.expert, "uzun.wav", len(self.data))
+        uploads.append_chunk(session, 0, len(self.data), BytesIO(self.data))
+        UploadSession.objects.filter(pk=session.pk).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        with self.assertRaisesMessage(uploads.UploadError, "süresi doldu"):
+            uploads.finalize(session, self._save)
+        self.assertFalse(CallRecord.objects.exists())
+
+    def test_validation_and_expiry(self):
+        with self.assertRaises(uploads.UploadError):
+            uploads.create_session(self.expert, "not.txt", 10)
+        with self.assertRaises(uploads.UploadError):
+            uploads.parse_content_range("bytes 10-5/100")
+
+        session = uploads.create_session(self.expert, "eski.mp3", 10)
+        path = uploads.session_path(session)
+        self.assertEqual(
+            uploads.collect_expired(now=timezone.now() + timedelta(days=2)),
+            1,
+        )
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(UploadSession.objects.exists())
+
+
+class CallAudioStreamingTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.expert = User.objects.create_superuser(username="expert", password="x")
+        self.agent = User.objects.create_user(username="agent", password="x")
+        self.other = User.objects.create_user(username="other", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+        self.data = bytes(range(256)) * 8
+        self.call = CallRecord.objects.create(
+            uploaded_by=self.expert,
+            agent=self.agent,
+            call_queue=self.queue,
+            phone_number="5550000000",
+            audio_file=ContentFile(self.data, name="ses.wav"),
+            call_date=timezone.now(),
+        )
+        self.url = reverse("calls:call_audio", args=[self.call.id])
+
+    def _body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_access_rules(self):
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(self.agent)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(self._body(response), self.data)
+
+    def test_range_and_if_range(self):
+        self.client.force_login(self.agent)
+        response = self.client.get(self.url, HTTP_RANGE="bytes=100-199")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 100-199/{len(self.data)}")
+        self.assertEqual(response["Content-Length"], "100")
+        self.assertEqual(self._body(response), self.data[100:200])
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-10")
+        self.assertEqual(self._body(response), self.data[-10:])
+
+        etag = response["ETag"]
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"eski"'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self._body(response)), len(self.data))
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=5000-")
+        self.assertEqual(response.status_code, 416)
+
+    @override_settings(AUDIO_ACCEL_REDIRECT_PREFIX="/protected-media/")
+    def test_accel_redirect(self):
+        self.client.force_login(self.agent)
+        response = self.client.get(self.url)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            f"/protected-media/{self.call.audio_file.name}",
+        )
+        self.assertEqual(response.content, b"")
+
+    @override_settings(AUDIO_ACCEL_REDIRECT_PREFIX="/protected-media/")
+    def test_derived_files_follow_access_rules(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call = CallRecord.objects.create(
+                uploaded_by=self.expert,
+                agent=self.agent,
+                call_queue=self.queue,
+                phone_number="5550000000",
+                audio_file=ContentFile(
+                    make_wav(rate=16000, channels=2), name="ses.wav"
+                ),
+                call_date=timezone.now(),
+            )
+        call.refresh_from_db()
+        self.assertTrue(call.preview and call.waveform)
+        files = {
+            "calls:call_preview": call.preview,
+            "calls:call_waveform": call.waveform,
+        }
+
+        for name, file in files.items():
+            url = reverse(name, args=[call.id])
+            self.client.force_login(self.other)
+            self.assertEqual(self.client.get(url).status_code, 403)
+            self.client.force_login(self.agent)
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response["X-Accel-Redirect"], f"/protected-media/{file.name}"
+            )
+
+
+class CallClipTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.agent = User.objects.create_user(username="agent", password="x")
+        self.other = User.objects.create_user(username="other", password="x")
+        self.data = make_wav(seconds=10, rate=8000, channels=2)
+        self.call = CallRecord.objects.create(
+            uploaded_by=self.agent,
+            agent=self.agent,
+            call_queue=CallQueue.objects.create(name="Genel"),
+            phone_number="5550000000",
+            audio_file=ContentFile(self.data, name="ses.wav"),
+            call_date=timezone.now(),
+        )
+        self.url = reverse("calls:call_clip", args=[self.call.id])
+
+    def test_clip_is_valid_wav_slice(self):
+        self.client.force_login(self.agent)
+        response = self.client.get(self.url, {"start": "2.5", "end": "4"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "audio/wav")
+        self.assertIn(
+            "call-%d-2.5-4.wav" % self.call.id, response["Content-Disposition"]
+        )
+
+        with wave.open(BytesIO(response.content), "rb") as clip:
+            self.assertEqual((clip.getnchannels(), clip.getframerate()), (2, 8000))
+            self.assertEqual(clip.getnframes(), 12000)
+            frames = clip.readframes(12000)
+        # 44 baytlık başlık + 2,5 s * 8000 * 4 bayt
+        self.assertEqual(frames, self.data[44 + 80000 : 44 + 128000])
+
+        # Kayıt sonunu aşan aralık kırpılır
+        response = self.client.get(self.url, {"start": "9", "end": "20"})
+        with wave.open(BytesIO(response.content), "rb") as clip:
+            self.assertEqual(clip.getnframes(), 8000)
+
+    def test_access_and_invalid_requests(self):
+        self.client.force_login(self.other)
+        response = self.client.get(self.url, {"start": "0", "end": "1"})
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(self.agent)
+        for params in ({"start": "x", "end": "1"}, {"start": "3", "end": "2"}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400)
+        with override_settings(AUDIO_CLIP_MAX_SECONDS=5):
+            response = self.client.get(self.url, {"start": "0", "end": "6"})
+            self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.url, {"start": "11", "end": "12"})
+        self.assertEqual(response.status_code, 400)
+
+        CallRecord.objects.filter(pk=self.call.pk).update(audio_file="")
+        response = self.client.get(self.url, {"start": "0", "end": "1"})
+        self.assertEqual(response.status_code, 404)
+
+
+class PreviewRenditionTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.expert = User.objects.create_superuser(username="expert", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+
+    def _call(self, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            call = CallRecord.objects.create(
+                uploaded_by=self.expert,
+                agent=self.expert,
+                call_queue=self.queue,
+                phone_number="5550000000",
+                audio_file=ContentFile(content, name="ses.wav"),
+                call_date=timezone.now(),
+            )
+        call.refresh_from_db()
+        return call
+
+    def _wav(self, signal, rate, channels):
+        pcm = (np.repeat(signal, channels) * 32767).astype("<i2")
+        buffer = BytesIO()
+        with wave.open(buffer, "wb") as out:
+            out.setnchannels(channels)
+            out.setsampwidth(2)
+            out.setframerate(rate)
+            out.writeframes(pcm.tobytes())
+        return buffer.getvalue()
+
+    def test_preview_is_filtered_8khz_mono(self):
+        t = np.arange(44100 * 2) / 44100
+        # 6 kHz bileşen 8 kHz'de 2 kHz'e katlanırdı; süzgeç bastırmalı
+        signal = 0.4 * np.sin(2 * np.pi * 440 * t) + 0.4 * np.sin(2 * np.pi * 6000 * t)
+        call = self._call(self._wav(signal, 44100, 2))
+
+        self.assertEqual(
+            call.preview.name,
+            call.audio_file.name.replace(".wav", renditions.PREVIEW_SUFFIX),
+        )
+        self.assertLess(call.preview.size * 10, call.audio_file.size)
+        with wave.open(call.preview.path, "rb") as preview:
+            self.assertEqual(
+                (preview.getframerate(), preview.getnchannels()), (8000, 1)
+            )
+            self.assertAlmostEqual(preview.getnframes(), 16000, delta=2)
+            samples = np.frombuffer(preview.readframes(16000), dtype="<i2") / 32767
+        spectrum = np.abs(np.fft.rfft(samples))
+        freqs = np.fft.rfftfreq(len(samples), 1 / 8000)
+        tone = spectrum[np.argmin(np.abs(freqs - 440))]
+        alias = spectrum[np.argmin(np.abs(freqs - 2000))]
+        self.assertLess(alias, tone * 0.05)
+
+        self.client.force_login(self.expert)
+        response = self.client.get(reverse("calls:call_preview", args=[call.id]))
+        self.assertEqual(response["Content-Type"], "audio/wav")
+
+        preview_path = call.preview.path
+        with self.captureOnCommitCallbacks(execute=True):
+            call.delete()
+        self.assertFalse(os.path.exists(preview_path))
+
+    def test_narrowband_recording_uses_original(self):
+        call = self._call(make_wav(seconds=1, rate=8000))
+        self.assertFalse(call.preview)
+        self.client.force_login(self.expert)
+        response = self.client.get(reverse("calls:call_preview", args=[call.id]))
+        self.assertEqual(response.status_code, 404)
+
+
+class WaveformTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.expert = User.objects.create_superuser(username="expert", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+
+    def _call(self, content, name="ses.wav"):
+        with self.captureOnCommitCallbacks(execute=True):
+            call = CallRecord.objects.create(
+                uploaded_by=self.expert,
+                agent=self.expert,
+                call_queue=self.queue,
+                phone_number="5550000000",
+                audio_file=ContentFile(content, name=name),
+                call_date=timezone.now(),
+            )
+        call.refresh_from_db()
+        return call
+
+    def test_peaks_generated_on_ingest(self):
+        call = self._call(make_wav(seconds=2.5, channels=2))
+        self.assertTrue(call.waveform)
+
+        with call.waveform.open("rb") as sidecar:
+            sample_rate, frames, levels = waveforms.decode(sidecar.read())
+        self.assertEqual((sample_rate, frames), (8000, 20000))
+        self.assertEqual(len(levels), waveforms.LEVELS)
+        spb, peaks = levels[0]
+        self.assertEqual((spb, len(peaks)), (80, 250))
+        self.assertAlmostEqual(int(peaks[:, 1].max()), 64, delta=1)
+        self.assertAlmostEqual(int(peaks[:, 0].min()), -64, delta=1)
+        self.assertEqual(levels[1][1].shape, (63, 2))
+        self.assertEqual(levels[1][1][0, 1], peaks[:4, 1].max())
+
+    def test_endpoint_and_backfill(self):
+        call = self._call(b"bozuk", name="bozuk.mp3")
+        self.assertFalse(call.waveform)
+
+        good = self._call(make_wav())
+        CallRecord.objects.filter(pk=good.pk).update(waveform="")
+        out = StringIO()
+        call_command("generate_waveforms", stdout=out)
+        self.assertIn("1 dalga formu üretildi, 1 kayıt çözülemedi", out.getvalue())
+        good.refresh_from_db()
+        self.assertTrue(good.waveform)
+
+        self.client.force_login(self.expert)
+        response = self.client.get(reverse("calls:call_waveform", args=[good.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("max-age", response["Cache-Control"])
+        self.assertEqual(b"".join(response.streaming_content)[:4], waveforms.MAGIC)
+
+    def test_sidecar_shared_and_released_with_blob(self):
+        content = make_wav()
+        first = self._call(content)
+        second = self._call(content)
+        self.assertEqual(first.waveform.name, second.waveform.name)
+        self.assertEqual(
+            first.waveform.name,
+            derived_name(first.audio_file.name, waveforms.WAVEFORM_SUFFIX),
+        )
+        path = first.waveform.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(os.path.exists(path))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(os.path.exists(path))
+
+
+def _box(box_type, body=b""):
+    return struct.pack(">I", 8 + len(body)) + box_type + body
+
+
+class AudioProbeTest(TestCase):
+    def _probe(self, data, chunk_size=7):
+        probe = AudioProbe()
+        for i in range(0, len(data), chunk_size):
+            probe.update(data[i : i + chunk_size])
+        return probe.result()
+
+    def test_wav_header(self):
+        data = make_wav(seconds=1.5, rate=8000, channels=2)
+        info = self._probe(data)
+        self.assertEqual(
+            (info.format, info.duration, info.sample_rate, info.channels),
+            ("wav", 1.5, 8000, 2),
+        )
+        self.assertEqual(info.sha256, hashlib.sha256(data).hexdigest())
+
+    def test_mp3_with_id3_and_xing(self):
+        frame = b"\xff\xfb\x90\x00" + bytes(32) + b"Xing" + struct.pack(">II", 1, 100)
+        tag = b"ID3\x04\x00\x00" + bytes([0, 0, 0, 100]) + bytes(100)
+        info = self._probe(tag + frame + bytes(400))
+        self.assertEqual(
+            (info.format, info.sample_rate, info.channels), ("mp3", 44100, 2)
+        )
+        self.assertEqual(info.duration, round(100 * 1152 / 44100, 3))
+
+    def test_m4a_moov_after_mdat(self):
+        mvhd = _box(b"mvhd", bytes(12) + struct.pack(">II", 1000, 61500) + bytes(80))
+        entry = (
+            struct.pack(">I", 36)
+            + b"mp4a"
+            + bytes(16)
+            + struct.pack(">HH", 1, 16)
+            + bytes(4)
+            + struct.pack(">I", 16000 << 16)
+        )
+        stsd = _box(b"stsd", struct.pack(">II", 0, 1) + entry)
+        trak = _box(b"trak", _box(b"mdia", _box(b"minf", _box(b"stbl", stsd))))
+        data = (
+            _box(b"ftyp", b"M4A " + bytes(4))
+            + _box(b"mdat", bytes(100000))
+            + _box(b"moov", mvhd + trak)
+        )
+        info = self._probe(data, chunk_size=4096)
+        self.assertEqual(
+            (info.format, info.duration, info.sample_rate, info.channels),
+            ("m4a", 61.5, 16000, 1),
+        )
+
+    def test_unknown_content_rejected(self):
+        with self.assertRaises(AudioFormatError):
+            self._probe(b"<html>ses degil</html>")
+        with self.assertRaises(ValidationError):
+            validate_audio_file(ContentFile(b"MZ\x90\x00" * 10, name="x.wav"))
+
+    def test_upload_handler_fills_call_columns(self):
+        data = make_wav(seconds=2, rate=16000)
+        handler = AudioUploadHandler(RequestFactory().post("/"))
+        handler.new_file("audio_file", "ses.wav", "audio/wav", len(data))
+        for i in range(0, len(data), 1000):
+            handler.receive_data_chunk(data[i : i + 1000], i)
+        uploaded = handler.file_complete(len(data))
+        self.assertEqual(uploaded.audio_info.duration, 2.0)
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        user = User.objects.create_user(username="agent", password="x")
+        with override_settings(MEDIA_ROOT=media_root):
+            call = CallRecord.objects.create(
+                uploaded_by=user,
+                agent=user,
+                call_queue=CallQueue.objects.create(name="Genel"),
+                phone_number="5550000000",
+                audio_file=uploaded,
+                call_date=timezone.now(),
+            )
+        uploaded.close()
+        call.refresh_from_db()
+        self.assertEqual(call.sha256, hashlib.sha256(data).hexdigest())
+        self.assertEqual(
+            (call.audio_format, call.duration_seconds, call.sample_rate, call.channels),
+            ("wav", 2.0, 16000, 1),
+        )
+
+
+class ContentAddressedStorageTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username="agent", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+
+    def _call(self, audio_file):
+        with self.captureOnCommitCallbacks(execute=True):
+            return CallRecord.objects.create(
+                uploaded_by=self.user,
+                agent=self.user,
+                call_queue=self.queue,
+                phone_number="5550000000",
+                audio_file=audio_file,
+                call_date=timezone.now(),
+            )
+
+    def test_duplicate_content_shares_one_blob(self):
+        data = make_wav()
+        digest = hashlib.sha256(data).hexdigest()
+        first = self._call(ContentFile(data, name="bir.wav"))
+        second = self._call(ContentFile(data, name="iki.WAV"))
+
+        expected = f"call_records/{digest[:2]}/{digest[2:4]}/{digest}.wav"
+        self.assertEqual(first.audio_file.name, expected)
+        self.assertEqual(second.audio_file.name, expected)
+        self.assertEqual(AudioBlob.objects.get(name=expected).ref_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(os.path.exists(second.audio_file.path))
+        self.assertEqual(AudioBlob.objects.get(name=expected).ref_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(os.path.exists(second.audio_file.path))
+        self.assertFalse(AudioBlob.objects.exists())
+
+    def test_unprobed_content_is_staged_and_hashed(self):
+        storage = CallRecord.audio_file.field.storage
+        name = storage.save("call_records/notlar.mp3", BytesIO(b"ses degil"))
+        digest = hashlib.sha256(b"ses degil").hexdigest()
+        self.assertTrue(name.endswith(f"{digest[:2]}/{digest[2:4]}/{digest}.mp3"))
+        self.assertEqual(os.listdir(storage.path(".staging")), [])
+
+    def test_migrate_legacy_files(self):
+        data = make_wav()
+        legacy = os.path.join(self.media_root, "call_records")
+        os.makedirs(legacy)
+        calls = []
+        for name in ("eski1.wav", "eski2.wav"):
+            with open(os.path.join(legacy, name), "wb") as out:
+                out.write(data)
+            call = self._call(ContentFile(data, name="yeni.wav"))
+            CallRecord.objects.filter(pk=call.pk).update(
+                audio_file=f"call_records/{name}"
+            )
+            calls.append(call)
+
+        out = StringIO()
+        call_command("migrate_audio_storage", "--workers", "1", stdout=out)
+        self.assertIn("2 dosya taşındı, 0 atlandı", out.getvalue())
+        names = set(
+            CallRecord.objects.filter(pk__in=[c.pk for c in calls]).values_list(
+                "audio_file", flat=True
+            )
+        )
+        self.assertEqual(len(names), 1)
+        self.assertTrue(is_blob_name(names.pop()))
+        self.assertEqual(AudioBlob.objects.get().ref_count, 4)
+        self.assertFalse(os.path.exists(os.path.join(legacy, "eski1.wav")))
+
+        out = StringIO()
+        call_command("migrate_audio_storage", "--workers", "1", stdout=out)
+        self.assertIn("0 dosya taşındı", out.getvalue())
+
+
+class AcousticMetricsTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username="agent", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+
+    def _stereo(self, rate=8000):
+        # 1 sn sol kanal, 1 sn sağ kanal (yarısı kırpılmış), 2 sn sessizlik
+        tone = np.sin(np.arange(rate) * 2 * np.pi * 440 / rate) * 0.5
+        left = np.concatenate([tone, np.zeros(3 * rate)])
+        right = np.concatenate([np.zeros(rate), tone, np.zeros(2 * rate)])
+        right[rate : rate + rate // 2] = 1.0
+        pcm = (np.stack([left, right], axis=1) * 32767).astype("<i2")
+        buffer = BytesIO()
+        with wave.open(buffer, "wb") as out:
+            out.setnchannels(2)
+            out.setsampwidth(2)
+            out.setframerate(rate)
+            out.writeframes(pcm.tobytes())
+        return buffer.getvalue()
+
+    def _call(self, content, name="ses.wav"):
+        return CallRecord.objects.create(
+            uploaded_by=self.user,
+            agent=self.user,
+            call_queue=self.queue,
+            phone_number="5550000000",
+            audio_file=ContentFile(content, name=name),
+            call_date=timezone.now(),
+        )
+
+    def test_metrics(self):
+        path = os.path.join(self.media_root, "ses.wav")
+        with open(path, "wb") as out:
+            out.write(self._stereo())
+        _path, metrics = acoustics.analyze_file(path)
+        self.assertEqual(metrics["duration_seconds"], 4.0)
+        self.assertAlmostEqual(metrics["silence_ratio"], 0.5, places=2)
+        self.assertAlmostEqual(metrics["longest_silence_seconds"], 2.0, places=1)
+        self.assertAlmostEqual(metrics["clipping_ratio"], 4000 / 64000, places=3)
+        self.assertEqual(len(metrics["talk_ratios"]), 2)
+        self.assertAlmostEqual(metrics["talk_ratios"][0], 0.25, places=2)
+        self.assertAlmostEqual(metrics["talk_ratios"][1], 0.25, places=2)
+
+        mono = os.path.join(self.media_root, "mono.wav")
+        with open(mono, "wb") as out:
+            out.write(make_wav(seconds=1))
+        _path, metrics = acoustics.analyze_file(mono)
+        self.assertIsNone(metrics["talk_ratios"])
+        self.assertEqual(metrics["silence_ratio"], 0)
+        self.assertAlmostEqual(metrics["rms_dbfs"], -9.03, places=1)
+
+    def test_command_stores_metrics(self):
+        call = self._call(self._stereo())
+        broken = self._call(b"bozuk", name="bozuk.mp3")
+
+        out = StringIO()
+        call_command("analyze_calls", "--workers", "1", stdout=out)
+        self.assertIn("1 kayıt analiz edildi, 1 kayıt çözülemedi", out.getvalue())
+        self.assertAlmostEqual(call.acoustic_metrics.silence_ratio, 0.5, places=2)
+        self.assertFalse(CallAcousticMetrics.objects.filter(call=broken).exists())
+
+        CallAcousticMetrics.objects.filter(call=call).update(silence_ratio=0)
+        call_command("analyze_calls", "--workers", "1", "--force", stdout=StringIO())
+        call.acoustic_metrics.refresh_from_db()
+        self.assertAlmostEqual(call.acoustic_metrics.silence_ratio, 0.5, places=2)
+
+    def test_calls_sharing_a_blob_each_get_metrics(self):
+        first = self._call(self._stereo(), name="bir.wav")
+        second = self._call(self._stereo(), name="iki.wav")
+        self.assertEqual(first.audio_file.name, second.audio_file.name)
+
+        analyzed, failed, _elapsed = acoustics.analyze_calls(workers=1)
+        self.assertEqual((analyzed, failed), (2, 0))
+        self.assertEqual(
+            CallAcousticMetrics.objects.filter(call__in=[first, second]).count(), 2
+        )
+
+
+class CallProcessingTaskTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username="agent", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+
+    def _call(self, content, name="ses.wav"):
+        with self.captureOnCommitCallbacks(execute=True):
+            call = CallRecord.objects.create(
+                uploaded_by=self.user,
+                agent=self.user,
+                call_queue=self.queue,
+                phone_number="5550000000",
+                audio_file=ContentFile(content, name=name),
+                call_date=timezone.now(),
+            )
+        call.refresh_from_db()
+        return call
+
+    def test_pipeline_runs_after_commit(self):
+        call = self._call(make_wav(seconds=1, rate=16000, channels=2))
+        self.assertEqual(call.processing_status, "ready")
+        self.assertTrue(call.waveform)
+        self.assertTrue(call.preview)
+        self.assertTrue(CallAcousticMetrics.objects.filter(call=call).exists())
+
+    def test_metadata_extracted_when_missing(self):
+        call = self._call(make_wav(seconds=2))
+        CallRecord.objects.filter(pk=call.pk).update(
+            sha256="", duration_seconds=None, processing_status="pending"
+        )
+        out = StringIO()
+        call_command("process_pending_calls", stdout=out)
+        self.assertIn("1 çağrı kuyruğa alındı", out.getvalue())
+        call.refresh_from_db()
+        self.assertEqual(call.duration_seconds, 2.0)
+        self.assertEqual(call.sha256, call.audio_file.name.split("/")[-1][:64])
+        self.assertEqual(call.processing_status, "ready")
+
+    def test_checksum_mismatch_fails_without_retry(self):
+        call = self._call(make_wav())
+        with open(call.audio_file.path, "r+b") as stored:
+            stored.seek(100)
+            stored.write(b"\x01\x02")
+
+        result = tasks.process_call.apply(args=[call.pk])
+        self.assertIsInstance(result.result, tasks.ChecksumMismatch)
+        call.refresh_from_db()
+        self.assertEqual(call.processing_status, "failed")
+        self.assertIn("ChecksumMismatch", call.processing_error)
+
+    def test_transient_errors_are_retried(self):
+        call = self._call(make_wav())
+        CallAcousticMetrics.objects.filter(call=call).delete()
+        with mock.patch.object(
+            acoustics, "analyze_call", side_effect=[OSError("disk"), True]
+        ) as analyze:
+            tasks.process_call.apply(args=[call.pk])
+        self.assertEqual(analyze.call_count, 2)
+        call.refresh_from_db()
+        self.assertEqual(call.processing_status, "ready")
+
+
+class WorkQueueTest(TestCase):
+    def setUp(self):
+        self.agent = User.objects.create_user(username="agent", password="x")
+        self.expert1 = User.objects.create_user(username="expert1", password="x")
+        self.expert2 = User.objects.create_user(username="expert2", password="x")
+        self.sales = CallQueue.objects.create(name="Satış")
+        self.support = CallQueue.objects.create(name="Destek")
+        self.form = EvaluationForm.objects.create(
+            name="Form",
+            created_by=self.expert1,
+            fields={"field_1": {"label": "Empati", "type": "number", "max_score": 5}},
+        )
+
+    def _call(self, queue):
+        return CallRecord.objects.create(
+            uploaded_by=self.agent,
+            agent=self.agent,
+            call_queue=queue,
+            phone_number="5550000000",
+            audio_file="call_records/test.wav",
+            call_date=timezone.now(),
+        )
+
+    def test_claims_are_distinct_and_fair_across_queues(self):
+        sales = [self._call(self.sales) for _ in range(3)]
+        support = self._call(self.support)
+
+        first = workqueue.claim_next(self.expert1)
+        second = workqueue.claim_next(self.expert2)
+        self.assertEqual(first.call, sales[0])
+        # Satış kuyruğundan iş verildiği için sıra destek kuyruğunda
+        self.assertEqual(second.call, support)
+        # Kiralaması süren uzmana aynı iş döner
+        self.assertEqual(workqueue.claim_next(self.expert1).pk, first.pk)
+
+        expert3 = User.objects.create_user(username="expert3", password="x")
+        third = workqueue.claim_next(expert3)
+        self.assertEqual(third.call, sales[1])
+        self.assertEqual(
+            workqueue.claim_next(self.expert1, queue_ids=[self.support.pk]).pk,
+            first.pk,
+        )
+
+    def test_lease_expiry_release_and_completion(self):
+        call = self._call(self.sales)
+        other = self._call(self.sales)
+        task = workqueue.claim_next(self.expert1)
+        self.assertEqual(task.call, call)
+        self.assertEqual(workqueue.claim_next(self.expert2).call, other)
+
+        # Kiralama dolunca iş başka uzmana geçer; eski sahibi uzatamaz
+        EvaluationTask.objects.filter(pk=task.pk).update(
+            available_at=timezone.now() - timedelta(seconds=1)
+        )
+        workqueue.release(workqueue.current_task(self.expert2), self.expert2)
+        reclaimed = workqueue.claim_next(self.expert2)
+        self.assertEqual(reclaimed.call, call)
+        self.assertFalse(workqueue.renew(task, self.expert1))
+        self.assertTrue(workqueue.renew(reclaimed, self.expert2))
+
+        evaluation = Evaluation.objects.create(
+            call=call,
+            evaluator=self.expert2,
+            form=self.form,
+            scores={"field_1": {"score": 4}},
+            final_note="-",
+        )
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.available_at), ("done", None))
+        self.assertEqual(list(queries.pending_calls()), [other])
+
+        evaluation.delete()
+        task.refresh_from_db()
+        self.assertEqual(task.status, "pending")
+        self.assertEqual(workqueue.claim_next(self.expert1).call, call)
+
+    def test_build_work_queue(self):
+        call = self._call(self.sales)
+        EvaluationTask.objects.all().delete()
+        out = StringIO()
+        call_command("build_work_queue", stdout=out)
+        self.assertIn("1 çağrı kuyruğa eklendi", out.getvalue())
+        self.assertEqual(workqueue.claim_next(self.expert1).call, call)
+
+    def test_backfill_migration_queues_unevaluated_calls(self):
+        pending = self._call(self.sales)
+        evaluated = self._call(self.support)
+        Evaluation.objects.create(
+            call=evaluated,
+            evaluator=self.expert1,
+            form=self.form,
+            scores={"field_1": {"score": 4}},
+            final_note="-",
+        )
+        EvaluationTask.objects.all().delete()
+        migration = import_module("calls.migrations.0019_backfill_evaluation_tasks")
+        migration.backfill_tasks(django_apps, None)
+        self.assertEqual(list(queries.pending_calls()), [pending])
+
+
+@override_settings(EVALUATION_QUEUE_ON_UPLOAD=False)
+class SamplingTest(TestCase):
+    def setUp(self):
+        self.agents = [
+            User.objects.create_user(username=f"agent{i}", password="x")
+            for i in range(3)
+        ]
+        self.queues = [CallQueue.objects.create(name=f"Kuyruk {i}") for i in range(2)]
+        # Hafta içi 2. gün öğlen; örneklem haftası pazartesi başlar
+        self.monday = sampling.week_start(timezone.localdate() - timedelta(days=14))
+        noon = timezone.make_aware(
+            datetime.combine(self.monday, datetime.min.time())
+        ) + timedelta(days=1, hours=12)
+        self.calls = [
+            CallRecord(
+                uploaded_by=agent,
+                agent=agent,
+                call_queue=queue,
+                phone_number="5550000000",
+                audio_file="call_records/test.wav",
+                call_date=noon + timedelta(minutes=i),
+            )
+            for agent in self.agents
+            for queue in self.queues
+            for i in range(6)
+        ]
+        # Haftanın dışında kalan çağrı
+        self.calls.append(
+            CallRecord(
+                uploaded_by=self.agents[0],
+                agent=self.agents[0],
+                call_queue=self.queues[0],
+                phone_number="5550000000",
+                audio_file="call_records/test.wav",
+                call_date=noon + timedelta(days=7),
+            )
+        )
+        CallRecord.objects.bulk_create(self.calls)
+        self.assertFalse(EvaluationTask.objects.exists())
+
+    def test_stratified_and_reproducible(self):
+        first = sampling.sample_week(self.monday + timedelta(days=3), 2, seed=7)
+        self.assertEqual((first.run.strata, first.run.selected), (6, 12))
+        strata = Counter(
+            CallRecord.objects.filter(pk__in=first.calls).values_list(
+                "agent_id", "call_queue_id"
+            )
+        )
+        self.assertEqual(set(strata.values()), {2})
+        self.assertEqual(
+            set(
+                EvaluationTask.objects.filter(sampling_run=first.run).values_list(
+                    "call_id", flat=True
+                )
+            ),
+            set(first.calls),
+        )
+
+        EvaluationTask.objects.all().delete()
+        again = sampling.sample_week(self.monday, 2, seed=7)
+        self.assertEqual(again.calls, first.calls)
+        other = sampling.sample_week(self.monday, 2, seed=8)
+        self.assertNotEqual(other.calls, first.calls)
+
+    def test_small_strata_and_command(self):
+        result = sampling.sample_week(
+            self.monday, 10, seed=1, queue_ids=[self.queues[0].pk]
+        )
+        self.assertEqual((result.run.strata, result.run.selected), (3, 18))
+
+        out = StringIO()
+        call_command(
+            "sample_calls",
+            "--week",
+            str(self.monday),
+            "--per-stratum",
+            "1",
+            "--seed",
+            "3",
+            stdout=out,
+        )
+        self.assertIn("6 katmandan 6 çağrı seçildi", out.getvalue())
+        self.assertIn("tohum 3", out.getvalue())
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    DASHBOARD_CACHE_SECONDS=60,
+    DASHBOARD_STALE_SECONDS=600,
+)
+class DashboardOverviewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.agent = User.objects.create_user(username="agent", password="x")
+        self.expert = User.objects.create_user(username="expert", password="x")
+        self.queue = CallQueue.objects.create(name="Genel")
+        self.form = EvaluationForm.objects.create(
+            name="Form",
+            created_by=self.expert,
+            fields={"field_1": {"label": "Empati", "type": "number", "max_score": 10}},
+        )
+        self.call = CallRecord.objects.create(
+            uploaded_by=self.expert,
+            agent=self.agent,
+            call_queue=self.queue,
+            phone_number="5550000000",
+            audio_file="call_records/test.wav",
+            call_date=timezone.now(),
+        )
+
+    def _evaluate(self, score):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Evaluation.objects.create(
+                call=self.call,
+                evaluator=self.expert,
+                form=self.form,
+                scores={"field_1": {"score": score}},
+                final_note="-",
+            )
+
+    def test_single_query(self):
+        self._evaluate(8)
+        self._evaluate(4)
+        with self.assertNumQueries(1):
+            data = overview.compute_overview()
+        self.assertEqual(
+            (data["user_count"], data["call_count"], data["form_count"]), (2, 1, 1)
+        )
+        self.assertEqual(data["evaluation_count"], 2)
+        self.assertEqual(data["avg_score"], 60.0)
+        self.assertEqual(data["evals_chart"], [0] * 6 + [2])
+        self.assertEqual(len(data["evals_chart_labels"]), 7)
+
+    def test_cached_until_invalidated(self):
+        self.assertEqual(overview.get_overview()["evaluation_count"], 0)
+        with self.assertNumQueries(0):
+            overview.get_overview()
+
+        self._evaluate(8)
+        with self.assertNumQueries(1):
+            self.assertEqual(overview.get_overview()["evaluation_count"], 1)
+        with self.assertNumQueries(0):
+            overview.get_overview()
+
+    def test_stale_value_served_while_another_worker_refreshes(self):
+        overview.get_overview()
+        cache.add(overview.LOCK_KEY, "other-worker", overview.LOCK_SECONDS)
+        self._evaluate(8)
+        with self.assertNumQueries(0):
+            self.assertEqual(overview.get_overview()["evaluation_count"], 0)
+
+        cache.delete(overview.LOCK_KEY)
+        with self.assertNumQueries(1):
+            self.assertEqual(overview.get_overview()["evaluation_count"], 1)
+
+    def test_expired_entry_refreshed(self):
+        with override_settings(DASHBOARD_CACHE_SECONDS=0):
+            overview.get_overview()
+        with self.assertNumQueries(1):
+            overview.get_overview()
+
+    def test_call_delete_invalidates(self):
+        self.assertEqual(overview.get_overview()["call_count"], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.call.delete()
+        self.assertEqual(overview.get_overview()["call_count"], 0)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class CatalogTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.expert = User.objects.create_user(username="expert", password="x")
+        self.queue = CallQueue.objects.create(name="Satış")
+        self.form = EvaluationForm.objects.create(
+            name="Form",
+            created_by=self.expert,
+            fields={"field_1": {"label": "Empati", "type": "number", "max_score": 10}},
+        )
+        EvaluationForm.objects.create(
+            name="Eski Form", created_by=self.expert, fields={}, is_active=False
+        )
+
+    def test_lists_cached_until_changed(self):
+        catalog.warm()
+        with self.assertNumQueries(0):
+            self.assertEqual(catalog.active_forms(), [self.form])
+            self.assertEqual(catalog.call_queues(), [self.queue])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            genel = CallQueue.objects.create(name="Genel")
+        self.assertEqual(catalog.call_queues(), [genel, self.queue])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.form.is_active = False
+            self.form.save()
+        self.assertEqual(catalog.active_forms(), [])
+
+    def test_evaluate_uses_newest_active_form(self):
+        newer = EvaluationForm.objects.create(
+            name="Yeni Form", created_by=self.expert, fields={}
+        )
+        EvaluationForm.objects.filter(pk=self.form.pk).update(
+            created_at=newer.created_at - timedelta(days=1)
+        )
+        self.assertEqual(catalog.active_forms(), [newer, self.form])
+
+        admin = User.objects.create_superuser(username="admin", password="x")
+        call = CallRecord.objects.create(
+            uploaded_by=admin,
+            agent=self.expert,
+            call_queue=self.queue,
+            phone_number="5550000000",
+            audio_file="call_records/test.wav",
+            call_date=timezone.now(),
+        )
+        self.client.force_login(admin)
+        # base.html accounts URL'lerini ister; yalnızca bağlam sınanır
+        with mock.patch("calls.views.render", return_value=HttpResponse()) as render:
+            self.client.get(reverse("calls:call_evaluate", args=[call.pk]))
+        self.assertEqual(render.call_args.args[2]["evaluation_form"], newer)
+
+    def test_warm_compiles_scorers(self):
+        catalog.warm()
+        with mock.patch("calls.scoring.Scorer") as compile_scorer:
+            get_scorer(catalog.active_forms()[0])
+        compile_scorer.assert_not_called()
+
+
+class SlowQueryLogTest(TestCase):
+    def slow(self):
+        """Her sorgunun eşiği aştığı ve planının alındığı blok."""
+        return self.settings(SLOW_QUERY_MS=1e-6, SLOW_QUERY_EXPLAIN_RATE=1.0)
+
+    def _queue_lookup(self, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            list(CallQueue.objects.filter(name=name))
+
+    def _entry(self):
+        return SlowQuery.objects.get(sql__contains="calls_callqueue")
+
+    def test_fingerprint_ignores_literals_and_list_lengths(self):
+        first, normalized = slowqueries.fingerprint(
+            "SELECT * FROM t2 WHERE id IN (%s, %s) AND name = 'a' LIMIT 21"
+        )
+        second, _ = slowqueries.fingerprint(
+            "SELECT *  FROM t2 WHERE id IN (%s, %s, %s) AND name = 'b''c' LIMIT 5"
+        )
+        self.assertEqual(first, second)
+        self.assertEqual(
+            normalized, "SELECT * FROM t2 WHERE id IN (...) AND name = ? LIMIT ?"
+        )
+
+    def test_slow_query_logged_with_call_site(self):
+        with self.slow(), self.assertLogs("calls.slowqueries", "WARNING") as logs:
+            self._queue_lookup("Genel")
+        self.assertIn("calls/tests.py", logs.output[0])
+        entry = self._entry()
+        self.assertIn("_queue_lookup", entry.call_site)
+        self.assertEqual(entry.calls, 1)
+        # SQLite: EXPLAIN QUERY PLAN
+        self.assertIn("calls_callqueue", entry.explain)
+        self.assertIsNotNone(entry.explained_at)
+
+    def test_same_fingerprint_accumulates(self):
+        with self.slow(), self.assertLogs("calls.slowqueries", "WARNING"):
+            self._queue_lookup("Genel")
+        first = self._entry()
+        with self.slow(), self.assertLogs("calls.slowqueries", "WARNING"):
+            self._queue_lookup("Satış")
+        second = self._entry()
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(second.calls, 2)
+        self.assertGreater(second.total_ms, first.total_ms)
+        self.assertGreaterEqual(second.max_ms, first.max_ms)
+
+    def test_writes_not_explained(self):
+        with self.slow(), self.assertLogs("calls.slowqueries", "WARNING"):
+            with self.captureOnCommitCallbacks(execute=True):
+                CallQueue.objects.create(name="Genel")
+        entry = SlowQuery.objects.get(sql__startswith="INSERT")
+        self.assertEqual(entry.explain, "")
+
+    def test_locking_selects_not_explained(self):
+        self.assertTrue(slowqueries.explainable("SELECT 1", False))
+        for sql in [
+            'SELECT "id" FROM t LIMIT 1 FOR UPDATE SKIP LOCKED',
+            'SELECT "id" FROM t FOR NO KEY UPDATE',
+            'SELECT "id" FROM t for share',
+        ]:
+            with self.subTest(sql=sql):
+                self.assertFalse(slowqueries.explainable(sql, False))
+        self.assertFalse(slowqueries.explainable("SELECT 1", True))
+
+    def test_analyze_only_when_enabled(self):
+        connection = mock.MagicMock(vendor="postgresql")
+        prefix = connection.ops.explain_query_prefix
+        prefix.return_value = "EXPLAIN"
+        slowqueries.explain(connection, "SELECT 1", None)
+        prefix.assert_called_with()
+        with self.settings(SLOW_QUERY_EXPLAIN_ANALYZE=True):
+            slowqueries.explain(connection, "SELECT 1", None)
+        prefix.assert_called_with(analyze=True, buffers=True)
+
+    def test_rolled_back_queries_not_recorded(self):
+        with self.slow(), self.assertLogs("calls.slowqueries", "WARNING"):
+            with self.captureOnCommitCallbacks() as callbacks:
+                list(CallQueue.objects.all())
+        self.assertTrue(callbacks)
+        self.assertFalse(SlowQuery.objects.exists())
@@ -0,0 +1,35 @@
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+from .metrics import UPLOAD_RECEIVED_BYTES, UPLOAD_SIZE
+from .probe import AudioFormatError, AudioProbe
+
+
+class AudioUploadHandler(TemporaryFileUploadHandler):
+    """
+    Ses dosyalarını tek geçişte diske yazan yükleme işleyicisi.
+
+    Her parça geçici dosyaya yazılırken ``AudioProbe``a da verilir; dosya
+    tamamlandığında SHA-256 özeti, biçim, süre, örnekleme hızı ve kanal sayısı
+    ``audio_info`` olarak dosya nesnesine eklenir. Tanınmayan dosyalarda hata
+    ``audio_error`` olarak saklanır ve doğrulama sırasında raporlanır.
+    Varsayılan işleyicilerden önce çalışması için görünümde listenin başına
+    eklenmelidir.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.probe = AudioProbe()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.probe.update(raw_data)
+        UPLOAD_RECEIVED_BYTES.labels("multipart").inc(len(raw_data))
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        UPLOAD_SIZE.labels("multipart").observe(file_size)
+        try:
+            file.audio_info = self.probe.result()
+        except AudioFormatError as exc:
+            file.audio_error = exc
+        return file
@@ -0,0 +1,213 @@
+"""
+Devam ettirilebilir (parça parça) ses dosyası yükleme.
+
+İstemci önce bir oturum açar, ardından dosyayı ``Content-Range`` başlıklı PUT
+istekleriyle sırayla gönderir. Parçalar diskteki geçici dosyaya eklenir; bağlantı
+koparsa istemci oturumun ``offset`` değerini sorgulayıp kaldığı yerden devam
+eder. Son parçadan sonra oturum tamamlanır ve geçici dosya ``CallRecord`` olarak
+kaydedilir. Süresi dolan oturumlar ``cleanup_upload_sessions`` komutuyla silinir.
+"""
+
+import os
+import re
+import shutil
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .metrics import UPLOAD_RECEIVED_BYTES, UPLOAD_SIZE
+from .models import UploadSession
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a")
+COPY_BUFFER_SIZE = 1024 * 1024
+
+_CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+
+class UploadError(ValueError):
+    pass
+
+
+class UploadConflict(UploadError):
+    """Parça oturumun mevcut ``offset`` değerinden başlamıyor."""
+
+    def __init__(self, offset):
+        super().__init__(f"Parça {offset}. bayttan başlamalıdır.")
+        self.offset = offset
+
+
+def session_path(session):
+    return os.path.join(settings.UPLOAD_SESSION_DIR, f"{session.pk}.part")
+
+
+def _expiry():
+    return timezone.now() + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+
+
+def parse_content_range(value):
+    """``bytes 0-1048575/5242880`` başlığını (başlangıç, uzunluk, toplam)'a çevirir."""
+    match = _CONTENT_RANGE.match((value or "").strip())
+    if match is None:
+        raise UploadError("Geçerli bir Content-Range başlığı gönderin.")
+    start, end = int(match.group(1)), int(match.group(2))
+    total = None if match.group(3) == "*" else int(match.group(3))
+    if end < start:
+        raise UploadError("Geçerli bir Content-Range başlığı gönderin.")
+    return start, end - start + 1, total
+
+
+def create_session(user, filename, size, metadata=None):
+    filename = os.path.basename(filename or "")
+    if os.path.splitext(filename)[1].lower() not in AUDIO_EXTENSIONS:
+        raise UploadError("Sadece .mp3, .wav ve .m4a dosyaları yüklenebilir.")
+    if not isinstance(size, int) or size <= 0:
+        raise UploadError("Dosya boyutu pozitif bir tam sayı olmalıdır.")
+    if size > settings.UPLOAD_SESSION_MAX_SIZE:
+        raise UploadError("Dosya boyutu sınırı aşıldı.")
+
+    session = UploadSession.objects.create(
+        created_by=user,
+        filename=filename,
+        size=size,
+        metadata=metadata or {},
+        expires_at=_expiry(),
+    )
+    os.makedirs(settings.UPLOAD_SESSION_DIR, exist_ok=True)
+    open(session_path(session), "wb").close()
+    return session
+
+
+def _check(session, start, total):
+    if session.call_id is not None:
+        raise UploadError("Yükleme zaten tamamlandı.")
+    if session.expires_at <= timezone.now():
+        raise UploadError("Yükleme oturumunun süresi doldu.")
+    if total is not None and total != session.size:
+        raise UploadError("Toplam boyut oturumla uyuşmuyor.")
+    if start != session.offset:
+        raise UploadConflict(session.offset)
+
+
+def _receive(session, length, stream):
+    """``length`` baytı ayrı bir geçici parça dosyasına okur; yolunu döndürür."""
+    path = os.path.join(
+        settings.UPLOAD_SESSION_DIR, f"{session.pk}-{uuid.uuid4().hex}.chunk"
+    )
+    written = 0
+    try:
+        with open(path, "wb") as out:
+            while written < length:
+                data = stream.read(min(COPY_BUFFER_SIZE, length - written))
+                if not data:
+                    break
+                out.write(data)
+                written += len(data)
+    except BaseException:
+        _remove(path)
+        raise
+    if written != length:
+        _remove(path)
+        raise UploadError("Parça eksik alındı.")
+    return path
+
+
+def append_chunk(session, start, length, stream, total=None):
+    """
+    ``stream``den ``length`` baytı oturumun geçici dosyasına ekler. Parça tam
+    olarak mevcut ``offset``ten başlamalıdır; aksi halde ``UploadConflict``
+    yükseltilir. Eksik gelen parça yazılmamış sayılır.
+
+    Parça istemciden satır kilidi olmadan ayrı bir dosyaya okunur; yavaş bir
+    istemci transaction'ı açık tutmaz. Kilit yalnızca ``offset`` yeniden
+    denetlenip parça oturum dosyasına eklenirken alınır.
+    """
+    session = UploadSession.objects.get(pk=session.pk)
+    _check(session, start, total)
+    if start + length > session.size:
+        raise UploadError("Parça dosya boyutunu aşıyor.")
+
+    chunk = _receive(session, length, stream)
+    try:
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(pk=session.pk)
+            # Okuma sürerken başka bir istek aynı parçayı eklemiş olabilir
+            _check(session, start, total)
+            with open(session_path(session), "r+b") as out, open(chunk, "rb") as data:
+                # Önceki yarım kalmış bir yazmanın artıklarını temizle
+                out.truncate(session.offset)
+                out.seek(session.offset)
+                shutil.copyfileobj(data, out, COPY_BUFFER_SIZE)
+            session.offset += length
+            session.expires_at = _expiry()
+            session.save(update_fields=["offset", "expires_at"])
+    finally:
+        _remove(chunk)
+    UPLOAD_RECEIVED_BYTES.labels("resumable").inc(length)
+    return session
+
+
+def finalize(session, save):
+    """
+    Tamamlanan dosyayı ``save(file)`` çağrısıyla kaydeder. ``save`` doğrulamayı
+    yapar ve oluşturduğu ``CallRecord``u döndürür. Tekrar çağrılırsa aynı kayıt
+    döner.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if session.call_id is not None:
+            return session.call
+        # Süresi dolan oturumun dosyası temizlikte silinmiş olabilir
+        if session.expires_at <= timezone.now():
+            raise UploadError("Yükleme oturumunun süresi doldu.")
+        if session.offset != session.size:
+            raise UploadError(
+                f"Yükleme tamamlanmadı ({session.offset}/{session.size} bayt)."
+            )
+
+        path = session_path(session)
+        with open(path, "rb") as audio:
+            record = save(File(audio, name=session.filename))
+        session.call = record
+        session.save(update_fields=["call"])
+    UPLOAD_SIZE.labels("resumable").observe(session.size)
+    _remove(path)
+    return record
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def collect_expired(now=None):
+    """
+    Süresi dolan oturumları ve veritabanında karşılığı olmayan geçici dosyaları
+    siler. Silinen oturum sayısını döndürür.
+    """
+    now = now or timezone.now()
+    expired = UploadSession.objects.filter(expires_at__lte=now)
+    count = 0
+    for session in expired.iterator():
+        _remove(session_path(session))
+        count += 1
+    expired.delete()
+
+    if os.path.isdir(settings.UPLOAD_SESSION_DIR):
+        active = {
+            f"{pk}.part" for pk in UploadSession.objects.values_list("pk", flat=True)
+        }
+        cutoff = (now - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)).timestamp()
+        for entry in os.scandir(settings.UPLOAD_SESSION_DIR):
+            # .chunk: alınırken süreci ölen isteklerin parçaları
+            orphan = entry.name.endswith(".chunk") or (
+                entry.name.endswith(".part") and entry.name not in active
+            )
+            if orphan and entry.stat().st_mtime < cutoff:
+                _remove(entry.path)
+    return count
@@ -9,6 +9,10 @@ urlpatterns = [
     path("", views.call_list, name="call_list"),
     path("create/", views.call_create, name="call_create"),
     path("<int:call_id>/", views.call_detail, name="call_detail"),
+    path("<int:call_id>/audio/", views.call_audio, name="call_audio"),
+    path("<int:call_id>/preview/", views.call_preview, name="call_preview"),
+    path("<int:call_id>/clip/", views.call_clip, name="call_clip"),
+    path("<int:call_id>/waveform/", views.call_waveform, name="call_waveform"),
     path("<int:call_id>/edit/", views.call_edit, name="call_edit"),
     path("<int:call_id>/delete/", views.call_delete, name="call_delete"),
     # Call evaluation
@@ -19,6 +23,11 @@ urlpatterns = [
         views.evaluation_detail,
         name="evaluation_detail",
     ),
+    path(
+        "evaluations/export/",
+        views.evaluation_export,
+        name="evaluation_export",
+    ),
     # Reports and analytics
     path("reports/", views.reports, name="reports"),
     path("analytics/", views.analytics, name="analytics"),
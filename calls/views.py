@@ -3,8 +3,18 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
 from django.db.models import Q
-from django.http import HttpResponse, HttpResponseForbidden
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from . import catalog, clips, exports, queries, renditions, streaming, waveforms
+from .uploadhandlers import AudioUploadHandler
 
 try:
     from .forms import CallRecordForm, EvaluationCreateForm
@@ -14,7 +24,6 @@ try:
         CallQueue,
         CallRecord,
         Evaluation,
-        EvaluationForm,
     )
 except ImportError:
     # Fallback for missing models/forms
@@ -33,23 +42,35 @@ def call_list(request):
     return HttpResponse("Çağrı Listesi")
 
 
+def can_view_call(user, call):
+    """Yöneticiler, kalite uzmanları ve çağrının temsilcisi erişebilir."""
+    return (
+        user.is_superuser
+        or (hasattr(user, "is_admin") and user.is_admin())
+        or (hasattr(user, "is_expert") and user.is_expert())
+        or user.pk == call.agent_id
+    )
+
+
 @login_required
 def call_detail(request, call_id):
     """
     Çağrı kaydının detaylarını ve değerlendirmelerini gösterir.
     """
-    call = get_object_or_404(CallRecord, id=call_id)
+    call = get_object_or_404(
+        CallRecord.objects.select_related("agent", "uploaded_by", "call_queue"),
+        id=call_id,
+    )
 
     # Erişim kontrolü
-    if not (
-        request.user.is_admin()
-        or request.user.is_superuser
-        or request.user.is_expert()
-        or request.user == call.agent
-    ):
+    if not can_view_call(request.user, call):
         return HttpResponseForbidden("Bu sayfaya erişim izniniz yok.")
 
-    evaluations = Evaluation.objects.filter(call=call).order_by("-evaluated_at")
+    evaluations = (
+        Evaluation.objects.filter(call=call)
+        .select_related("evaluator")
+        .order_by("-evaluated_at")
+    )
 
     return render(
         request,
@@ -58,11 +79,92 @@ def call_detail(request, call_id):
     )
 
 
+@login_required
+def call_audio(request, call_id):
+    """
+    Çağrının ses dosyasını ``call_detail`` ile aynı erişim kurallarıyla sunar.
+    Oynatıcının ileri sarabilmesi için Range istekleri desteklenir.
+    """
+    call = get_object_or_404(CallRecord, id=call_id)
+    if not can_view_call(request.user, call):
+        return HttpResponseForbidden("Bu sayfaya erişim izniniz yok.")
+    if not call.audio_file:
+        raise Http404("Ses dosyası bulunamadı.")
+    return streaming.serve_file(request, call.audio_file)
+
+
+@login_required
+def call_preview(request, call_id):
+    """
+    Çağrının 8 kHz mono önizlemesini sunar; henüz yoksa üretir. Oynatıcı
+    varsayılan olarak bunu, istenirse orijinali çalar.
+    """
+    call = get_object_or_404(CallRecord, id=call_id)
+    if not can_view_call(request.user, call):
+        return HttpResponseForbidden("Bu sayfaya erişim izniniz yok.")
+    if not call.preview and not renditions.generate_preview(call):
+        raise Http404("Önizleme üretilemedi.")
+    return streaming.serve_file(request, call.preview, content_type="audio/wav")
+
+
+@login_required
+def call_clip(request, call_id):
+    """
+    WAV kaydının ``?start=&end=`` (saniye) aralığını ayrı bir WAV dosyası
+    olarak döndürür; erişim kuralları ``call_detail`` ile aynıdır.
+    """
+    call = get_object_or_404(CallRecord, id=call_id)
+    if not can_view_call(request.user, call):
+        return HttpResponseForbidden("Bu sayfaya erişim izniniz yok.")
+    if not call.audio_file:
+        raise Http404("Ses dosyası bulunamadı.")
+    try:
+        start, end = clips.parse_bounds(
+            request.GET.get("start"), request.GET.get("end")
+        )
+        data = clips.extract_clip(call.audio_file, start, end)
+    except clips.ClipError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    response = HttpResponse(data, content_type="audio/wav")
+    response["Content-Disposition"] = (
+        f'attachment; filename="call-{call.id}-{start:g}-{end:g}.wav"'
+    )
+    return response
+
+
+@login_required
+def call_waveform(request, call_id):
+    """
+    Çağrının dalga formu yan dosyasını döndürür; yoksa üretir. Dosya içeriği
+    ses dosyasıyla birlikte değişmediğinden tarayıcıda önbelleğe alınır.
+    """
+    call = get_object_or_404(CallRecord, id=call_id)
+    if not can_view_call(request.user, call):
+        return HttpResponseForbidden("Bu sayfaya erişim izniniz yok.")
+    if not call.waveform and not waveforms.generate_waveform(call):
+        raise Http404("Dalga formu üretilemedi.")
+    response = streaming.serve_file(
+        request, call.waveform, content_type="application/octet-stream"
+    )
+    response["Cache-Control"] = "private, max-age=86400"
+    return response
+
+
+@csrf_exempt
 @login_required
 def call_upload(request):
     """
     Yeni çağrı kaydı yükleme sayfası.
     """
+    # Yükleme işleyicisi gövde okunmadan önce eklenmeli; CSRF kontrolü bu
+    # yüzden işleyici eklendikten sonra yapılır
+    request.upload_handlers.insert(0, AudioUploadHandler(request))
+    return _call_upload(request)
+
+
+@csrf_protect
+def _call_upload(request):
     if not (
         request.user.is_admin() or request.user.is_superuser or request.user.is_expert()
     ):
@@ -90,8 +192,11 @@ def evaluate(request, call_id):
     """
     Çağrı değerlendirme sayfası.
     """
+    user = request.user
     if not (
-        request.user.is_admin() or request.user.is_superuser or request.user.is_expert()
+        user.is_superuser
+        or (hasattr(user, "is_admin") and user.is_admin())
+        or (hasattr(user, "is_expert") and user.is_expert())
     ):
         messages.error(request, "Bu sayfaya erişim izniniz yok.")
         return redirect("calls:call_list")
@@ -99,7 +204,7 @@ def evaluate(request, call_id):
     call = get_object_or_404(CallRecord, id=call_id)
 
     # Değerlendirme formunu seç
-    evaluation_form = EvaluationForm.objects.first()
+    evaluation_form = next(iter(catalog.active_forms()), None)
 
     if not evaluation_form:
         messages.error(
@@ -108,9 +213,10 @@ def evaluate(request, call_id):
         return redirect("calls:call_list")
 
     # Mevcut değerlendirme kontrolü
-    existing_evaluation = None
-    if Evaluation.objects.filter(call=call).exists():
-        existing_evaluation = Evaluation.objects.filter(call=call).first()
+    existing_evaluation = (
+        Evaluation.objects.filter(call=call).select_related("evaluator").first()
+    )
+    if existing_evaluation:
         messages.info(
             request,
             "Bu çağrı daha önce değerlendirilmiş. Değerlendirme detaylarını görebilirsiniz.",
@@ -134,14 +240,18 @@ def evaluation_detail(request, evaluation_id):
     """
     Değerlendirme detaylarını gösterir.
     """
-    evaluation = get_object_or_404(Evaluation, id=evaluation_id)
+    evaluation = get_object_or_404(
+        Evaluation.objects.select_related("evaluator", "call__agent"),
+        id=evaluation_id,
+    )
 
     # Erişim kontrolü
+    user = request.user
     if not (
-        request.user.is_admin()
-        or request.user.is_superuser
-        or request.user == evaluation.evaluator
-        or request.user == evaluation.call.agent
+        user.is_superuser
+        or (hasattr(user, "is_admin") and user.is_admin())
+        or user.pk == evaluation.evaluator_id
+        or user.pk == evaluation.call.agent_id
     ):
         return HttpResponseForbidden("Bu sayfaya erişim izniniz yok.")
 
@@ -161,8 +271,10 @@ def my_evaluations(request):
         return HttpResponseForbidden("Bu sayfaya erişim izniniz yok.")
     from calls.models import Evaluation
 
-    evaluations = Evaluation.objects.filter(evaluator=request.user).order_by(
-        "-evaluated_at"
+    evaluations = (
+        Evaluation.objects.filter(evaluator=request.user)
+        .select_related("call__agent")
+        .order_by("-evaluated_at")
     )
     paginator = Paginator(evaluations, 20)
     page_number = request.GET.get("page")
@@ -205,6 +317,37 @@ def evaluation_list(request):
     return HttpResponse("Evaluation list view - placeholder")
 
 
+@login_required
+def evaluation_export(request):
+    """
+    Değerlendirmeleri çağrı, temsilci, kuyruk ve uzman bilgileriyle birlikte
+    CSV ya da NDJSON olarak akış halinde dışa aktarır. ``admin_reports`` ile
+    aynı filtreleri kabul eder.
+    """
+    if not (
+        request.user.is_superuser
+        or (hasattr(request.user, "is_admin") and request.user.is_admin())
+    ):
+        return HttpResponseForbidden("Bu sayfaya erişim izniniz yok.")
+
+    export_format = request.GET.get("format", "csv")
+    if export_format not in exports.FORMATS:
+        return HttpResponseBadRequest("Desteklenmeyen dışa aktarım biçimi.")
+
+    try:
+        filters = queries.report_filters(request.GET)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    stream, content_type = exports.FORMATS[export_format]
+    evaluations = queries.report_evaluations(**filters)
+    response = StreamingHttpResponse(stream(evaluations), content_type=content_type)
+    response["Content-Disposition"] = (
+        f'attachment; filename="degerlendirmeler.{export_format}"'
+    )
+    return response
+
+
 @login_required
 def reports(request):
     """Reports view"""
@@ -0,0 +1,161 @@
+"""
+Değerlendirme oynatıcısı için önceden hesaplanmış dalga formu tepe değerleri.
+
+Ses bir kez bloklar halinde okunur; en ince seviyede saniyede
+``BASE_BUCKETS_PER_SECOND`` kova için min/max değerleri NumPy ile vektörel
+olarak hesaplanır, daha kaba seviyeler bir öncekinin ``LEVEL_FACTOR`` kovası
+birleştirilerek üretilir. Değerler int8'e sıkıştırılıp ``CallRecord.waveform``
+alanında ikili bir yan dosya olarak saklanır. Yan dosya ses dosyasının yanında
+türetilmiş adla (``<özet>.peaks``) tutulur; aynı içerikli çağrılar onu paylaşır
+ve ses dosyası serbest kalınca depolama onu da siler.
+
+Dosya biçimi (little-endian)::
+
+    başlık:   "QHPK", sürüm (u8), seviye sayısı (u8), ayrılmış (u16),
+              örnekleme hızı (u32), örnek sayısı (u64)
+    seviyeler: her biri için kova başına örnek (u32), kova sayısı (u32)
+    veri:     her seviye için sırayla kova başına (min, max) int8 çiftleri
+"""
+
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from .audio import AudioDecodeError, PCMReader
+from .models import CallRecord
+from .storage import derived_name
+
+WAVEFORM_SUFFIX = ".peaks"
+MAGIC = b"QHPK"
+VERSION = 1
+BASE_BUCKETS_PER_SECOND = 100
+LEVEL_FACTOR = 4
+LEVELS = 4
+
+HEADER = struct.Struct("<4sBBHIQ")
+LEVEL = struct.Struct("<II")
+
+
+def _quantize(values):
+    return np.clip(np.round(values * 127), -127, 127).astype(np.int8)
+
+
+def compute_peaks(reader):
+    """
+    ``PCMReader``dan (örnekleme hızı, örnek sayısı, seviyeler) döndürür.
+    Seviyeler (kova başına örnek, (n, 2) int8 dizi) çiftleridir.
+    """
+    samples_per_bucket = max(1, reader.sample_rate // BASE_BUCKETS_PER_SECOND)
+    block_frames = samples_per_bucket * 1024
+    mins, maxs = [], []
+    remainder = np.empty(0, dtype=np.float32)
+    frames = 0
+
+    for block in reader.blocks(block_frames):
+        frames += len(block)
+        if len(remainder):
+            block = np.concatenate([remainder, block])
+        full = len(block) // samples_per_bucket * samples_per_bucket
+        buckets = block[:full].reshape(-1, samples_per_bucket)
+        mins.append(buckets.min(axis=1))
+        maxs.append(buckets.max(axis=1))
+        remainder = block[full:]
+    if len(remainder):
+        mins.append(remainder.min(keepdims=True))
+        maxs.append(remainder.max(keepdims=True))
+
+    if mins:
+        peaks = np.stack(
+            [_quantize(np.concatenate(mins)), _quantize(np.concatenate(maxs))], axis=1
+        )
+    else:
+        peaks = np.zeros((0, 2), dtype=np.int8)
+
+    levels = [(samples_per_bucket, peaks)]
+    for _ in range(LEVELS - 1):
+        if len(peaks) <= 1:
+            break
+        # Son grubu tamamlamak için kenar değerleri tekrarlanır
+        padded = np.pad(peaks, ((0, -len(peaks) % LEVEL_FACTOR), (0, 0)), mode="edge")
+        grouped = padded.reshape(-1, LEVEL_FACTOR, 2)
+        peaks = np.stack(
+            [grouped[:, :, 0].min(axis=1), grouped[:, :, 1].max(axis=1)], 1
+        )
+        samples_per_bucket *= LEVEL_FACTOR
+        levels.append((samples_per_bucket, peaks))
+    return reader.sample_rate, frames, levels
+
+
+def encode(sample_rate, frames, levels):
+    parts = [HEADER.pack(MAGIC, VERSION, len(levels), 0, sample_rate, frames)]
+    parts.extend(LEVEL.pack(spb, len(peaks)) for spb, peaks in levels)
+    parts.extend(np.ascontiguousarray(peaks).tobytes() for _spb, peaks in levels)
+    return b"".join(parts)
+
+
+def decode(data):
+    """Yan dosyayı (örnekleme hızı, örnek sayısı, seviyeler) olarak okur."""
+    magic, version, count, _reserved, sample_rate, frames = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Geçersiz dalga formu dosyası.")
+    offset = HEADER.size
+    shapes = []
+    for _ in range(count):
+        shapes.append(LEVEL.unpack_from(data, offset))
+        offset += LEVEL.size
+    levels = []
+    for spb, buckets in shapes:
+        peaks = np.frombuffer(data, dtype=np.int8, count=buckets * 2, offset=offset)
+        levels.append((spb, peaks.reshape(-1, 2)))
+        offset += buckets * 2
+    return sample_rate, frames, levels
+
+
+def generate_waveform(call, force=False):
+    """
+    Çağrının dalga formu dosyasını üretip kaydeder; diskte varsa yeniden
+    üretilmez (``force`` verilmedikçe). Ses çözülemezse False döner; yükleme
+    akışı bu yüzden kesilmez.
+    """
+    if not call.audio_file:
+        return False
+    storage = call.audio_file.storage
+    name = derived_name(call.audio_file.name, WAVEFORM_SUFFIX)
+
+    if force or not storage.exists(name):
+        try:
+            with PCMReader(call.audio_file) as reader:
+                data = encode(*compute_peaks(reader))
+        except (AudioDecodeError, OSError):
+            return False
+        path = storage.path(name)
+        # Yarım kalan dosya paylaşılan adda görünmesin diye yerine taşınır
+        fd, staged = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(data)
+            os.replace(staged, path)
+        except BaseException:
+            os.remove(staged)
+            raise
+
+    call.waveform.name = name
+    # save() sinyalleri tekrar tetiklemesin diye yalnızca sütun güncellenir
+    CallRecord.objects.filter(pk=call.pk).update(waveform=call.waveform.name)
+    return True
+
+
+def backfill_waveforms(force=False, batch_size=100):
+    """Dalga formu olmayan çağrılar için üretir; (üretilen, başarısız) döndürür."""
+    calls = CallRecord.objects.exclude(audio_file="").order_by("pk")
+    if not force:
+        calls = calls.filter(waveform="")
+    generated = failed = 0
+    for call in calls.iterator(chunk_size=batch_size):
+        if generate_waveform(call, force=force):
+            generated += 1
+        else:
+            failed += 1
+    return generated, failed
@@ -0,0 +1,169 @@
+"""
+Kalite uzmanları için değerlendirme iş kuyruğu.
+
+Her çağrı için bir ``EvaluationTask`` satırı tutulur. ``available_at`` işin
+alınabileceği andır: bekleyen işlerde kuyruğa girdiği an, üstlenilmiş işlerde
+kiralamanın (lease) bittiği an; tamamlanan işlerde boştur. Böylece "alınabilir
+en eski iş" tek bir ``(call_queue, available_at)`` indeks aramasıdır; süresi
+dolan kiralamalar için ayrıca temizlik gerekmez.
+
+``claim_next`` adayı ``SELECT ... FOR UPDATE SKIP LOCKED`` ile kilitler;
+eşzamanlı iki uzman aynı satırı beklemez, birbirinden farklı çağrılar alır.
+Kilit desteklemeyen veritabanlarında (SQLite) satır yine koşullu UPDATE ile
+alınır, iki uzman aynı işi alamaz. Kuyruklar arasında adalet için en uzun
+süredir iş verilmemiş kuyruk önce denenir.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Subquery
+from django.utils import timezone
+
+from .models import CallQueue, Evaluation, EvaluationTask
+
+
+def lease_duration():
+    return timedelta(minutes=settings.EVALUATION_LEASE_MINUTES)
+
+
+def available(now=None):
+    """Şu an alınabilecek işler (bekleyen ya da kiralaması dolmuş)."""
+    return EvaluationTask.objects.filter(available_at__lte=now or timezone.now())
+
+
+def enqueue_uploaded(calls):
+    """
+    Yüklenen çağrıları ``EVALUATION_QUEUE_ON_UPLOAD`` açıksa kuyruğa ekler;
+    kapalıysa kuyruğu yalnızca örnekleme (calls/sampling.py) doldurur.
+    """
+    if settings.EVALUATION_QUEUE_ON_UPLOAD:
+        enqueue_calls(calls)
+
+
+def enqueue_calls(calls):
+    """Çağrıları kuyruğa ekler; kuyrukta olanlar atlanır."""
+    enqueue_ids([(call.pk, call.call_queue_id) for call in calls])
+
+
+def enqueue_ids(pairs, sampling_run=None):
+    """``(çağrı id, kuyruk id)`` çiftlerini kuyruğa ekler."""
+    now = timezone.now()
+    EvaluationTask.objects.bulk_create(
+        [
+            EvaluationTask(
+                call_id=call_id,
+                call_queue_id=queue_id,
+                enqueued_at=now,
+                available_at=now,
+                sampling_run=sampling_run,
+            )
+            for call_id, queue_id in pairs
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def current_task(user, now=None):
+    """Uzmanın kiralaması sürmekte olan işi."""
+    return (
+        EvaluationTask.objects.filter(
+            claimed_by=user, status="claimed", available_at__gt=now or timezone.now()
+        )
+        .select_related("call")
+        .first()
+    )
+
+
+def _queues_by_fairness(now, queue_ids=None):
+    """Alınabilir işi olan kuyruklar, en uzun süredir iş verilmeyen önce."""
+    last_claimed = (
+        EvaluationTask.objects.filter(call_queue=OuterRef("pk"))
+        .exclude(claimed_at=None)
+        .order_by("-claimed_at")
+        .values("claimed_at")[:1]
+    )
+    queues = CallQueue.objects.filter(
+        Exists(available(now).filter(call_queue=OuterRef("pk")))
+    )
+    if queue_ids:
+        queues = queues.filter(pk__in=queue_ids)
+    return queues.annotate(last_claimed=Subquery(last_claimed)).order_by(
+        F("last_claimed").asc(nulls_first=True), "pk"
+    )
+
+
+def _take(task, user, now):
+    """İşi koşullu olarak üstlenir; başka biri önce aldıysa False döner."""
+    expires = now + lease_duration()
+    taken = EvaluationTask.objects.filter(
+        pk=task.pk, available_at=task.available_at
+    ).update(status="claimed", claimed_by=user, claimed_at=now, available_at=expires)
+    if taken:
+        task.status, task.claimed_by, task.claimed_at = "claimed", user, now
+        task.available_at = expires
+    return bool(taken)
+
+
+def claim_next(user, queue_ids=None):
+    """
+    Uzmana bir sonraki çağrıyı kiralar ve ``EvaluationTask`` döndürür; iş
+    yoksa None. Uzmanın süresi dolmamış bir kiralaması varsa o döner.
+    """
+    now = timezone.now()
+    task = current_task(user, now)
+    if task is not None:
+        return task
+
+    with transaction.atomic():
+        for queue in _queues_by_fairness(now, queue_ids):
+            task = (
+                available(now)
+                .filter(call_queue=queue)
+                .order_by("available_at")
+                .select_for_update(skip_locked=True)
+                .first()
+            )
+            if task is not None and _take(task, user, now):
+                return EvaluationTask.objects.select_related("call").get(pk=task.pk)
+    return None
+
+
+def renew(task, user):
+    """Kiralamayı uzatır; iş artık uzmanda değilse False döner."""
+    now = timezone.now()
+    return bool(
+        EvaluationTask.objects.filter(
+            pk=task.pk, claimed_by=user, status="claimed", available_at__gt=now
+        ).update(available_at=now + lease_duration())
+    )
+
+
+def release(task, user):
+    """İşi değerlendirmeden bırakır; iş kuyruktaki eski sırasına döner."""
+    return bool(
+        EvaluationTask.objects.filter(
+            pk=task.pk, claimed_by=user, status="claimed"
+        ).update(
+            status="pending",
+            claimed_by=None,
+            available_at=F("enqueued_at"),
+        )
+    )
+
+
+def complete_calls(call_ids):
+    """Değerlendirilen çağrıların işlerini kapatır."""
+    EvaluationTask.objects.filter(call_id__in=call_ids).update(
+        status="done", available_at=None
+    )
+
+
+def reopen_call(call_id):
+    """Son değerlendirmesi silinen çağrıyı yeniden kuyruğa alır."""
+    if not Evaluation.objects.filter(call_id=call_id).exists():
+        EvaluationTask.objects.filter(call_id=call_id, status="done").update(
+            status="pending", claimed_by=None, available_at=F("enqueued_at")
+        )
@@ -0,0 +1,40 @@
+"""
+Gunicorn ayarları.
+
+İşçiler ölçümlerini ``PROMETHEUS_MULTIPROC_DIR`` dizinine yazar ve
+``/metrics`` hangi işçiye düşerse düşsün tüm işçilerin toplamını döndürür
+(bkz. qualityhub/metrics.py). Uygulama işçilerde yüklendiğinden değişken
+burada ayarlanır; Celery işçileri gibi diğer süreçler etkilenmez. Dizin ana
+süreç başlarken boşaltılır, ölen işçilerin canlı (livesum) göstergeleri
+temizlenir.
+
+Her işçi istek almaya başlamadan önce ısındırılır (bkz. qualityhub/health.py).
+"""
+
+import os
+import shutil
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "3"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+wsgi_app = "qualityhub.wsgi:application"
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/qualityhub-prometheus")
+
+
+def on_starting(server):
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    from qualityhub.health import warmup
+
+    warmup()
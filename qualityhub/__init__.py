@@ -0,0 +1,4 @@
+# Django başlarken Celery uygulaması da yüklenir; @shared_task bunu kullanır
+from .celery import app as celery_app
+
+__all__ = ("celery_app",)
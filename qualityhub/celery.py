@@ -0,0 +1,16 @@
+"""
+Celery uygulaması. Görevler ``<uygulama>/tasks.py`` dosyalarından bulunur;
+ayarlar ``CELERY_`` önekiyle Django ayarlarından okunur.
+
+    celery -A qualityhub worker -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "qualityhub.settings")
+
+app = Celery("qualityhub")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
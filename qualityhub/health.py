@@ -0,0 +1,124 @@
+"""
+Sağlık uç noktaları ve işçi ısındırma.
+
+``/health/`` (canlılık) yalnızca sürecin istek yanıtlayabildiğini gösterir;
+veritabanına ya da önbelleğe dokunmaz, bu yüzden bağımlılıklardaki bir
+kesinti konteynerin yeniden başlatılmasına yol açmaz.
+
+``/health/ready/`` (hazırlık) işçi ısınmışsa veritabanı, önbellek ve medya
+deposunu sırayla yoklar; hepsi ``HEALTH_CHECK_TIMEOUT`` içinde yanıt verirse
+200, aksi halde 503 döner. Gövde her denetimin süresini ve sonucunu içerir;
+hata ayrıntısı yalnızca günlüğe yazılır.
+
+``warmup`` Gunicorn işçisi istek almaya başlamadan önce çalışır (bkz.
+gunicorn.conf.py): veritabanı bağlantılarını açar, aktif değerlendirme
+formlarını ve çağrı kuyruklarını önbelleğe yükler (bkz. calls/catalog.py).
+Isındırma yapılmamış süreçlerde (ör. ``runserver``) ilk hazırlık isteği
+ısındırmayı kendisi yapar.
+"""
+
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+
+logger = logging.getLogger(__name__)
+
+PROBE_KEY = "health:probe"
+
+_warm = False
+_warm_lock = threading.Lock()
+
+
+def warmup():
+    """Süreci ilk isteklere hazırlar; hata olursa süreç ısınmamış sayılır."""
+    global _warm
+    from calls import catalog
+
+    with _warm_lock:
+        if _warm:
+            return True
+        started = time.perf_counter()
+        try:
+            for connection in connections.all():
+                connection.ensure_connection()
+            catalog.warm()
+        except Exception:
+            logger.exception("Isındırma başarısız.")
+            return False
+        _warm = True
+    logger.info("warmup_ms=%.1f", (time.perf_counter() - started) * 1000)
+    return True
+
+
+def check_database():
+    timeout_ms = int(settings.HEALTH_CHECK_TIMEOUT * 1000)
+    for connection in connections.all():
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET LOCAL statement_timeout = %s", [timeout_ms])
+            cursor.execute("SELECT 1")
+
+
+def check_cache():
+    token = uuid.uuid4().hex
+    cache.set(PROBE_KEY, token, 10)
+    # DummyCache hiçbir şey saklamaz; yazma hatasız bitmişse yeterlidir
+    value = cache.get(PROBE_KEY)
+    if value is not None and value != token:
+        raise RuntimeError("Önbellekten okunan değer yazılanla aynı değil.")
+
+
+def check_storage():
+    from calls.storage import get_audio_storage
+
+    get_audio_storage().exists(PROBE_KEY)
+
+
+CHECKS = {
+    "database": check_database,
+    "cache": check_cache,
+    "storage": check_storage,
+}
+
+
+def run_checks():
+    """Denetim adı -> {"ok", "ms"}; süre sınırını aşan denetim başarısızdır."""
+    results = {}
+    for name, check in CHECKS.items():
+        started = time.perf_counter()
+        try:
+            check()
+            ok = True
+        except Exception:
+            logger.exception("Hazırlık denetimi başarısız: %s", name)
+            ok = False
+        elapsed = time.perf_counter() - started
+        if ok and elapsed > settings.HEALTH_CHECK_TIMEOUT:
+            logger.warning("Hazırlık denetimi yavaş: %s %.1f ms", name, elapsed * 1000)
+            ok = False
+        results[name] = {"ok": ok, "ms": round(elapsed * 1000, 1)}
+    return results
+
+
+@never_cache
+def liveness(request):
+    return JsonResponse({"status": "ok"})
+
+
+@never_cache
+def readiness(request):
+    if not warmup():
+        return JsonResponse({"status": "warming"}, status=503)
+    checks = run_checks()
+    ready = all(result["ok"] for result in checks.values())
+    return JsonResponse(
+        {"status": "ok" if ready else "unavailable", "checks": checks},
+        status=200 if ready else 503,
+    )
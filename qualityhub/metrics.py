@@ -0,0 +1,101 @@
+"""
+Prometheus ölçümleri ve ``/metrics`` uç noktası.
+
+``MetricsMiddleware`` her isteği URL adıyla (ör. ``calls:call_detail``,
+``api:calls-list``) etiketleyerek sayar ve süresini histograma ekler; p50/p95/
+p99 ``histogram_quantile`` ile hesaplanır. Etiket olarak yol değil URL adı
+kullanıldığından seri sayısı rota sayısıyla sınırlıdır. Yükleme ve
+değerlendirme ölçümleri ``calls.metrics`` içindedir.
+
+Gunicorn birden çok işçi süreciyle çalıştığında her süreç kendi
+sayaçlarını tutar. ``PROMETHEUS_MULTIPROC_DIR`` ortam değişkeni verilirse
+süreçler değerleri bu dizindeki dosyalara yazar ve ``/metrics`` hepsini
+toplayarak döndürür (bkz. ``gunicorn.conf.py``). Değişken yoksa yalnızca
+çalışan sürecin değerleri döner. Dizin, ``prometheus_client`` içe
+aktarılmadan önce ayarlanmış olmalıdır.
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+from .performance import view_name
+
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+REQUESTS = Counter(
+    "qualityhub_http_requests_total",
+    "HTTP istekleri",
+    ["view", "method", "status"],
+)
+LATENCY = Histogram(
+    "qualityhub_http_request_duration_seconds",
+    "HTTP isteklerinin süresi",
+    ["view", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+# Django bağlantı havuzu tutmaz; CONN_MAX_AGE ile açık kalan kalıcı
+# bağlantılar sayılır. Çok süreçli modda canlı süreçlerin toplamıdır
+DB_CONNECTIONS = Gauge(
+    "qualityhub_db_connections_open",
+    "Açık veritabanı bağlantıları",
+    ["alias"],
+    multiprocess_mode="livesum",
+)
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        name = view_name(request)
+        method = request.method if request.method in METHODS else "other"
+        LATENCY.labels(name, method).observe(elapsed)
+        REQUESTS.labels(name, method, response.status_code).inc()
+        for connection in connections.all(initialized_only=True):
+            DB_CONNECTIONS.labels(connection.alias).set(
+                0 if connection.connection is None else 1
+            )
+        return response
+
+
+def render_metrics():
+    """Ölçümleri Prometheus metin biçiminde döndürür."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=path)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+
+def metrics(request):
+    """
+    Prometheus'un kazıdığı uç nokta. ``METRICS_TOKEN`` ayarlıysa
+    ``Authorization: Bearer <token>`` başlığı gerekir.
+    """
+    token = settings.METRICS_TOKEN
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponseForbidden("Geçersiz ölçüm anahtarı.")
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
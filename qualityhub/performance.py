@@ -0,0 +1,178 @@
+"""
+İstek başına performans ölçümü.
+
+``ServerTimingMiddleware`` her istek için SQL sorgu sayısını ve süresini,
+şablon çizim süresini ve toplam süreyi ölçer. Değerler ``Server-Timing``
+başlığıyla (tarayıcının geliştirici araçlarında görünür) ve
+``qualityhub.performance`` günlüğüne logfmt satırı olarak yazılır.
+
+SQL süresi ``connection.execute_wrapper`` ile, şablon süresi bu modüldeki
+şablon motoru (``DjangoTemplates``) ile ölçülür. İkisi de istek dışında
+hiçbir iş yapmaz. Ölçüm maliyeti sorgu ve çizim başına iki
+``perf_counter`` çağrısı olduğundan üretimde açık bırakılabilir.
+
+``PERFORMANCE_PROFILE_RATE`` oranındaki istekler ayrıca cProfile ile
+çalıştırılır. ``PERFORMANCE_PROFILE_MIN_MS`` süresini aşanların profili
+``PERFORMANCE_PROFILE_DIR`` altına ``.pstats`` olarak yazılır ve en yavaş
+``PERFORMANCE_PROFILE_KEEP`` dosya saklanır; ``python -m pstats <dosya>``
+ile incelenebilir. Akış yanıtlarında gövdenin gönderilme süresi ölçüme
+dahil değildir.
+"""
+
+import cProfile
+import logging
+import os
+import random
+import time
+import uuid
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates as BaseDjangoTemplates
+from django.template.backends.django import Template as BaseTemplate
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar("request_timings", default=None)
+
+
+class Timings:
+    __slots__ = ("sql_count", "sql", "template", "rendering")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql = 0.0
+        self.template = 0.0
+        self.rendering = False
+
+
+class Template(BaseTemplate):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        # Şablon içinden çizilen şablonlar dıştakinin süresine zaten dahildir
+        if timings is None or timings.rendering:
+            return super().render(context, request)
+        timings.rendering = True
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template += time.perf_counter() - started
+            timings.rendering = False
+
+
+class DjangoTemplates(BaseDjangoTemplates):
+    """Çizim süresini istek ölçümüne ekleyen Django şablon motoru."""
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return Template(super().get_template(template_name).template, self)
+
+
+def _sql_timer(timings):
+    def wrapper(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            timings.sql += time.perf_counter() - started
+            timings.sql_count += 1
+
+    return wrapper
+
+
+def view_name(request):
+    """URL adı (ör. ``calls:call_detail``); çözümlenemeyen isteklerde "-"."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "-"
+    return match.view_name or match._func_path
+
+
+def save_profile(profile, name, total_ms):
+    """
+    Profili süreye göre sıralanabilir bir adla yazar ve dizinde en yavaş
+    ``PERFORMANCE_PROFILE_KEEP`` dosyayı bırakır.
+    """
+    directory = settings.PERFORMANCE_PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+    path = os.path.join(
+        directory, f"{int(total_ms):08d}ms-{safe_name}-{uuid.uuid4().hex[:8]}.pstats"
+    )
+    profile.dump_stats(path)
+
+    names = sorted(n for n in os.listdir(directory) if n.endswith(".pstats"))
+    for old in names[: -settings.PERFORMANCE_PROFILE_KEEP or None]:
+        try:
+            os.remove(os.path.join(directory, old))
+        except FileNotFoundError:
+            pass
+    return path
+
+
+class ServerTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = Timings()
+        token = _current.set(timings)
+        profile = None
+        if random.random() < settings.PERFORMANCE_PROFILE_RATE:
+            profile = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_sql_timer(timings)))
+                if profile is not None:
+                    try:
+                        profile.enable()
+                    except ValueError:
+                        # Aynı iş parçacığında başka bir profil çalışıyor
+                        profile = None
+                    else:
+                        stack.callback(profile.disable)
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        sql_ms, template_ms = timings.sql * 1000, timings.template * 1000
+        name = view_name(request)
+        if settings.PERFORMANCE_SERVER_TIMING:
+            response["Server-Timing"] = ", ".join(
+                [
+                    f'sql;dur={sql_ms:.1f};desc="{timings.sql_count} sorgu"',
+                    f"tpl;dur={template_ms:.1f}",
+                    f"total;dur={total_ms:.1f}",
+                ]
+            )
+        logger.info(
+            "method=%s path=%s view=%s status=%s total_ms=%.1f sql_ms=%.1f "
+            "sql_count=%d template_ms=%.1f",
+            request.method,
+            request.path,
+            name,
+            response.status_code,
+            total_ms,
+            sql_ms,
+            timings.sql_count,
+            template_ms,
+            extra={
+                "view": name,
+                "status": response.status_code,
+                "total_ms": round(total_ms, 1),
+                "sql_ms": round(sql_ms, 1),
+                "sql_count": timings.sql_count,
+                "template_ms": round(template_ms, 1),
+            },
+        )
+        if profile is not None and total_ms >= settings.PERFORMANCE_PROFILE_MIN_MS:
+            save_profile(profile, name, total_ms)
+        return response
@@ -32,6 +32,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # En dışta: diğer ara katmanların sorguları da ölçüme dahil olur
+    "qualityhub.performance.ServerTimingMiddleware",
+    "qualityhub.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -45,7 +48,9 @@ ROOT_URLCONF = "qualityhub.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # Django şablon motoru; çizim süresi Server-Timing'e eklenir
+        "BACKEND": "qualityhub.performance.DjangoTemplates",
+        "NAME": "django",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -79,6 +84,37 @@ else:
             "PASSWORD": config("DB_PASSWORD", default=""),
             "HOST": config("DB_HOST", default="localhost"),
             "PORT": config("DB_PORT", default="5432"),
+            # Bağlantılar istekler arasında korunur; işçi açılırken
+            # ısındırmada açılan bağlantı ilk isteklerde de kullanılır
+            "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=60, cast=int),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "connect_timeout": config("DB_CONNECT_TIMEOUT", default=5, cast=int)
+            },
+        }
+    }
+
+# Cache: REDIS_URL verilirse Redis (django-redis), yoksa süreç içi bellek.
+# Birden çok işçi çalışıyorsa paylaşılan önbellek için Redis gerekir
+REDIS_URL = config("REDIS_URL", default="")
+REDIS_SOCKET_TIMEOUT = config("REDIS_SOCKET_TIMEOUT", default=1.0, cast=float)
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                # Redis yanıt vermezse istekler ve hazırlık denetimi beklemez
+                "SOCKET_CONNECT_TIMEOUT": REDIS_SOCKET_TIMEOUT,
+                "SOCKET_TIMEOUT": REDIS_SOCKET_TIMEOUT,
+            },
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         }
     }
 
@@ -115,6 +151,107 @@ STATICFILES_DIRS = [
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Ses dosyaları nginx tarafından sunulacaksa internal konumun ön eki
+# (ör. "/protected-media/"); boşsa Django Range desteğiyle kendisi sunar
+AUDIO_ACCEL_REDIRECT_PREFIX = config("AUDIO_ACCEL_REDIRECT_PREFIX", default="")
+
+# Kesit uç noktasının tek istekte döndürebileceği en uzun süre (saniye)
+AUDIO_CLIP_MAX_SECONDS = config("AUDIO_CLIP_MAX_SECONDS", default=300, cast=int)
+
+# Devam ettirilebilir yüklemelerde parçaların biriktirildiği geçici dizin
+UPLOAD_SESSION_DIR = config(
+    "UPLOAD_SESSION_DIR", default=str(BASE_DIR / "tmp" / "uploads")
+)
+UPLOAD_SESSION_TTL_HOURS = config("UPLOAD_SESSION_TTL_HOURS", default=24, cast=int)
+UPLOAD_SESSION_MAX_SIZE = config(
+    "UPLOAD_SESSION_MAX_SIZE", default=2 * 1024 * 1024 * 1024, cast=int
+)
+
+# Değerlendirme iş kuyruğunda bir çağrının uzmana kiralanma süresi (dakika)
+EVALUATION_LEASE_MINUTES = config("EVALUATION_LEASE_MINUTES", default=30, cast=int)
+# Kapalıysa yüklenen çağrılar kuyruğa eklenmez; kuyruğu haftalık katmanlı
+# örneklem doldurur (sample_calls komutu)
+EVALUATION_QUEUE_ON_UPLOAD = config(
+    "EVALUATION_QUEUE_ON_UPLOAD", default=True, cast=bool
+)
+
+# Yönetici paneli özeti (bkz. calls/overview.py): taze kalma süresi ve
+# süresi dolduktan/bayatladıktan sonra yenilenirken sunulabileceği ek süre
+DASHBOARD_CACHE_SECONDS = config("DASHBOARD_CACHE_SECONDS", default=60, cast=int)
+DASHBOARD_STALE_SECONDS = config("DASHBOARD_STALE_SECONDS", default=600, cast=int)
+# PostgreSQL'de bu satır sayısının üstündeki tablolar için tahmini sayım
+DASHBOARD_ESTIMATE_MIN_ROWS = config(
+    "DASHBOARD_ESTIMATE_MIN_ROWS", default=100000, cast=int
+)
+
+# Celery: yükleme sonrası işler (bkz. calls/tasks.py). Aracı olarak Redis ya
+# da Redis uyumlu bir sunucu (Valkey, KeyDB) kullanılabilir; yerel geliştirmede
+# aracı olmadan çalışmak için CELERY_BROKER_URL=memory:// ve
+# CELERY_TASK_ALWAYS_EAGER=True verilebilir
+CELERY_BROKER_URL = config("CELERY_BROKER_URL", default="redis://localhost:6379/0")
+CELERY_TASK_ALWAYS_EAGER = config("CELERY_TASK_ALWAYS_EAGER", default=False, cast=bool)
+CELERY_TASK_IGNORE_RESULT = True
+# Görev yalnızca tamamlandığında onaylanır; işçi çökerse başka işçi devralır
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_DEFAULT_QUEUE = "qualityhub"
+CALL_PROCESSING_MAX_RETRIES = config("CALL_PROCESSING_MAX_RETRIES", default=5, cast=int)
+
+# İstek ölçümü (bkz. qualityhub/performance.py). Server-Timing başlığı
+# süreleri istemciye de gösterir; istenmiyorsa kapatılabilir
+PERFORMANCE_SERVER_TIMING = config("PERFORMANCE_SERVER_TIMING", default=True, cast=bool)
+# cProfile ile çalıştırılacak isteklerin oranı (0 kapalı, ör. 0.01 = %1)
+PERFORMANCE_PROFILE_RATE = config("PERFORMANCE_PROFILE_RATE", default=0.0, cast=float)
+# Bu süreyi (ms) aşan profillenmiş istekler .pstats olarak yazılır; en yavaş
+# PERFORMANCE_PROFILE_KEEP dosya saklanır
+PERFORMANCE_PROFILE_MIN_MS = config("PERFORMANCE_PROFILE_MIN_MS", default=500, cast=int)
+PERFORMANCE_PROFILE_KEEP = config("PERFORMANCE_PROFILE_KEEP", default=50, cast=int)
+PERFORMANCE_PROFILE_DIR = config(
+    "PERFORMANCE_PROFILE_DIR", default=str(BASE_DIR / "logs" / "profiles")
+)
+
+# Bu süreyi (ms) aşan sorgular çağrı yeriyle günlüğe yazılır ve yönetim
+# panelinde toplanır (bkz. calls/slowqueries.py); 0 kapalı
+SLOW_QUERY_MS = config("SLOW_QUERY_MS", default=200, cast=float)
+# Planı (EXPLAIN) alınacak yavaş SELECT sorgularının oranı
+SLOW_QUERY_EXPLAIN_RATE = config("SLOW_QUERY_EXPLAIN_RATE", default=0.1, cast=float)
+# PostgreSQL'de EXPLAIN (ANALYZE, BUFFERS) kullanılır; sorgu yeniden çalışır
+SLOW_QUERY_EXPLAIN_ANALYZE = config(
+    "SLOW_QUERY_EXPLAIN_ANALYZE", default=False, cast=bool
+)
+
+# /health/ready/ denetimlerinin her biri için süre sınırı (saniye)
+HEALTH_CHECK_TIMEOUT = config("HEALTH_CHECK_TIMEOUT", default=1.0, cast=float)
+
+# Boş değilse /metrics "Authorization: Bearer <METRICS_TOKEN>" ister
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        # İstek başına süre satırları (logfmt)
+        "qualityhub.performance": {
+            "handlers": ["console"],
+            "level": config("PERFORMANCE_LOG_LEVEL", default="INFO"),
+            "propagate": False,
+        },
+        # İşçi ısındırma süresi ve başarısız hazırlık denetimleri
+        "qualityhub.health": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "calls.slowqueries": {
+            "handlers": ["console"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -29,3 +29,12 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.dummy.DummyCache",
     }
 }
+
+# Görevler aracı olmadan, çağıran iş parçacığında çalışır. Hatalar
+# yükseltilmez; yeniden denemeler de aynı iş parçacığında hemen yapılır ve
+# sonuç çağrının processing_status alanından okunur
+CELERY_BROKER_URL = "memory://"
+CELERY_TASK_ALWAYS_EAGER = True
+
+# Yavaş sorgu günlüğü testlerde yalnızca açıkça istendiğinde çalışır
+SLOW_QUERY_MS = 0
@@ -1,7 +1,24 @@
+import os
+import pstats
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from prometheus_client import REGISTRY
+
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.test import Client, TestCase
+from django.http import HttpResponse
+from django.template import engines
+from django.test import Client, RequestFactory, TestCase, override_settings
 from django.urls import reverse
 
+from . import health
+from .metrics import render_metrics
+from .performance import ServerTimingMiddleware
+
 
 class MainProjectTest(TestCase):
     def setUp(self):
@@ -67,3 +84,170 @@ class SettingsTest(TestCase):
 
         self.assertIn("default", settings.DATABASES)
         self.assertIn("ENGINE", settings.DATABASES["default"])
+
+
+class ServerTimingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir, ignore_errors=True)
+
+    def view(self, request):
+        User.objects.count()
+        User.objects.exists()
+        body = engines["django"].from_string("{{ name }}").render({"name": "x"})
+        return HttpResponse(body)
+
+    def test_server_timing_header_and_log(self):
+        middleware = ServerTimingMiddleware(self.view)
+        with self.assertLogs("qualityhub.performance", "INFO") as logs:
+            response = middleware(self.factory.get("/"))
+        header = response["Server-Timing"]
+        self.assertIn('desc="2 sorgu"', header)
+        self.assertRegex(header, r"sql;dur=[\d.]+")
+        self.assertRegex(header, r"tpl;dur=[\d.]+")
+        self.assertRegex(header, r"total;dur=[\d.]+")
+        self.assertIn("sql_count=2", logs.output[0])
+        self.assertEqual(logs.records[0].sql_count, 2)
+
+    def test_header_can_be_disabled(self):
+        with self.settings(PERFORMANCE_SERVER_TIMING=False):
+            response = ServerTimingMiddleware(self.view)(self.factory.get("/"))
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_sampled_profiles_keep_slowest(self):
+        with self.settings(
+            PERFORMANCE_PROFILE_RATE=1.0,
+            PERFORMANCE_PROFILE_MIN_MS=0,
+            PERFORMANCE_PROFILE_KEEP=2,
+            PERFORMANCE_PROFILE_DIR=self.profile_dir,
+        ):
+            for _ in range(3):
+                ServerTimingMiddleware(self.view)(self.factory.get("/"))
+        names = os.listdir(self.profile_dir)
+        self.assertEqual(len(names), 2)
+        stats = pstats.Stats(os.path.join(self.profile_dir, names[0]))
+        self.assertTrue(stats.total_calls)
+
+    def test_profiles_below_threshold_are_not_written(self):
+        with self.settings(
+            PERFORMANCE_PROFILE_RATE=1.0,
+            PERFORMANCE_PROFILE_MIN_MS=60000,
+            PERFORMANCE_PROFILE_DIR=self.profile_dir,
+        ):
+            ServerTimingMiddleware(self.view)(self.factory.get("/"))
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username="testuser", password="x")
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_requests_labelled_by_url_name(self):
+        labels = {"view": "calls:call_list", "method": "GET"}
+        before = self.sample("qualityhub_http_requests_total", status="200", **labels)
+        observed = self.sample(
+            "qualityhub_http_request_duration_seconds_count", **labels
+        )
+        self.client.force_login(self.user)
+        self.client.get(reverse("calls:call_list"))
+
+        self.assertEqual(
+            self.sample("qualityhub_http_requests_total", status="200", **labels),
+            before + 1,
+        )
+        self.assertEqual(
+            self.sample("qualityhub_http_request_duration_seconds_count", **labels),
+            observed + 1,
+        )
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response, 'qualityhub_http_request_duration_seconds_bucket{le="0.005"'
+        )
+        self.assertContains(response, 'view="calls:call_list"')
+
+    def test_token_required_when_configured(self):
+        with self.settings(METRICS_TOKEN="secret"):
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+            response = self.client.get(
+                reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret"
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_multiprocess_values_are_aggregated(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory)
+        script = (
+            "from calls.metrics import EVALUATIONS_CREATED; "
+            "EVALUATIONS_CREATED.labels('single').inc(2)"
+        )
+        # Gunicorn işçileri yerine iki ayrı süreç
+        for _ in range(2):
+            subprocess.run(
+                [sys.executable, "-c", script],
+                cwd=settings.BASE_DIR,
+                env=env,
+                check=True,
+            )
+        with mock.patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": directory}):
+            body = render_metrics().decode()
+        self.assertIn('qualityhub_evaluations_created_total{source="single"} 4.0', body)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class HealthTest(TestCase):
+    def setUp(self):
+        # Her test soğuk bir işçiyle başlar
+        patcher = mock.patch.object(health, "_warm", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_liveness_touches_nothing(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("health"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_readiness_warms_worker(self):
+        response = self.client.get(reverse("health_ready"))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["status"], "ok")
+        self.assertEqual(set(data["checks"]), {"database", "cache", "storage"})
+        self.assertTrue(all(check["ok"] for check in data["checks"].values()))
+        self.assertTrue(health._warm)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_not_ready_until_warm(self):
+        with mock.patch("calls.catalog.warm", side_effect=RuntimeError("db")):
+            with self.assertLogs("qualityhub.health", "ERROR"):
+                response = self.client.get(reverse("health_ready"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"status": "warming"})
+        self.assertFalse(health._warm)
+
+    def test_failing_dependency_reported(self):
+        health.warmup()
+        with mock.patch.object(health.cache, "set", side_effect=ConnectionError):
+            with self.assertLogs("qualityhub.health", "ERROR"):
+                response = self.client.get(reverse("health_ready"))
+        self.assertEqual(response.status_code, 503)
+        checks = response.json()["checks"]
+        self.assertFalse(checks["cache"]["ok"])
+        self.assertTrue(checks["database"]["ok"])
+
+    def test_slow_dependency_fails(self):
+        health.warmup()
+        with override_settings(HEALTH_CHECK_TIMEOUT=0):
+            with self.assertLogs("qualityhub.health", "WARNING"):
+                response = self.client.get(reverse("health_ready"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "unavailable")
@@ -21,6 +21,9 @@ from django.contrib import admin
 from django.shortcuts import redirect
 from django.urls import include, path
 
+from .health import liveness, readiness
+from .metrics import metrics
+
 
 def home_redirect(request):
     """Redirect home page to dashboard"""
@@ -32,6 +35,9 @@ def home_redirect(request):
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics, name="metrics"),
+    path("health/", liveness, name="health"),
+    path("health/ready/", readiness, name="health_ready"),
     path("", home_redirect, name="home"),
     path("", include("users.urls")),
     path("calls/", include("calls.urls")),